@@ -2,7 +2,9 @@ import argparse
 import os
 import sys
 
-from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat import batch, hints
+from gen_factor_sat.circuit.instances import STRATEGIES, DEFAULT_STRATEGY, AUTO_STRATEGY
+from gen_factor_sat.factoring_sat import FactoringSat, PORTFOLIO_METRICS, UNKNOWN_BIT, parse_known_bits
 
 parser = argparse.ArgumentParser(
     prog='gen_factor_sat',
@@ -13,13 +15,16 @@ parser = argparse.ArgumentParser(
     epilog='''examples:
     gen_factor_sat number 100 --outfile factor_100.cnf
     gen_factor_sat random --prime --error 0.001 --seed 10 --min-value 10 100 --outfile
+    gen_factor_sat random --semiprime --balance 0.8 --seed 10 --min-value 1000000 10000000
+    gen_factor_sat batch out/ 10000:1000000:10 0:3:7 --jobs 8
+    gen_factor_sat number 1000000016000000063 --strategy auto --metric variables
     ''',
     formatter_class=argparse.RawDescriptionHelpFormatter
 )
 
 parser.add_argument('--version', action='version', version='%(prog)s v{0}'.format(FactoringSat.VERSION))
 
-commands = ['number', 'random']
+commands = ['number', 'random', 'batch']
 subparsers = parser.add_subparsers(dest='command', required=True)
 
 parser_number = subparsers.add_parser(commands[0], help="specify a number to be factorized")
@@ -36,6 +41,16 @@ parser_number.add_argument(
     '''
 )
 
+for index in [1, 2]:
+    parser_number.add_argument(
+        '--known-bits-{0}'.format(index), dest='known_bits_{0}'.format(index), type=parse_known_bits,
+        metavar='PATTERN',
+        help='''
+        the known bits of factor {0} from the msb to the lsb, e.g. x1x0x1 where {1} marks an unknown bit.
+        Shorter patterns are aligned at the lsb. The known bits are substituted by constants in the circuit.
+        '''.format(index, UNKNOWN_BIT)
+    )
+
 parser_random = subparsers.add_parser(commands[1], help="generate a random number to be factorized")
 parser_random.add_argument(
     'max_value', metavar='max-value', type=int,
@@ -62,6 +77,22 @@ parser_random.add_argument(
     help='''generate a composite number'''
 )
 
+parser_random.add_argument(
+    '--semiprime', action='store_true',
+    help='''
+    construct the number as product of two prime numbers instead of testing random candidates.
+    The factors are included in the comments of the output.
+    '''
+)
+
+parser_random.add_argument(
+    '-b', '--balance', type=float, default=1.0,
+    help='''
+    the ratio between the bit-lengths of the smaller and the larger prime factor
+    if --semiprime is set. (default: 1.0)
+    '''
+)
+
 parser_random.add_argument(
     '-e', '--error', type=float, default=0.0,
     help='''
@@ -83,41 +114,157 @@ parser_random.add_argument(
     '''
 )
 
+parser_batch = subparsers.add_parser(commands[2], help="generate random numbers for several intervals in parallel")
+parser_batch.add_argument(
+    'out_dir', metavar='out-dir', type=str,
+    help='the directory the subinterval directories and the manifest are written to'
+)
+
+parser_batch.add_argument(
+    'interval', type=batch.parse_interval,
+    help='''
+    the interval start:stop:step that is split into the subintervals [start, start * step],
+    [start * step, start * step^2], ... Each subinterval corresponds to a directory.
+    '''
+)
+
+parser_batch.add_argument(
+    'counts', type=lambda counts: batch.parse_numbers(counts, 3),
+    help='the amount random:prime:composite of numbers per subinterval'
+)
+
+parser_batch.add_argument(
+    '-s', '--seed', type=int,
+    help='use the seed to derive the seeds of all generated numbers'
+)
+
+parser_batch.add_argument(
+    '-e', '--error', type=float, default=0.0,
+    help='''
+    the probability that a composite number is declared to be a prime number.
+    If set to 0 a deterministic but slower primality test is used. (default: 0.0)
+    '''
+)
+
+parser_batch.add_argument(
+    '-t', '--tries', type=int, default=1000,
+    help='''the number of tries to generate a number with the specified properties. (default: 1000)'''
+)
+
+parser_batch.add_argument(
+    '-j', '--jobs', type=int,
+    help='the number of processes generating the instances. (default: number of CPUs)'
+)
+
+for subparser in [parser_number, parser_random]:
+    subparser.add_argument(
+        '-j', '--jobs', type=int,
+        help='the number of processes used by --strategy {0}. (default: number of CPUs)'.format(AUTO_STRATEGY)
+    )
+
+for subparser in [parser_number, parser_random, parser_batch]:
+    subparser.add_argument(
+        '--strategy', choices=list(STRATEGIES) + [AUTO_STRATEGY], default=DEFAULT_STRATEGY,
+        help='''
+        the strategy used to encode the multiplication circuit. The strategy {0} tries all
+        strategies and keeps the smallest CNF according to --metric. (default: {1})
+        '''.format(AUTO_STRATEGY, DEFAULT_STRATEGY)
+    )
+
+    subparser.add_argument(
+        '--metric', choices=list(PORTFOLIO_METRICS), default='clauses',
+        help='the metric minimized by --strategy {0}. (default: clauses)'.format(AUTO_STRATEGY)
+    )
+
+    subparser.add_argument(
+        '-p', '--preprocess', action='store_true',
+        help='''
+        simplify the CNF by unit propagation, subsumption and bounded variable elimination.
+        The variables encoding the factors are preserved.
+        '''
+    )
+
+    subparser.add_argument(
+        '--symmetry-breaking', dest='symmetry_breaking', action='store_true',
+        help='''
+        only accept factorizations in which the first factor is less than or equal to the second one.
+        No factorization is lost as the smaller factor always fits into the first factor.
+        '''
+    )
+
+    subparser.add_argument(
+        '--hints', type=hints.parse_hints, default=(), metavar='HINTS',
+        help='''
+        a comma separated list of redundant constraints to be added: {0}.
+        The parameter k of low:k fixes the lowest k bits of the product, the one of mersenne:k
+        checks the product modulo 2^k - 1.
+        '''.format(', '.join(name + ':k' if has_parameter else name for name, (_, has_parameter) in hints.HINTS.items()))
+    )
+
 args = parser.parse_args()
 
 
 def run():
     if args.command == commands[0]:
-        result = FactoringSat.factorize_number(args.value)
-        default = 'factor_number{0}.cnf'.format(result.number.value)
-        write_cnf(result, args.outfile, default)
+        if args.symmetry_breaking and (args.known_bits_1 or args.known_bits_2):
+            parser_number.error('--symmetry-breaking cannot be combined with --known-bits-1 or --known-bits-2')
+
+        result = FactoringSat.factorize_number(
+            args.value,
+            strategy=args.strategy,
+            preprocess=args.preprocess,
+            metric=args.metric,
+            jobs=args.jobs,
+            symmetry_breaking=args.symmetry_breaking,
+            hints=args.hints,
+            known_bits_1=args.known_bits_1,
+            known_bits_2=args.known_bits_2
+        )
+
+        write_cnf(result, args.outfile, result.default_filename())
 
     elif args.command == commands[1]:
+        if args.semiprime and args.prime is not None:
+            parser_random.error('--semiprime cannot be combined with --prime or --no-prime')
+
         result = FactoringSat.factorize_random_number(
             max_value=args.max_value,
             min_value=args.min_value,
             seed=args.seed,
             prime=args.prime,
             error=args.error,
-            max_tries=args.tries
+            max_tries=args.tries,
+            strategy=args.strategy,
+            preprocess=args.preprocess,
+            semiprime=args.semiprime,
+            balance=args.balance,
+            metric=args.metric,
+            jobs=args.jobs,
+            symmetry_breaking=args.symmetry_breaking,
+            hints=args.hints
         )
 
-        number_type = result.number.fold_type(
-            v_det_prime='prime',
-            v_prob_prime='prob-prime',
-            v_det_comp='composite',
-            v_prob_comp='composite',
-            v_unknown='random'
-        )
+        write_cnf(result, args.outfile, result.default_filename())
 
-        default = 'factor_seed{0}_minn{1}_maxn{2}_{3}.cnf'.format(
-            result.generator.seed,
-            result.generator.min_value,
-            result.generator.max_value,
-            number_type
+    elif args.command == commands[2]:
+        tasks = batch.create_tasks(
+            out_dir=args.out_dir,
+            interval=args.interval,
+            counts=args.counts,
+            error=args.error,
+            seed=args.seed,
+            max_tries=args.tries,
+            strategy=args.strategy,
+            preprocess=args.preprocess,
+            metric=args.metric,
+            symmetry_breaking=args.symmetry_breaking,
+            hints=args.hints
         )
 
-        write_cnf(result, args.outfile, default)
+        results = batch.run_batch(tasks, jobs=args.jobs)
+
+        os.makedirs(args.out_dir, exist_ok=True)
+        batch.write_manifest(results, os.path.join(args.out_dir, batch.MANIFEST))
 
     else:
         raise ValueError('Invalid command: ' + str(args.command))
@@ -125,7 +272,7 @@ def run():
 
 def write_cnf(cnf, filename, default_file):
     if filename == '-':
-        sys.stdout.write(cnf.to_dimacs())
+        cnf.write_dimacs(sys.stdout)
     else:
         if not filename:
             filename = default_file
@@ -141,7 +288,7 @@ def write_cnf(cnf, filename, default_file):
                 os.makedirs(directory)
 
         with open(filename, 'w') as file:
-            file.write(cnf.to_dimacs())
+            cnf.write_dimacs(file)
 
 
 try:
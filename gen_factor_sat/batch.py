@@ -0,0 +1,241 @@
+"""
+Batch
+
+Generation of many factoring instances in parallel.
+"""
+from __future__ import annotations
+
+import csv
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, fields
+from typing import List, Optional, Tuple
+
+from gen_factor_sat.circuit.instances import DEFAULT_STRATEGY
+from gen_factor_sat.factoring_sat import FactoringSat
+
+MANIFEST = 'manifest.csv'
+"""The name of the manifest listing all generated instances."""
+
+
+@dataclass
+class BatchTask:
+    """
+    Configuration of a single random factoring instance. The instance is
+    written to the specified directory using its default filename. The
+    metric is only used if the strategy is selected automatically.
+    """
+    directory: str
+    min_value: int
+    max_value: int
+    seed: int
+    prime: Optional[bool] = None
+    error: float = 0.0
+    max_tries: int = 1000
+    strategy: str = DEFAULT_STRATEGY
+    preprocess: bool = False
+    metric: str = 'clauses'
+    symmetry_breaking: bool = False
+    hints: Tuple[str, ...] = ()
+
+
+@dataclass
+class BatchResult:
+    """Describes a generated instance. Each result is a row of the manifest."""
+    file: str
+    number: int
+    number_type: str
+    seed: int
+    min_value: int
+    max_value: int
+    strategy: str
+    number_of_variables: int
+    number_of_clauses: int
+
+
+def parse_interval(interval: str) -> Tuple[int, int, int]:
+    """
+    Parse an interval of the form start:stop:step.
+
+    :param interval: the string representation of the interval
+    :return: the start, stop and step of the interval
+    :raises ValueError if the interval is malformed
+    """
+    start, stop, step = parse_numbers(interval, 3)
+    if start < 2 or step < 2:
+        raise ValueError('The start of the interval and the step must be at least 2')
+
+    return start, stop, step
+
+
+def parse_numbers(numbers: str, amount: int) -> List[int]:
+    """
+    Parse the specified amount of colon separated integers, e.g. 0:3:7.
+
+    :param numbers: the string representation of the integers
+    :param amount: the expected amount of integers
+    :return: the integers
+    :raises ValueError if the string does not contain the expected amount of integers
+    """
+    values = [int(value) for value in numbers.split(':')]
+    if len(values) != amount:
+        raise ValueError('Expected {0} colon separated numbers but got: {1}'.format(amount, numbers))
+
+    return values
+
+
+def create_tasks(
+        out_dir: str,
+        interval: Tuple[int, int, int],
+        counts: Tuple[int, int, int],
+        error: float = 0.0,
+        seed: Optional[int] = None,
+        max_tries: int = 1000,
+        strategy: str = DEFAULT_STRATEGY,
+        preprocess: bool = False,
+        metric: str = 'clauses',
+        symmetry_breaking: bool = False,
+        hints: Tuple[str, ...] = ()
+) -> List[BatchTask]:
+    """
+    Create the tasks to generate random, prime and composite numbers for each
+    subinterval. The interval start:stop:step is split into the subintervals
+    [start, start * step], [start * step, start * step^2], ... until the
+    lower bound reaches stop. Each subinterval is written into its own
+    directory factor_{min}-{max}. The seeds of the instances are derived from
+    the specified seed. Hence, the same configuration produces the same tasks.
+
+    :param out_dir: the directory containing all subinterval directories
+    :param interval: the start, stop and step of the interval
+    :param counts: the amount of random, prime and composite numbers per subinterval
+    :param error: the permitted error probability of the primality test
+    :param seed: the seed used to derive the seeds of the instances
+    :param max_tries: the number of tries to generate a number
+    :param strategy: the name of the strategy to be used
+    :param preprocess: whether the CNFs should be simplified
+    :param metric: the metric minimized if the strategy is selected automatically
+    :param symmetry_breaking: whether the factors should be ordered
+    :param hints: the redundant constraints to be added (see hints.HINTS)
+    :return: the tasks
+    """
+    if seed is None:
+        seed = random.randrange(sys.maxsize)
+
+    rand = random.Random(seed)
+    start, stop, step = interval
+    num_random, num_prime, num_composite = counts
+    prime_types = [None] * num_random + [True] * num_prime + [False] * num_composite
+
+    tasks = []
+    min_value = start
+    while min_value < stop:
+        max_value = min_value * step
+        directory = os.path.join(out_dir, 'factor_{0}-{1}'.format(min_value, max_value))
+
+        for prime in prime_types:
+            tasks.append(BatchTask(
+                directory=directory,
+                min_value=min_value,
+                max_value=max_value,
+                seed=rand.randrange(sys.maxsize),
+                prime=prime,
+                error=error,
+                max_tries=max_tries,
+                strategy=strategy,
+                preprocess=preprocess,
+                metric=metric,
+                symmetry_breaking=symmetry_breaking,
+                hints=hints
+            ))
+
+        min_value = max_value
+
+    return tasks
+
+
+def run_task(task: BatchTask) -> BatchResult:
+    """
+    Generate the factoring instance and write it into the directory of the task.
+    If the strategy is selected automatically, the strategies are tried in
+    this process since the tasks already run in parallel.
+
+    :param task: the configuration of the instance
+    :return: the description of the generated instance
+    """
+    factor_sat = FactoringSat.factorize_random_number(
+        max_value=task.max_value,
+        min_value=task.min_value,
+        seed=task.seed,
+        prime=task.prime,
+        error=task.error,
+        max_tries=task.max_tries,
+        strategy=task.strategy,
+        preprocess=task.preprocess,
+        metric=task.metric,
+        jobs=1,
+        symmetry_breaking=task.symmetry_breaking,
+        hints=task.hints
+    )
+
+    os.makedirs(task.directory, exist_ok=True)
+    filename = os.path.join(task.directory, factor_sat.default_filename())
+    with open(filename, 'w') as file:
+        factor_sat.write_dimacs(file)
+
+    number_type = factor_sat.number.fold_type(
+        v_det_prime='prime',
+        v_prob_prime='prob-prime',
+        v_det_comp='composite',
+        v_prob_comp='composite',
+        v_unknown='random'
+    )
+
+    return BatchResult(
+        file=filename,
+        number=factor_sat.number.value,
+        number_type=number_type,
+        seed=task.seed,
+        min_value=task.min_value,
+        max_value=task.max_value,
+        strategy=factor_sat.strategy,
+        number_of_variables=factor_sat.cnf.number_of_variables,
+        number_of_clauses=len(factor_sat.cnf.clauses)
+    )
+
+
+def run_batch(tasks: List[BatchTask], jobs: Optional[int] = None) -> List[BatchResult]:
+    """
+    Generate all instances using the specified number of processes. If jobs
+    is 1, the instances are generated in this process. By default, one process
+    per CPU is used. The results are in the same order as the tasks.
+
+    :param tasks: the configurations of the instances
+    :param jobs: the number of processes
+    :return: the descriptions of the generated instances
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    if jobs == 1:
+        return list(map(run_task, tasks))
+
+    # Adjacent tasks share the factor lengths and can reuse the cached multiplier
+    chunk_size = max(1, len(tasks) // (4 * jobs))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(run_task, tasks, chunksize=chunk_size))
+
+
+def write_manifest(results: List[BatchResult], filename: str) -> None:
+    """
+    Write the descriptions of the generated instances as CSV file.
+
+    :param results: the descriptions of the generated instances
+    :param filename: the name of the manifest file
+    :return: None
+    """
+    with open(filename, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=[field.name for field in fields(BatchResult)])
+        writer.writeheader()
+        writer.writerows(map(asdict, results))
@@ -15,7 +15,7 @@ METRICS_SCHEMA = ['Version', 'Number', 'Number length', 'Variables',
 TIMINGS = 'timings.csv'
 TIMINGS_SCHEMA = ['Version', 'Number', 'Run', 'Time [ms]']
 
-VERSION = 'EncodeXOR'
+VERSION = 'DaddaTree'
 SCENARIOS = [(355888708943419772067, 30), (3315548805509, 100)]  # (Number, Runs)
 
 
@@ -31,13 +31,18 @@ def append_csv(filename, rows, fieldnames):
         writer.writerows(rows)
 
 
-for number, runs in SCENARIOS:
-    instance = FactoringSat.factorize_number(number=number)
-    avg_time = timeit.timeit(functools.partial(FactoringSat.factorize_number, number=number),
-                             number=runs) / runs * 10 ** 3
+def encode(number, strategy=None):
+    # Every run builds the multiplier such that the timings are comparable to versions without the cache
+    FactoringSat.clear_multiplier_cache()
+    return FactoringSat.factorize_number(number=number, strategy=strategy)
+
+
+def measure(number, runs, strategy=None):
+    instance = encode(number, strategy)
+    avg_time = timeit.timeit(functools.partial(encode, number, strategy), number=runs) / runs * 10 ** 3
 
     clause_size_counter = Counter(map(len, instance.cnf.clauses))
-    csv_data = {
+    return {
         'Version': VERSION,
         'Number': number,
         'Number length': len(utils.to_bin_list(instance.number.value)),
@@ -50,7 +55,10 @@ for number, runs in SCENARIOS:
         'Avg. Time[ms]': '{:.6f}'.format(avg_time)
     }
 
-    append_csv(METRICS, [csv_data], METRICS_SCHEMA)
+
+if __name__ == '__main__':
+    for number, runs in SCENARIOS:
+        append_csv(METRICS, [measure(number, runs)], METRICS_SCHEMA)
 
     # timings = []
     # for i in range(RUNS):
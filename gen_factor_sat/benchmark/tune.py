@@ -0,0 +1,144 @@
+"""
+Tuning
+
+Sweep the Karatsuba threshold (see KaratsubaStrategy.threshold) for a
+registered strategy and save the best threshold per operand length to the
+table that is read by the strategy (see load_thresholds).
+
+Usage:
+python gen_factor_sat/benchmark/tune.py karatsuba --metric clauses
+"""
+import argparse
+import functools
+import json
+import os
+import timeit
+from typing import Dict, Iterable, List
+
+from gen_factor_sat.benchmark.benchmark import VERSION, append_csv
+from gen_factor_sat.circuit.default.multiplication import KaratsubaStrategy, Thresholds, THRESHOLDS_FILE, \
+    load_thresholds
+from gen_factor_sat.circuit.instances import STRATEGIES
+
+TUNING = 'tuning.csv'
+TUNING_SCHEMA = ['Version', 'Strategy', 'Length', 'Threshold', 'Variables', 'Clauses', 'Avg. Time[ms]']
+
+METRICS = {'clauses': 'Clauses', 'variables': 'Variables', 'time': 'Avg. Time[ms]'}
+LENGTHS = [16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512]
+CANDIDATES = [8, 12, 16, 20, 24, 32, 48, 64]
+
+
+def build_multiplier(strategy, length):
+    writer = strategy.create_writer()
+    factor_1 = writer.next_variables(length)
+    factor_2 = writer.next_variables(length)
+    strategy.multiply(factor_1, factor_2, writer)
+
+    return writer.build()
+
+
+def measure(name, strategy, length, runs):
+    cnf = build_multiplier(strategy, length)
+    avg_time = timeit.timeit(functools.partial(build_multiplier, strategy, length), number=runs) / runs * 10 ** 3
+
+    return {
+        'Version': VERSION,
+        'Strategy': name,
+        'Length': length,
+        'Threshold': strategy.threshold(length),
+        'Variables': cnf.number_of_variables,
+        'Clauses': len(cnf.clauses),
+        'Avg. Time[ms]': avg_time
+    }
+
+
+def tune(name: str, metric: str = 'clauses', lengths: Iterable[int] = LENGTHS, candidates: Iterable[int] = CANDIDATES,
+         runs: int = 1, rows: List[Dict] = None) -> Thresholds:
+    """
+    Determine the Karatsuba thresholds of the strategy registered under the
+    given name. The lengths are tuned in ascending order such that the
+    splits of a multiplication already use the thresholds of the shorter
+    lengths. For each length, the factors are multiplied with every candidate
+    as threshold and the candidate minimizing the metric is kept. Ties are
+    resolved in favor of the candidate closest to min_len.
+
+    :param name: the name of the strategy (see STRATEGIES)
+    :param metric: the metric to be minimized (see METRICS)
+    :param lengths: the lengths of the factors for which a threshold is determined
+    :param candidates: the thresholds that are compared
+    :param runs: the number of runs the encoding time is averaged over
+    :param rows: a list to which all measurements are appended
+    :return: the thresholds ordered by length (see KaratsubaStrategy.thresholds)
+    """
+    strategy = STRATEGIES[name]()
+    if not isinstance(strategy, KaratsubaStrategy):
+        raise ValueError('The strategy {0} does not use the Karatsuba multiplication'.format(name))
+
+    thresholds = ()
+    for length in sorted(lengths):
+        results = []
+        for candidate in candidates:
+            strategy.thresholds = thresholds + ((length, candidate),)
+            row = measure(name, strategy, length, runs)
+            results.append((row[METRICS[metric]], abs(candidate - strategy.min_len), candidate))
+
+            if rows is not None:
+                rows.append(row)
+
+        _, _, best = min(results)
+        if not thresholds or thresholds[-1][1] != best:
+            thresholds += ((length, best),)
+
+    return thresholds
+
+
+def save_thresholds(name: str, metric: str, thresholds: Thresholds, filename: str = THRESHOLDS_FILE) -> None:
+    """
+    Store the thresholds of the strategy registered under the given name
+    in the table read by KaratsubaStrategy. The thresholds of the other
+    strategies in the table are preserved.
+
+    :param name: the name of the strategy (see STRATEGIES)
+    :param metric: the metric the thresholds have been tuned for
+    :param thresholds: the tuned thresholds
+    :param filename: the file containing the table
+    :return: None
+    """
+    tables = {}
+    if os.path.isfile(filename):
+        with open(filename) as file:
+            tables = json.load(file)
+
+    tables[STRATEGIES[name].__name__] = {
+        'strategy': name,
+        'metric': metric,
+        'thresholds': [list(entry) for entry in thresholds]
+    }
+
+    with open(filename, mode='w') as file:
+        json.dump(tables, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+    load_thresholds.cache_clear()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tune the Karatsuba threshold of a strategy per operand length.')
+    parser.add_argument(
+        'strategy', choices=[name for name, strategy in STRATEGIES.items() if issubclass(strategy, KaratsubaStrategy)],
+        help='the strategy to be tuned'
+    )
+
+    parser.add_argument('--metric', choices=list(METRICS), default='clauses', help='the metric to be minimized')
+    parser.add_argument('--lengths', type=int, nargs='+', default=LENGTHS, help='the lengths of the factors')
+    parser.add_argument('--candidates', type=int, nargs='+', default=CANDIDATES, help='the thresholds to compare')
+    parser.add_argument('--runs', type=int, default=1, help='the number of runs per measurement')
+    parser.add_argument('--outfile', default=THRESHOLDS_FILE, help='the table the thresholds are saved to')
+    args = parser.parse_args()
+
+    measurements = []
+    result = tune(args.strategy, args.metric, args.lengths, args.candidates, args.runs, measurements)
+
+    append_csv(TUNING, measurements, TUNING_SCHEMA)
+    save_thresholds(args.strategy, args.metric, result, args.outfile)
+    print(result)
@@ -0,0 +1,66 @@
+from typing import cast
+
+from gen_factor_sat.circuit.default.circuit import SymbolGateStrategy
+from gen_factor_sat.formula.aig import Aig
+from gen_factor_sat.formula.symbol import Symbol, Variable, Constant
+
+
+class AigGateStrategy(SymbolGateStrategy[Aig]):
+    """
+    Build an And-Inverter Graph instead of writing clauses directly. The graph
+    is lowered into a CNF once the whole circuit is known (see Aig.build).
+    If polarity_aware is set, the lowering uses the Plaisted-Greenbaum encoding.
+    """
+    polarity_aware: bool = False
+
+    def create_writer(self) -> Aig:
+        return Aig(polarity_aware=self.polarity_aware)
+
+    def wire_and(self, value_1: Symbol, value_2: Symbol, writer: Aig) -> Symbol:
+        if self.is_constant(value_1) or self.is_constant(value_2):
+            return self._constant_and(value_1, value_2)
+        elif value_1 == value_2:
+            return value_1
+        elif value_1 == self.wire_not(value_2, writer):
+            return self.zero
+        else:
+            return writer.and_gate(cast(Variable, value_1), cast(Variable, value_2))
+
+    def wire_or(self, value_1: Symbol, value_2: Symbol, writer: Aig) -> Symbol:
+        # De Morgan: x OR y == -(-x AND -y)
+        return self.wire_not(
+            self.wire_and(
+                self.wire_not(value_1, writer),
+                self.wire_not(value_2, writer),
+                writer
+            ),
+            writer
+        )
+
+    def expect_zero(self, value: Symbol, writer: Aig) -> Symbol:
+        return self.expect(value, self.zero, writer)
+
+    def expect_one(self, value: Symbol, writer: Aig) -> Symbol:
+        return self.expect(value, self.one, writer)
+
+    def expect(self, symbol: Symbol, value: Constant, writer: Aig) -> Constant:
+        """
+        Assume the specified symbol has the expected value. If the evaluation
+        of the symbol yields another value the formula will be unsatisfiable.
+        As the value of the symbol is now known, the returned symbol is equivalent
+        to the specified value.
+
+        :param symbol: the symbol to which the value should be assigned
+        :param value: the value that should be assigned to the symbol
+        :param writer: the graph collecting the assertions
+        :return: the value of the symbol
+        """
+        if self.is_constant(symbol) and symbol != value:
+            writer.add_contradiction()
+        elif not self.is_constant(symbol):
+            if self.is_one(value):
+                writer.add_assertion(cast(Variable, symbol))
+            else:
+                writer.add_assertion(cast(Variable, self.wire_not(symbol, writer)))
+
+        return value
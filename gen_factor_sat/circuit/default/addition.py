@@ -0,0 +1,175 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple, Generic, TypeVar
+
+from gen_factor_sat.circuit.default.circuit import GeneralNBitCircuitStrategy
+
+T = TypeVar('T')
+W = TypeVar('W')
+
+Signal = Tuple[T, T]
+"""A pair of a generate and a propagate value."""
+
+
+class PrefixAdderStrategy(Generic[T, W], GeneralNBitCircuitStrategy[T, W], ABC):
+    """
+    Base for parallel-prefix adders. For each bit position, a generate
+    (value_1 AND value_2) and a propagate (value_1 XOR value_2) value is
+    computed. The carries are the prefixes of these signals under the
+    associative operator (g, p) o (g', p') = (g OR (p AND g'), p AND p').
+    Subclasses only define the network computing the prefixes (see prefix).
+    """
+
+    def n_bit_adder(self, number_1: List[T], number_2: List[T], carry: T, writer: W) -> List[T]:
+        aligned_number_1, aligned_number_2 = self.align(number_1, number_2, writer)
+
+        # The signals are ordered from the lsb, the input carry is a generate value without propagation
+        signals = [(carry, self.zero)]
+        propagates = []
+        for value_1, value_2 in zip(reversed(aligned_number_1), reversed(aligned_number_2)):
+            propagate, generate = self.half_adder(value_1, value_2, writer)
+            signals.append((generate, propagate))
+            propagates.append(propagate)
+
+        carries = [generate for generate, _ in self.prefix(signals, writer)]
+
+        output_sum = [self.xor(propagate, carry, writer) for propagate, carry in zip(propagates, carries)]
+        output_sum.append(carries[-1])
+
+        return output_sum[::-1]
+
+    @abstractmethod
+    def prefix(self, signals: List[Signal], writer: W) -> List[Signal]:
+        """
+        Calculate all prefixes of the signals, i.e. the i-th result is
+        signals[i] o ... o signals[0] (see combine).
+
+        :param signals: the generate and propagate values starting at the lsb
+        :param writer: a writer for stateful operations
+        :return: the combined signals of all prefixes
+        """
+        pass
+
+    def combine(self, signal_high: Signal, signal_low: Signal, writer: W) -> Signal:
+        """
+        Combine the signals of two adjacent groups of bits.
+
+        :param signal_high: the generate and propagate value of the more significant group
+        :param signal_low: the generate and propagate value of the less significant group
+        :param writer: a writer for stateful operations
+        :return: the generate and propagate value of the merged group
+        """
+        generate_high, propagate_high = signal_high
+        generate_low, propagate_low = signal_low
+
+        generate = self.wire_or(generate_high, self.wire_and(propagate_high, generate_low, writer), writer)
+        propagate = self.wire_and(propagate_high, propagate_low, writer)
+
+        return generate, propagate
+
+
+class KoggeStoneAdderStrategy(Generic[T, W], PrefixAdderStrategy[T, W], ABC):
+    """
+    Kogge-Stone adder: log(n) levels in which every position is combined
+    with the position 2^level below. Minimal depth and fan-out but
+    n * log(n) combinations.
+    """
+
+    def prefix(self, signals: List[Signal], writer: W) -> List[Signal]:
+        result = list(signals)
+
+        distance = 1
+        while distance < len(result):
+            result = result[:distance] + [
+                self.combine(result[index], result[index - distance], writer)
+                for index in range(distance, len(result))
+            ]
+
+            distance *= 2
+
+        return result
+
+
+class SklanskyAdderStrategy(Generic[T, W], PrefixAdderStrategy[T, W], ABC):
+    """
+    Sklansky (divide and conquer) adder: in each level, the upper half of
+    every block is combined with the last prefix of the lower half.
+    Minimal depth with (n / 2) * log(n) combinations but a high fan-out.
+    """
+
+    def prefix(self, signals: List[Signal], writer: W) -> List[Signal]:
+        result = list(signals)
+
+        distance = 1
+        while distance < len(result):
+            for index in range(distance, len(result)):
+                if index & distance:
+                    last_lower = (index // distance) * distance - 1
+                    result[index] = self.combine(result[index], result[last_lower], writer)
+
+            distance *= 2
+
+        return result
+
+
+class BrentKungAdderStrategy(Generic[T, W], PrefixAdderStrategy[T, W], ABC):
+    """
+    Brent-Kung adder: a binary tree computes the prefixes at the positions
+    2^k - 1, a second (inverse) tree distributes them to the remaining
+    positions. About 2 * n combinations at twice the depth of Kogge-Stone.
+    """
+
+    def prefix(self, signals: List[Signal], writer: W) -> List[Signal]:
+        result = list(signals)
+
+        distance = 1
+        while distance < len(result):
+            for index in range(2 * distance - 1, len(result), 2 * distance):
+                result[index] = self.combine(result[index], result[index - distance], writer)
+
+            distance *= 2
+
+        while distance > 1:
+            distance //= 2
+            for index in range(3 * distance - 1, len(result), 2 * distance):
+                result[index] = self.combine(result[index], result[index - distance], writer)
+
+        return result
+
+
+class CarrySelectAdderStrategy(Generic[T, W], GeneralNBitCircuitStrategy[T, W], ABC):
+    """
+    Carry-select adder: the numbers are split into blocks of block_size bits.
+    Each block (except the least significant one) is added twice, assuming
+    an input carry of zero and one, and the actual carry selects the result.
+    The blocks are added by the next adder in the method resolution order.
+    """
+    block_size: int = 8
+
+    def n_bit_adder(self, number_1: List[T], number_2: List[T], carry: T, writer: W) -> List[T]:
+        aligned_number_1, aligned_number_2 = self.align(number_1, number_2, writer)
+        block_adder = super(CarrySelectAdderStrategy, self).n_bit_adder
+
+        blocks = []
+        for end in range(len(aligned_number_1), 0, -self.block_size):
+            start = max(0, end - self.block_size)
+            block_1 = aligned_number_1[start:end]
+            block_2 = aligned_number_2[start:end]
+
+            if not blocks:
+                block_sum = block_adder(block_1, block_2, carry, writer)
+            else:
+                block_sum_0 = block_adder(block_1, block_2, self.zero, writer)
+                block_sum_1 = block_adder(block_1, block_2, self.one, writer)
+                block_sum = [
+                    self.ite(carry, value_1, value_0, writer)
+                    for value_0, value_1 in zip(block_sum_0, block_sum_1)
+                ]
+
+            carry = block_sum[0]
+            blocks.append(block_sum[1:])
+
+        output_sum = [carry]
+        for block in reversed(blocks):
+            output_sum.extend(block)
+
+        return output_sum
@@ -2,10 +2,10 @@ import functools
 import itertools
 import operator as op
 from abc import ABC
-from typing import List, Tuple, TypeVar
+from typing import List, Tuple, Generic, TypeVar, cast
 
 from gen_factor_sat.circuit.interface.circuit import GateStrategy, SimpleCircuitStrategy, NBitCircuitStrategy
-from gen_factor_sat.formula.symbol import Constant, constant
+from gen_factor_sat.formula.symbol import Constant, Symbol, Variable, constant, variable
 
 T = TypeVar('T')
 W = TypeVar('W')
@@ -15,6 +15,9 @@ class ConstantStrategy(GateStrategy[Constant, None]):
     zero: Constant = constant('0')
     one: Constant = constant('1')
 
+    def create_writer(self) -> None:
+        return None
+
     def wire_and(self, value_1: Constant, value_2: Constant, writer: None = None) -> Constant:
         return ConstantStrategy.__with_bool(op.and_, value_1, value_2)
 
@@ -37,6 +40,50 @@ class ConstantStrategy(GateStrategy[Constant, None]):
         return constant(bin(value)[2:])
 
 
+class SymbolGateStrategy(Generic[W], GateStrategy[Symbol, W], ABC):
+    """
+    Base for strategies evaluating the gates symbolically. Constants are
+    propagated, variables are negated by their sign.
+    """
+    zero: Constant = constant('0')
+    one: Constant = constant('1')
+
+    def wire_not(self, value: Symbol, writer: W) -> Symbol:
+        if self.is_constant(value):
+            return self._constant_not(value)
+        else:
+            var = cast(Variable, value)  # Type hint
+            return variable(-var)
+
+    def _constant_and(self, symbol_1: Symbol, symbol_2: Symbol) -> Symbol:
+        if symbol_1 == self.zero or symbol_2 == self.zero:
+            return self.zero
+        elif symbol_1 == self.one:
+            return symbol_2
+        elif symbol_2 == self.one:
+            return symbol_1
+        else:
+            raise ValueError('Neither {0} nor {1} is a constant'.format(symbol_1, symbol_2))
+
+    def _constant_or(self, symbol_1: Symbol, symbol_2: Symbol) -> Symbol:
+        if symbol_1 == self.one or symbol_2 == self.one:
+            return self.one
+        if symbol_1 == self.zero:
+            return symbol_2
+        elif symbol_2 == self.zero:
+            return symbol_1
+        else:
+            raise ValueError('Neither {0} nor {1} is a constant'.format(symbol_1, symbol_2))
+
+    def _constant_not(self, symbol: Symbol) -> Symbol:
+        if symbol == self.zero:
+            return self.one
+        elif symbol == self.one:
+            return self.zero
+        else:
+            raise ValueError('{0} is no constant'.format(symbol))
+
+
 class GeneralSimpleCircuitStrategy(GateStrategy[T, W], SimpleCircuitStrategy[T, W], ABC):
 
     def half_adder(self, value_1: T, value_2: T, writer: W) -> Tuple[T, T]:
@@ -83,52 +130,50 @@ class GeneralSimpleCircuitStrategy(GateStrategy[T, W], SimpleCircuitStrategy[T,
             writer
         )
 
+    def xor3(self, value_1: T, value_2: T, value_3: T, writer: W) -> T:
+        return self.xor(self.xor(value_1, value_2, writer), value_3, writer)
+
+    def majority(self, value_1: T, value_2: T, value_3: T, writer: W) -> T:
+        # Same gates as the carry of the full adder
+        return self.wire_or(
+            self.wire_and(value_1, value_2, writer),
+            self.wire_and(self.xor(value_1, value_2, writer), value_3, writer),
+            writer
+        )
+
+    def ite(self, condition: T, value_1: T, value_0: T, writer: W) -> T:
+        return self.wire_or(
+            self.wire_and(condition, value_1, writer),
+            self.wire_and(self.wire_not(condition, writer), value_0, writer),
+            writer
+        )
+
 
 class GeneralNBitCircuitStrategy(GateStrategy[T, W], SimpleCircuitStrategy[T, W], NBitCircuitStrategy[T, W],
                                  ABC):
 
     def n_bit_adder(self, number_1: List[T], number_2: List[T], carry: T, writer: W) -> List[T]:
-        if not number_1:
-            return self.propagate(number_2, carry, writer)
-        elif not number_2:
-            return self.propagate(number_1, carry, writer)
-        else:
-            *init_1, lsb_1 = number_1
-            *init_2, lsb_2 = number_2
+        # Ripple carry from the lsb, the result list is filled from the back
+        common_length = min(len(number_1), len(number_2))
+        longer = number_1 if len(number_1) > len(number_2) else number_2
 
-            lsb_sum, lsb_carry = self.full_adder(lsb_1, lsb_2, carry, writer)
-            init_sum = self.n_bit_adder(init_1, init_2, lsb_carry, writer)
+        output_sum = [carry] * (len(longer) + 1)
+        for index in range(1, common_length + 1):
+            output_sum[-index], carry = self.full_adder(number_1[-index], number_2[-index], carry, writer)
 
-            return init_sum + [lsb_sum]
+        for index in range(common_length + 1, len(longer) + 1):
+            output_sum[-index], carry = self.half_adder(longer[-index], carry, writer)
+
+        output_sum[0] = carry
+        return output_sum
 
     def propagate(self, inputs: List[T], carry: T, writer: W) -> List[T]:
-        if not inputs:
-            return [carry]
-        else:
-            *init, lsb = inputs
-
-            lsb_sum, lsb_carry = self.half_adder(lsb, carry, writer)
-            init_sum = self.propagate(init, lsb_carry, writer)
-
-            return init_sum + [lsb_sum]
-
-    # def n_bit_adder(xs: List[T], ys: List[T], c: T, strategy: Strategy[T]) -> List[T]:
-    #     aligned_xs, aligned_ys = align(xs, ys)
-    #
-    #     carry = c
-    #     result = []
-    #     for i in range(len(aligned_xs)):
-    #         x = aligned_xs[-(i+1)]
-    #         y = aligned_ys[-(i+1)]
-    #
-    #         sum_xy, carry_xy = full_adder(x, y, carry, strategy)
-    #
-    #         carry = carry_xy
-    #         result.append(sum_xy)
-    #
-    #     result.append(carry)
-    #     result.reverse()
-    #     return result
+        output_sum = [carry] * (len(inputs) + 1)
+        for index in range(1, len(inputs) + 1):
+            output_sum[-index], carry = self.half_adder(inputs[-index], carry, writer)
+
+        output_sum[0] = carry
+        return output_sum
 
     def subtract(self, number_1: List[T], number_2: List[T], writer: W) -> List[T]:
         if self.all_zero(number_2):
@@ -151,6 +196,16 @@ class GeneralNBitCircuitStrategy(GateStrategy[T, W], SimpleCircuitStrategy[T, W]
 
         return all_equal
 
+    def less_equal(self, number_1: List[T], number_2: List[T], writer: W) -> T:
+        aligned_number_1, aligned_number_2 = self.align(number_1, number_2, writer)
+
+        # Lexicographic comparison from the lsb: a more significant bit decides unless both bits are equal
+        result = self.one
+        for value_1, value_2 in zip(reversed(aligned_number_1), reversed(aligned_number_2)):
+            result = self.majority(self.wire_not(value_1, writer), value_2, result, writer)
+
+        return result
+
     def shift(self, number: List[T], shifts: int, writer: W) -> List[T]:
         return number + [self.zero] * shifts
 
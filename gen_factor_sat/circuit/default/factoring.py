@@ -1,7 +1,9 @@
+import functools
 from abc import ABC
 from typing import List, Generic, TypeVar
 
-from gen_factor_sat.circuit.interface.circuit import NBitCircuitStrategy
+from gen_factor_sat import utils
+from gen_factor_sat.circuit.interface.circuit import GateStrategy, NBitCircuitStrategy
 from gen_factor_sat.circuit.interface.factoring import FactoringStrategy
 from gen_factor_sat.circuit.interface.multiplication import MultiplicationStrategy
 
@@ -11,12 +13,155 @@ W = TypeVar('W')
 
 class GeneralFactoringStrategy(
     Generic[T, W],
+    GateStrategy[T, W],
     NBitCircuitStrategy[T, W],
     MultiplicationStrategy[T, W],
     FactoringStrategy[T, W],
     ABC
 ):
+    """
+    Factorizes a number by comparing the product of the factors with the
+    number. If truncate_product is set, only the bits of the product that
+    can be equal to the number are computed (see bounded_multiply).
+    """
+    truncate_product: bool = True
+
     def is_factorization(self, factor_1: List[T], factor_2: List[T], number: List[T], writer: W) -> T:
-        mult_result = self.multiply(factor_1, factor_2, writer)
-        fact_result = self.n_bit_equality(mult_result, number, writer)
+        mult_result = self.bounded_multiply(factor_1, factor_2, len(number), writer)
+        fact_result = self.is_product(mult_result, number, writer)
         return fact_result
+
+    def is_product(self, product: List[T], number: List[T], writer: W) -> T:
+        """
+        Check whether the product of the factors (see bounded_multiply) results
+        in the specified number. Together with bounded_multiply, this is
+        equivalent to is_factorization but allows reusing the multiplication.
+
+        :param product: the product of the factors
+        :param number: the number to be factorized
+        :param writer: a writer for stateful operations
+        :return: one if the product is equal to the number, otherwise zero
+        """
+        return self.n_bit_equality(product, number, writer)
+
+    def expect_product(self, product: List[T], number: List[T], writer: W) -> T:
+        """
+        Assert that the product of the factors (see bounded_multiply) results
+        in the specified number. In contrast to expecting is_product to be one,
+        every bit of the product is asserted on its own. For a constant number,
+        this yields a unit per bit instead of a chain of AND gates whose output
+        is asserted.
+
+        :param product: the product of the factors
+        :param number: the number to be factorized
+        :param writer: a writer for stateful operations
+        :return: the one element
+        """
+        aligned_product, aligned_number = self.align(product, number, writer)
+
+        for value, expected in zip(aligned_product, aligned_number):
+            if self.is_one(expected):
+                self.expect_one(value, writer)
+            elif self.is_zero(expected):
+                self.expect_zero(value, writer)
+            else:
+                self.expect_one(self.equality(value, expected, writer), writer)
+
+        return self.one
+
+    def bounded_multiply(self, factor_1: List[T], factor_2: List[T], length: int, writer: W) -> List[T]:
+        """
+        Calculate the product of both factors as far as it is required for
+        the comparison with a number of the specified length. If the product
+        may not fit into length + 1 bits and truncate_product is set, only the
+        lower length bits are computed. They are preceded by a bit that is one
+        iff the product does not fit into length bits. Hence, the result is
+        equal to a number of the given length iff the product is.
+
+        :param factor_1: the first factor
+        :param factor_2: the second factor
+        :param length: the length of the number the product is compared with
+        :param writer: a writer for stateful operations
+        :return: the (truncated) product of the factors
+        """
+        normalized_factor_1 = self.normalize(factor_1)
+        normalized_factor_2 = self.normalize(factor_2)
+
+        if not self.truncate_product or len(normalized_factor_1) + len(normalized_factor_2) <= length + 1:
+            return self.multiply(factor_1, factor_2, writer)
+        else:
+            # If no pair of bits exceeds the length, the product has at most length + 1 bits
+            product = self.multiply_modulo(normalized_factor_1, normalized_factor_2, length + 1, writer)
+            exceeds = self.exceeds(normalized_factor_1, normalized_factor_2, length, writer)
+            overflow = self.wire_or(exceeds, product[0], writer)
+
+            return [overflow] + product[1:]
+
+    def multiply_modulo(self, factor_1: List[T], factor_2: List[T], length: int, writer: W) -> List[T]:
+        """
+        Calculate the lower length bits of the product of both factors. The
+        factors are split in halves of the length such that the product of
+        the high parts vanishes: (a * b) mod 2^length = a_low * b_low +
+        ((a_high * b_low + a_low * b_high) mod 2^(length - half)) * 2^half.
+
+        :param factor_1: the first factor
+        :param factor_2: the second factor
+        :param length: the number of bits to be computed
+        :param writer: a writer for stateful operations
+        :return: the product of the factors modulo 2^length (with exactly length bits)
+        """
+        truncated_factor_1 = self.normalize(factor_1[-length:])
+        truncated_factor_2 = self.normalize(factor_2[-length:])
+
+        if (not truncated_factor_1) or (not truncated_factor_2):
+            return [self.zero] * length
+        elif len(truncated_factor_1) + len(truncated_factor_2) <= length + 1 or length <= 1:
+            return self._truncate(self.multiply(truncated_factor_1, truncated_factor_2, writer), length)
+        else:
+            half_length = (length + 1) // 2
+            cross_length = length - half_length
+
+            f1_high, f1_low = utils.split_at(truncated_factor_1, -half_length)
+            f2_high, f2_low = utils.split_at(truncated_factor_2, -half_length)
+
+            result_low = self._truncate(self.multiply(f1_low, f2_low, writer), length)
+            cross_1 = self.multiply_modulo(f1_high, f2_low, cross_length, writer)
+            cross_2 = self.multiply_modulo(f1_low, f2_high, cross_length, writer)
+
+            result_mid = self._truncate(self.n_bit_adder(cross_1, cross_2, self.zero, writer), cross_length)
+            result_high = self.n_bit_adder(result_mid, result_low[:-half_length], self.zero, writer)
+
+            return self._truncate(result_high, cross_length) + result_low[-half_length:]
+
+    def exceeds(self, factor_1: List[T], factor_2: List[T], length: int, writer: W) -> T:
+        """
+        Check whether any pair of set bits a_i and b_j of the factors has a
+        weight i + j of at least length, i.e. whether the product certainly
+        does not fit into length bits. The bits of the first factor are
+        accumulated from the msb such that each bit of the second factor
+        requires a single OR and AND gate.
+
+        :param factor_1: the first factor
+        :param factor_2: the second factor
+        :param length: the number of bits the product should fit into
+        :param writer: a writer for stateful operations
+        :return: one if a pair of bits exceeds the length, otherwise zero
+        """
+        wire_or = functools.partial(self.wire_or, writer=writer)
+        reversed_factor_1 = factor_1[::-1]
+
+        # All bits of the first factor with an index larger than length - j
+        high_bits = functools.reduce(wire_or, reversed_factor_1[length + 1:], self.zero)
+
+        result = self.zero
+        for j, value_2 in enumerate(reversed(factor_2)):
+            if 0 <= length - j < len(reversed_factor_1):
+                high_bits = wire_or(high_bits, reversed_factor_1[length - j])
+
+            result = wire_or(result, self.wire_and(value_2, high_bits, writer))
+
+        return result
+
+    def _truncate(self, number: List[T], length: int) -> List[T]:
+        aligned_number = [self.zero] * (length - len(number)) + number
+        return aligned_number[len(aligned_number) - length:]
@@ -1,7 +1,11 @@
+import bisect
 import functools
 import itertools
-from abc import ABC
-from typing import List, Tuple, Generic, TypeVar
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Generic, TypeVar
 
 from gen_factor_sat import utils
 from gen_factor_sat.circuit.interface.circuit import GateStrategy, SimpleCircuitStrategy, NBitCircuitStrategy
@@ -10,6 +14,34 @@ from gen_factor_sat.circuit.interface.multiplication import MultiplicationStrate
 T = TypeVar('T')
 W = TypeVar('W')
 
+Thresholds = Tuple[Tuple[int, int], ...]
+"""Pairs of an operand length and the Karatsuba threshold used from this length on (see KaratsubaStrategy)."""
+
+THRESHOLDS_FILE = os.path.join(os.path.dirname(__file__), 'thresholds.json')
+"""The Karatsuba thresholds tuned for the registered strategies (see benchmark/tune.py)."""
+
+
+@functools.lru_cache(maxsize=None)
+def load_thresholds(filename: str = THRESHOLDS_FILE) -> Dict[str, Thresholds]:
+    """
+    Read the tuned Karatsuba thresholds. The file maps the class names of
+    the strategies to the tuning results, which contain the thresholds as
+    a list of [length, threshold] pairs ordered by the length.
+
+    :param filename: the file containing the tuned thresholds
+    :return: the thresholds per strategy class
+    """
+    if not os.path.isfile(filename):
+        return {}
+
+    with open(filename) as file:
+        tables = json.load(file)
+
+    return {
+        name: tuple((length, threshold) for length, threshold in table['thresholds'])
+        for name, table in tables.items()
+    }
+
 
 class KaratsubaStrategy(
     Generic[T, W],
@@ -19,6 +51,27 @@ class KaratsubaStrategy(
     ABC
 ):
     min_len: int = 20
+    thresholds: Optional[Thresholds] = None
+
+    def threshold(self, length: int) -> int:
+        """
+        Determine the length up to which the factors are multiplied by the
+        next multiplier in the method resolution order instead of being split.
+        The threshold is taken from the entry of thresholds with the largest
+        length not exceeding the given length. If thresholds is not set, the
+        table tuned for this strategy is used (see load_thresholds) unless
+        min_len is set on the instance. Lengths without an entry use min_len.
+
+        :param length: the length of the longer factor
+        :return: the largest length that is not split
+        """
+        thresholds = self.thresholds
+        if thresholds is None:
+            # The table is tuned for the default min_len, hence an explicit min_len replaces it
+            thresholds = () if 'min_len' in vars(self) else load_thresholds().get(type(self).__name__, ())
+
+        index = bisect.bisect_right(thresholds, (length, math.inf)) - 1
+        return thresholds[index][1] if index >= 0 else self.min_len
 
     def multiply(self, factor_1: List[T], factor_2: List[T], writer: W) -> List[T]:
         normalized_factor_1 = self.normalize(factor_1)
@@ -27,7 +80,7 @@ class KaratsubaStrategy(
 
         if (not normalized_factor_1) or (not normalized_factor_2):
             return [self.zero]
-        elif max_factor_length <= self.min_len:
+        elif max_factor_length <= self.threshold(max_factor_length):
             return super(KaratsubaStrategy, self).multiply(normalized_factor_1, normalized_factor_2, writer)
         else:
             half_factor_length = (max_factor_length + 1) // 2
@@ -42,30 +95,296 @@ class KaratsubaStrategy(
             factor_1_sum = self.n_bit_adder(f1_high, f1_low, self.zero, writer) if f1_high else f1_low
             factor_2_sum = self.n_bit_adder(f2_high, f2_low, self.zero, writer) if f2_high else f2_low
 
-            result_mid = self.multiply(factor_1_sum, factor_2_sum, writer)
-            result_mid = self.subtract(result_mid, result_high, writer) if result_high else result_mid
-            result_mid = self.subtract(result_mid, result_low, writer) if result_low else result_mid
+            product_mid = self.multiply(factor_1_sum, factor_2_sum, writer)
 
-            # result = result_high * 2^(2 * half_factor_length) + result_mid * 2^(half_factor_length) + result_low
-            shifted_high = self.shift(result_high, half_factor_length, writer)
-            result = self.n_bit_adder(shifted_high, result_mid, self.zero, writer)
+            return self.recombine(result_high, product_mid, result_low, half_factor_length, writer)
 
-            shifted_high = self.shift(result, half_factor_length, writer)
-            result = self.n_bit_adder(shifted_high, result_low, self.zero, writer)
+    def recombine(
+            self,
+            result_high: List[T],
+            product_mid: List[T],
+            result_low: List[T],
+            shift: int,
+            writer: W
+    ) -> List[T]:
+        """
+        Combine the partial results of a Karatsuba step, i.e. calculate
+        result_high * 2^(2 * shift) + (product_mid - result_high - result_low) * 2^shift + result_low.
+
+        :param result_high: the product of the high parts
+        :param product_mid: the product of the sums of the high and low parts
+        :param result_low: the product of the low parts
+        :param shift: the length of the low parts
+        :param writer: a writer for stateful operations
+        :return: the product of the factors
+        """
+        result_mid = self.subtract(product_mid, result_high, writer) if result_high else product_mid
+        result_mid = self.subtract(result_mid, result_low, writer) if result_low else result_mid
+
+        # result = result_high * 2^(2 * shift) + result_mid * 2^(shift) + result_low
+        shifted_high = self.shift(result_high, shift, writer)
+        result = self.n_bit_adder(shifted_high, result_mid, self.zero, writer)
+
+        shifted_high = self.shift(result, shift, writer)
+        result = self.n_bit_adder(shifted_high, result_low, self.zero, writer)
+
+        return result
+
+
+class ToomCook3Strategy(
+    Generic[T, W],
+    GateStrategy[T, W],
+    SimpleCircuitStrategy[T, W],
+    NBitCircuitStrategy[T, W],
+    MultiplicationStrategy[T, W],  # Extend a multiplication strategy
+    ABC
+):
+    """
+    Toom-Cook multiplication splitting both factors into three parts. The
+    product polynomial is evaluated at the points 0, 1, 2, 1/2 (scaled by 4)
+    and infinity such that all evaluations are non-negative. The
+    interpolation is computed modulo a power of two, where the exact
+    divisions by 2 drop the lsb and the exact division by 3 is a single
+    subtraction (see divide_by_three).
+    """
+    toom_min_len: int = 512
+
+    def multiply(self, factor_1: List[T], factor_2: List[T], writer: W) -> List[T]:
+        normalized_factor_1 = self.normalize(factor_1)
+        normalized_factor_2 = self.normalize(factor_2)
+        max_factor_length = max(len(normalized_factor_1), len(normalized_factor_2))
+        min_factor_length = min(len(normalized_factor_1), len(normalized_factor_2))
+        part_length = (max_factor_length + 2) // 3
+
+        if (not normalized_factor_1) or (not normalized_factor_2):
+            return [self.zero]
+        elif max_factor_length <= self.toom_min_len or min_factor_length <= 2 * part_length:
+            # Unbalanced factors are left to the next strategy as well
+            return super(ToomCook3Strategy, self).multiply(normalized_factor_1, normalized_factor_2, writer)
+        else:
+            product_length = len(normalized_factor_1) + len(normalized_factor_2)
+            # Each exact division by two loses the msb
+            width = product_length + 2
+
+            f1_high, f1_mid, f1_low = self._split(normalized_factor_1, part_length)
+            f2_high, f2_mid, f2_low = self._split(normalized_factor_2, part_length)
+
+            result_0 = self.multiply(f1_low, f2_low, writer)
+            result_1 = self.multiply(
+                self._evaluate(f1_high, f1_mid, f1_low, writer),
+                self._evaluate(f2_high, f2_mid, f2_low, writer),
+                writer
+            )
+            result_2 = self.multiply(
+                self._evaluate(self.shift(f1_high, 2, writer), self.shift(f1_mid, 1, writer), f1_low, writer),
+                self._evaluate(self.shift(f2_high, 2, writer), self.shift(f2_mid, 1, writer), f2_low, writer),
+                writer
+            )
+            result_half = self.multiply(
+                self._evaluate(f1_high, self.shift(f1_mid, 1, writer), self.shift(f1_low, 2, writer), writer),
+                self._evaluate(f2_high, self.shift(f2_mid, 1, writer), self.shift(f2_low, 2, writer), writer),
+                writer
+            )
+            result_infinity = self.multiply(f1_high, f2_high, writer)
+
+            # sum_a = c1 + c2 + c3, sum_b = 2 * c1 + 4 * c2 + 8 * c3, sum_c = 8 * c1 + 4 * c2 + 2 * c3
+            sum_a = self._subtract(result_1, self._add(result_0, result_infinity, width, writer), width, writer)
+            sum_b = self._subtract(
+                result_2,
+                self._add(result_0, self.shift(result_infinity, 4, writer), width, writer),
+                width,
+                writer
+            )
+            sum_c = self._subtract(
+                result_half,
+                self._add(self.shift(result_0, 4, writer), result_infinity, width, writer),
+                width,
+                writer
+            )
+
+            # c1 + c3 = (sum_b + sum_c - 8 * sum_a) / 2, c3 - c1 = (sum_b - sum_c) / 6
+            outer_sum = self._subtract(
+                self._add(sum_b, sum_c, width, writer),
+                self.shift(sum_a, 3, writer),
+                width,
+                writer
+            )[:-1]
+            outer_difference = self.divide_by_three(self._subtract(sum_b, sum_c, width, writer)[:-1], writer)
+
+            coefficients = [
+                result_infinity,
+                self._add(outer_sum, outer_difference, width - 1, writer)[:-1],
+                self._subtract(sum_a, outer_sum, width - 1, writer),
+                self._subtract(outer_sum, outer_difference, width - 1, writer)[:-1],
+                result_0
+            ]
+
+            # result = (((c4 * x + c3) * x + c2) * x + c1) * x + c0 with x = 2^part_length
+            result = self._truncate(coefficients[0], product_length)
+            for coefficient in coefficients[1:]:
+                shifted_result = self.shift(result, part_length, writer)
+                result = self._add(shifted_result, coefficient, product_length, writer)
 
             return result
 
+    def divide_by_three(self, number: List[T], writer: W) -> List[T]:
+        """
+        Divide the number by three modulo 2^len(number). The result is only
+        meaningful if the number is a multiple of three. The quotient q
+        satisfies q = number - 2 * q. Hence, it is computed from the lsb by
+        a single subtraction whose subtrahend is the already known part of
+        the quotient shifted by one.
+
+        :param number: the multiple of three
+        :param writer: a writer for stateful operations
+        :return: the quotient with the same length as the number
+        """
+        quotient = [self.zero] * len(number)
+
+        # number - 2 * q = number + complement(2 * q) + 1
+        previous = self.zero
+        carry = self.one
+        for index in range(1, len(number) + 1):
+            complement = self.wire_not(previous, writer)
+            quotient[-index], carry = self.full_adder(number[-index], complement, carry, writer)
+            previous = quotient[-index]
+
+        return quotient
+
+    def _evaluate(self, high: List[T], mid: List[T], low: List[T], writer: W) -> List[T]:
+        partial_sum = self.n_bit_adder(high, mid, self.zero, writer)
+        return self.n_bit_adder(partial_sum, low, self.zero, writer)
+
+    def _add(self, number_1: List[T], number_2: List[T], width: int, writer: W) -> List[T]:
+        return self._truncate(self.n_bit_adder(number_1, number_2, self.zero, writer), width)
+
+    def _subtract(self, number_1: List[T], number_2: List[T], width: int, writer: W) -> List[T]:
+        return self.subtract(self._truncate(number_1, width), self._truncate(number_2, width), writer)
+
+    def _truncate(self, number: List[T], width: int) -> List[T]:
+        if len(number) >= width:
+            return number[len(number) - width:]
+        else:
+            return [self.zero] * (width - len(number)) + number
 
-class WallaceTreeStrategy(
+    @staticmethod
+    def _split(number: List[T], part_length: int) -> Tuple[List[T], List[T], List[T]]:
+        high_and_mid, low = utils.split_at(number, -part_length)
+        high, mid = utils.split_at(high_and_mid, -part_length)
+        return high, mid, low
+
+
+class ColumnCompressionStrategy(
     Generic[T, W],
     GateStrategy[T, W],
+    ABC
+):
+    """
+    Base for multipliers that sort the partial products into columns of
+    equal weight and compress the columns afterwards (see compress).
+    """
+
+    def partial_products(self, factor_1: List[T], factor_2: List[T], writer: W) -> List[List[T]]:
+        """
+        Calculate the partial products of all pairs of bits and sort them by
+        their weight.
+
+        :param factor_1: the first factor
+        :param factor_2: the second factor
+        :param writer: a writer for stateful operations
+        :return: the columns of partial products starting at the lsb
+        """
+        columns = [[] for _ in range(len(factor_1) + len(factor_2) - 1)]
+        for i, x in enumerate(factor_1):
+            w_x = len(factor_1) - i
+
+            for j, y in enumerate(factor_2):
+                w_y = len(factor_2) - j
+
+                columns[w_x + w_y - 2].append(self.wire_and(x, y, writer))
+
+        return columns
+
+    @abstractmethod
+    def compress(self, columns: List[List[T]], writer: W) -> List[T]:
+        """
+        Calculate the sum of all values, where the values in the i-th column
+        have the weight 2^i.
+
+        :param columns: the values to be added starting at the lsb
+        :param writer: a writer for stateful operations
+        :return: the sum of all values
+        """
+        pass
+
+
+class CarrySaveRecombinationStrategy(
+    Generic[T, W],
+    ColumnCompressionStrategy[T, W],
+    ABC
+):
+    """
+    Replaces the recombination of KaratsubaStrategy. Instead of two
+    subtractions and two additions with full carry chains, all five terms
+    (including the negated ones) are sorted into columns and summed by a
+    single compressor (see compress), i.e. only one carry chain remains.
+    """
+
+    def recombine(
+            self,
+            result_high: List[T],
+            product_mid: List[T],
+            result_low: List[T],
+            shift: int,
+            writer: W
+    ) -> List[T]:
+        # The result is computed modulo 2^width, which exceeds the product of the factors
+        width = max(len(result_high) + 2 * shift, len(product_mid) + shift, len(result_low) + shift) + 1
+        columns = [[] for _ in range(width)]
+        constant = 0
+
+        def add(number: List[T], weight: int, negate: bool):
+            nonlocal constant
+
+            # -x = complement(x) - 2^len(x) + 1
+            if negate:
+                constant += (1 - 2 ** len(number)) << weight
+
+            for index, value in enumerate(reversed(number), start=weight):
+                value = self.wire_not(value, writer) if negate else value
+
+                if self.is_constant(value):
+                    constant += int(self.is_one(value)) << index
+                else:
+                    columns[index].append(value)
+
+        add(result_high, 2 * shift, False)
+        add(product_mid, shift, False)
+        add(result_high, shift, True)
+        add(result_low, shift, True)
+        add(result_low, 0, False)
+
+        for weight in range(width):
+            if (constant >> weight) & 1:
+                columns[weight].append(self.one)
+
+        return self.compress(columns, writer)[-width:]
+
+
+class WallaceTreeStrategy(
+    Generic[T, W],
+    ColumnCompressionStrategy[T, W],
     SimpleCircuitStrategy[T, W],
     MultiplicationStrategy[T, W],
     ABC
 ):
 
     def multiply(self, factor_1: List[T], factor_2: List[T], writer: W) -> List[T]:
-        products = self._weighted_product(factor_1, factor_2, writer)
+        return self.compress(self.partial_products(factor_1, factor_2, writer), writer)
+
+    def compress(self, columns: List[List[T]], writer: W) -> List[T]:
+        # The columns are visited from the msb to keep the order of the generated gates
+        products = ((weight, product) for weight in reversed(range(len(columns))) for product in columns[weight])
         grouped_products = utils.group(products)
 
         while any(len(products) > 2 for _, products in grouped_products.items()):
@@ -97,18 +416,6 @@ class WallaceTreeStrategy(
         result.append(last_carry)
         return result[::-1]
 
-    def _weighted_product(self, factor_1: List[T], factor_2: List[T], writer: W):
-        for i, x in enumerate(factor_1):
-            w_x = len(factor_1) - i
-
-            for j, y in enumerate(factor_2):
-                w_y = len(factor_2) - j
-
-                weight_sum = w_x + w_y
-                product = self.wire_and(x, y, writer)
-
-                yield weight_sum, product
-
     def _add_layer(self, weight: int, products: List[T], writer: W) -> List[Tuple[int, T]]:
         if len(products) == 1:
             return [(weight, products[0])]
@@ -127,3 +434,151 @@ class WallaceTreeStrategy(
 
         else:
             raise ValueError('Cannot add a layer for an empty product')
+
+
+class DaddaTreeStrategy(
+    Generic[T, W],
+    ColumnCompressionStrategy[T, W],
+    SimpleCircuitStrategy[T, W],
+    NBitCircuitStrategy[T, W],
+    MultiplicationStrategy[T, W],
+    ABC
+):
+    """
+    Dadda tree: the columns are reduced in stages to the heights of the Dadda
+    sequence 2, 3, 4, 6, 9, 13, ... Each stage places only as many full and
+    half adders as necessary to reach the next height. The two remaining
+    rows are added by the n-bit adder.
+    """
+
+    def multiply(self, factor_1: List[T], factor_2: List[T], writer: W) -> List[T]:
+        return self.compress(self.partial_products(factor_1, factor_2, writer), writer)
+
+    def compress(self, columns: List[List[T]], writer: W) -> List[T]:
+        columns = [[value for value in column if not self.is_zero(value)] for column in columns]
+
+        for height in reversed(self.dadda_heights(max(map(len, columns), default=0))):
+            # Outputs are only collected for the next stage, the carries are added to the next column
+            reduced_columns = [[] for _ in range(len(columns) + 1)]
+
+            for weight, column in enumerate(columns):
+                reduced_column = reduced_columns[weight]
+                index = 0
+
+                while len(column) - index + len(reduced_column) > height:
+                    if len(column) - index + len(reduced_column) == height + 1:
+                        output_sum, carry = self.half_adder(column[index], column[index + 1], writer)
+                        index += 2
+                    else:
+                        output_sum, carry = self.full_adder(column[index], column[index + 1], column[index + 2], writer)
+                        index += 3
+
+                    reduced_column.append(output_sum)
+                    reduced_columns[weight + 1].append(carry)
+
+                reduced_column.extend(column[index:])
+
+            columns = reduced_columns
+
+        row_1 = [column[0] if len(column) > 0 else self.zero for column in reversed(columns)]
+        row_2 = [column[1] if len(column) > 1 else self.zero for column in reversed(columns)]
+
+        return self.n_bit_adder(row_1, row_2, self.zero, writer)
+
+    @staticmethod
+    def dadda_heights(max_height: int) -> List[int]:
+        """
+        Calculate the Dadda sequence d_1 = 2, d_(j+1) = floor(1.5 * d_j)
+        up to (excluding) the specified height.
+
+        :param max_height: the height of the highest column
+        :return: the heights of the stages in ascending order
+        """
+        heights = []
+        height = 2
+        while height < max_height:
+            heights.append(height)
+            height = height * 3 // 2
+
+        return heights
+
+
+class BoothMultiplicationStrategy(
+    Generic[T, W],
+    ColumnCompressionStrategy[T, W],
+    SimpleCircuitStrategy[T, W],
+    MultiplicationStrategy[T, W],
+    ABC
+):
+    """
+    Radix-4 (modified) Booth multiplier for unsigned factors. The shorter
+    factor is recoded into the digits -2, -1, 0, 1, 2. Thus, only about half
+    of the partial product rows are generated. The rows are summed by the
+    compressor of the next strategy in the method resolution order, e.g.
+    DaddaTreeStrategy.
+    """
+
+    def multiply(self, factor_1: List[T], factor_2: List[T], writer: W) -> List[T]:
+        if (not factor_1) or (not factor_2):
+            return [self.zero]
+
+        multiplicand, multiplier = (factor_1, factor_2) if len(factor_1) >= len(factor_2) else (factor_2, factor_1)
+        columns = self.booth_partial_products(multiplicand, multiplier, writer)
+
+        # The rows are added modulo 2^width (see booth_partial_products)
+        return self.compress(columns, writer)[-len(columns):]
+
+    def booth_partial_products(self, multiplicand: List[T], multiplier: List[T], writer: W) -> List[List[T]]:
+        """
+        Calculate the rows multiplicand * digit * 4^k for the Booth digits of
+        the multiplier and sort them by their weight. Negative rows are
+        represented by the complement plus one. The resulting sign bits are
+        replaced by their negation and a constant correction such that no
+        sign extension is necessary. Since the correction is only correct
+        modulo 2^width, the sum of the columns has to be truncated to width bits.
+
+        :param multiplicand: the factor whose multiples form the rows
+        :param multiplier: the factor that is recoded
+        :param writer: a writer for stateful operations
+        :return: the columns of partial products starting at the lsb
+        """
+        width = len(multiplicand) + len(multiplier)
+        columns = [[] for _ in range(width)]
+
+        def add(weight: int, value: T):
+            if weight < width:
+                columns[weight].append(value)
+
+        # The bits are ordered from the lsb, the multiplier is extended by the implicit bit y_(-1)
+        bits_x = multiplicand[::-1] + [self.zero]
+        bits_y = [self.zero] + multiplier[::-1] + [self.zero, self.zero]
+
+        correction = 0
+        for k in range(len(multiplier) // 2 + 1):
+            low, mid, high = bits_y[2 * k:2 * k + 3]
+
+            # digit = -2 * high + mid + low
+            negate = high
+            select_one = self.xor(mid, low, writer)
+            select_two = self.wire_and(self.equality(mid, low, writer), self.xor(high, mid, writer), writer)
+
+            previous = self.zero
+            for j, x in enumerate(bits_x):
+                magnitude = self.wire_or(
+                    self.wire_and(select_one, x, writer),
+                    self.wire_and(select_two, previous, writer),
+                    writer
+                )
+
+                add(2 * k + j, self.xor(magnitude, negate, writer))
+                previous = x
+
+            add(2 * k, negate)
+            add(2 * k + len(bits_x), self.wire_not(negate, writer))
+            correction += 2 ** (2 * k + len(bits_x))
+
+        for weight in range(width):
+            if (-correction >> weight) & 1:
+                add(weight, self.one)
+
+        return columns
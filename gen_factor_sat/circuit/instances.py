@@ -1,13 +1,18 @@
 from abc import ABC
-from typing import TypeVar
+from typing import Dict, Type, TypeVar
 
+from gen_factor_sat.circuit.aig.circuit import AigGateStrategy
+from gen_factor_sat.circuit.default.addition import KoggeStoneAdderStrategy, BrentKungAdderStrategy, \
+    SklanskyAdderStrategy, CarrySelectAdderStrategy
 from gen_factor_sat.circuit.default.circuit import ConstantStrategy, GeneralSimpleCircuitStrategy, \
     GeneralNBitCircuitStrategy
 from gen_factor_sat.circuit.default.factoring import GeneralFactoringStrategy
-from gen_factor_sat.circuit.default.multiplication import WallaceTreeStrategy, KaratsubaStrategy
+from gen_factor_sat.circuit.default.multiplication import WallaceTreeStrategy, KaratsubaStrategy, ToomCook3Strategy, \
+    DaddaTreeStrategy, BoothMultiplicationStrategy, CarrySaveRecombinationStrategy
 from gen_factor_sat.circuit.interface.circuit import GateStrategy
 from gen_factor_sat.circuit.interface.factoring import FactoringStrategy
 from gen_factor_sat.circuit.tseitin.circuit import TseitinGateStrategy, TseitinCircuitStrategy
+from gen_factor_sat.formula.aig import Aig
 from gen_factor_sat.formula.cnf import CNFBuilder
 from gen_factor_sat.formula.symbol import Symbol, Constant
 
@@ -32,8 +37,23 @@ class TseitinFactoringStrategy(
     TseitinGateStrategy,
     TseitinCircuitStrategy,
     GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    ToomCook3Strategy[Symbol, CNFBuilder],
     KaratsubaStrategy[Symbol, CNFBuilder],
-    WallaceTreeStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class TseitinCarrySaveFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    ToomCook3Strategy[Symbol, CNFBuilder],
+    CarrySaveRecombinationStrategy[Symbol, CNFBuilder],
+    KaratsubaStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
     GeneralFactoringStrategy[Symbol, CNFBuilder],
     FactoringAndGateStrategy[Symbol, CNFBuilder]
 ):
@@ -51,12 +71,108 @@ class TseitinWallaceFactoringStrategy(
     pass
 
 
+class TseitinKoggeStoneFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    KoggeStoneAdderStrategy[Symbol, CNFBuilder],
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    ToomCook3Strategy[Symbol, CNFBuilder],
+    KaratsubaStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class TseitinBrentKungFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    BrentKungAdderStrategy[Symbol, CNFBuilder],
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    ToomCook3Strategy[Symbol, CNFBuilder],
+    KaratsubaStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class TseitinSklanskyFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    SklanskyAdderStrategy[Symbol, CNFBuilder],
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    ToomCook3Strategy[Symbol, CNFBuilder],
+    KaratsubaStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class TseitinCarrySelectFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    CarrySelectAdderStrategy[Symbol, CNFBuilder],
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    ToomCook3Strategy[Symbol, CNFBuilder],
+    KaratsubaStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class TseitinDaddaFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class TseitinBoothFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    BoothMultiplicationStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class AigFactoringStrategy(
+    AigGateStrategy,
+    GeneralSimpleCircuitStrategy[Symbol, Aig],
+    GeneralNBitCircuitStrategy[Symbol, Aig],
+    KaratsubaStrategy[Symbol, Aig],
+    WallaceTreeStrategy[Symbol, Aig],
+    GeneralFactoringStrategy[Symbol, Aig],
+    FactoringAndGateStrategy[Symbol, Aig]
+):
+    pass
+
+
+class PlaistedGreenbaumFactoringStrategy(AigFactoringStrategy):
+    polarity_aware = True
+
+
 class ConstantFactoringStrategy(
     ConstantStrategy,
     GeneralSimpleCircuitStrategy[Constant, None],
     GeneralNBitCircuitStrategy[Constant, None],
+    ToomCook3Strategy[Constant, None],
     KaratsubaStrategy[Constant, None],
-    WallaceTreeStrategy[Constant, None],
+    DaddaTreeStrategy[Constant, None],
     GeneralFactoringStrategy[Constant, None],
     FactoringAndGateStrategy[Constant, None]
 ):
@@ -72,3 +188,60 @@ class ConstantWallaceFactoringStrategy(
     FactoringAndGateStrategy[Constant, None]
 ):
     pass
+
+
+class ConstantDaddaFactoringStrategy(
+    ConstantStrategy,
+    GeneralSimpleCircuitStrategy[Constant, None],
+    GeneralNBitCircuitStrategy[Constant, None],
+    DaddaTreeStrategy[Constant, None],
+    GeneralFactoringStrategy[Constant, None],
+    FactoringAndGateStrategy[Constant, None]
+):
+    pass
+
+
+class ConstantBoothFactoringStrategy(
+    ConstantStrategy,
+    GeneralSimpleCircuitStrategy[Constant, None],
+    GeneralNBitCircuitStrategy[Constant, None],
+    BoothMultiplicationStrategy[Constant, None],
+    DaddaTreeStrategy[Constant, None],
+    GeneralFactoringStrategy[Constant, None],
+    FactoringAndGateStrategy[Constant, None]
+):
+    pass
+
+
+class ConstantCarrySaveFactoringStrategy(
+    ConstantStrategy,
+    GeneralSimpleCircuitStrategy[Constant, None],
+    GeneralNBitCircuitStrategy[Constant, None],
+    CarrySaveRecombinationStrategy[Constant, None],
+    KaratsubaStrategy[Constant, None],
+    DaddaTreeStrategy[Constant, None],
+    GeneralFactoringStrategy[Constant, None],
+    FactoringAndGateStrategy[Constant, None]
+):
+    pass
+
+
+DEFAULT_STRATEGY = 'karatsuba'
+
+AUTO_STRATEGY = 'auto'
+"""Selects the strategy yielding the smallest CNF among all registered strategies (see FactoringSat)."""
+
+STRATEGIES: Dict[str, Type[FactoringAndGateStrategy]] = {
+    'karatsuba': TseitinFactoringStrategy,
+    'carry-save': TseitinCarrySaveFactoringStrategy,
+    'wallace': TseitinWallaceFactoringStrategy,
+    'dadda': TseitinDaddaFactoringStrategy,
+    'booth': TseitinBoothFactoringStrategy,
+    'aig': AigFactoringStrategy,
+    'plaisted-greenbaum': PlaistedGreenbaumFactoringStrategy,
+    'kogge-stone': TseitinKoggeStoneFactoringStrategy,
+    'brent-kung': TseitinBrentKungFactoringStrategy,
+    'sklansky': TseitinSklanskyFactoringStrategy,
+    'carry-select': TseitinCarrySelectFactoringStrategy
+}
+"""The strategies that can be selected by name, e.g. on the command line."""
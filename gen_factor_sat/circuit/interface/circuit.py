@@ -36,6 +36,15 @@ class GateStrategy(Generic[T, W], ABC):
         """
         pass
 
+    @abstractmethod
+    def create_writer(self) -> W:
+        """
+        Create a new writer collecting the stateful operations of this strategy.
+
+        :return: the writer
+        """
+        pass
+
     @abstractmethod
     def wire_and(self, value_1: T, value_2: T, writer: W) -> T:
         """
@@ -125,7 +134,7 @@ class GateStrategy(Generic[T, W], ABC):
         :return: the one element
         :raises ValueError if the value is not one
         """
-        if not self.is_zero(value):
+        if not self.is_one(value):
             raise ValueError('the value {0} cannot be cast to {1}'.format(value, self.one))
         else:
             return self.one
@@ -185,6 +194,45 @@ class SimpleCircuitStrategy(Generic[T, W], ABC):
         """
         pass
 
+    @abstractmethod
+    def xor3(self, value_1: T, value_2: T, value_3: T, writer: W) -> T:
+        """
+        Check whether an odd number of the inputs is one.
+
+        :param value_1: the first input
+        :param value_2: the second input
+        :param value_3: the third input
+        :param writer: a writer for stateful operations
+        :return: one if an odd number of the inputs is one, otherwise zero
+        """
+        pass
+
+    @abstractmethod
+    def majority(self, value_1: T, value_2: T, value_3: T, writer: W) -> T:
+        """
+        Check whether at least two of the inputs are one.
+
+        :param value_1: the first input
+        :param value_2: the second input
+        :param value_3: the third input
+        :param writer: a writer for stateful operations
+        :return: one if at least two inputs are one, otherwise zero
+        """
+        pass
+
+    @abstractmethod
+    def ite(self, condition: T, value_1: T, value_0: T, writer: W) -> T:
+        """
+        Choose one of the values depending on the condition (multiplexer).
+
+        :param condition: the value deciding which value is chosen
+        :param value_1: the value chosen if the condition is one
+        :param value_0: the value chosen if the condition is zero
+        :param writer: a writer for stateful operations
+        :return: value_1 if the condition is one, otherwise value_0
+        """
+        pass
+
 
 class NBitCircuitStrategy(Generic[T, W], ABC):
     """
@@ -233,6 +281,18 @@ class NBitCircuitStrategy(Generic[T, W], ABC):
         """
         pass
 
+    @abstractmethod
+    def less_equal(self, number_1: List[T], number_2: List[T], writer: W) -> T:
+        """
+        Check whether the first number is less than or equal to the second number.
+
+        :param number_1: the first value to be compared
+        :param number_2: the second value to be compared
+        :param writer: a writer for stateful operations
+        :return: one if the first value is less than or equal to the second value, otherwise zero
+        """
+        pass
+
     @abstractmethod
     def shift(self, number: List[T], shifts: int, writer: W) -> List[T]:
         """
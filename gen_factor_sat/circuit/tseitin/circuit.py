@@ -1,37 +1,48 @@
 from abc import ABC
-from typing import TypeVar, cast
+from typing import Tuple, TypeVar, cast
 
 import gen_factor_sat.circuit.tseitin.encoding as te
-from gen_factor_sat.circuit.default.circuit import GeneralSimpleCircuitStrategy
-from gen_factor_sat.circuit.interface.circuit import GateStrategy
+from gen_factor_sat.circuit.default.circuit import GeneralSimpleCircuitStrategy, SymbolGateStrategy
 from gen_factor_sat.formula.cnf import CNFBuilder
-from gen_factor_sat.formula.symbol import Symbol, Variable, variable, Constant, constant
+from gen_factor_sat.formula.symbol import Symbol, Variable, variable, Constant
 
 T = TypeVar('T')
 
 
-class TseitinGateStrategy(GateStrategy[Symbol, CNFBuilder]):
-    zero: Constant = constant('0')
-    one: Constant = constant('1')
+class TseitinGateStrategy(SymbolGateStrategy[CNFBuilder]):
+    """
+    Encodes the gates by the Tseitin transformation. If max_gates is
+    positive, up to max_gates gates are remembered by the writer and
+    structurally equal gates are encoded once (see CNFBuilder.from_tseitin).
+
+    Structural hashing is a library-only feature: neither a registered
+    strategy nor the command line enables it, since it did not reduce the
+    CNFs of the multipliers. Set max_gates on a strategy instance to use it.
+    """
+    max_gates: int = 0
+
+    def create_writer(self) -> CNFBuilder:
+        return CNFBuilder(max_gates=self.max_gates)
 
     def wire_and(self, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
         if self.is_constant(value_1) or self.is_constant(value_2):
             return self._constant_and(value_1, value_2)
+        elif value_1 == value_2:
+            return value_1
+        elif value_1 == self.wire_not(value_2, writer):
+            return self.zero
         else:
-            return writer.from_tseitin(te.and_equality, value_1, value_2)
+            return writer.from_tseitin(te.and_equality, *_commutative(value_1, value_2))
 
     def wire_or(self, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
         if self.is_constant(value_1) or self.is_constant(value_2):
             return self._constant_or(value_1, value_2)
+        elif value_1 == value_2:
+            return value_1
+        elif value_1 == self.wire_not(value_2, writer):
+            return self.one
         else:
-            return writer.from_tseitin(te.or_equality, value_1, value_2)
-
-    def wire_not(self, value: Symbol, writer: CNFBuilder) -> Symbol:
-        if self.is_constant(value):
-            return self._constant_not(value)
-        else:
-            var = cast(Variable, value)  # Type hint
-            return variable(-var)
+            return writer.from_tseitin(te.or_equality, *_commutative(value_1, value_2))
 
     def expect_zero(self, value: Symbol, writer: CNFBuilder) -> Symbol:
         return self.expect(value, self.zero, writer)
@@ -52,52 +63,95 @@ class TseitinGateStrategy(GateStrategy[Symbol, CNFBuilder]):
         :return: the value of the symbol
         """
         if self.is_constant(symbol) and symbol != value:
-            writer.add_clauses({te.empty_clause()})
+            writer.add_clauses([te.empty_clause()])
         elif not self.is_constant(symbol):
             var = cast(Variable, symbol)  # Type hint
             if self.is_one(value):
-                writer.add_clauses({te.unit_clause(var)})
+                writer.add_clauses([te.unit_clause(var)])
             else:
-                writer.add_clauses({te.unit_clause(variable(-var))})
+                writer.add_clauses([te.unit_clause(variable(-var))])
 
         return value
 
-    def _constant_and(self, symbol_1: Symbol, symbol_2: Symbol) -> Symbol:
-        if symbol_1 == self.zero or symbol_2 == self.zero:
-            return self.zero
-        elif symbol_1 == self.one:
-            return symbol_2
-        elif symbol_2 == self.one:
-            return symbol_1
-        else:
-            raise ValueError('Neither {0} nor {1} is a constant'.format(symbol_1, symbol_2))
 
-    def _constant_or(self, symbol_1: Symbol, symbol_2: Symbol) -> Symbol:
-        if symbol_1 == self.one or symbol_2 == self.one:
-            return self.one
-        if symbol_1 == self.zero:
-            return symbol_2
-        elif symbol_2 == self.zero:
-            return symbol_1
+class TseitinCircuitStrategy(GeneralSimpleCircuitStrategy[Symbol, CNFBuilder], ABC):
+    """
+    Encodes full adders by a 3-input XOR and a majority gate instead of
+    composing two half adders. If redundant_clauses is set, the clauses
+    connecting the sum and the carry are added as well (see
+    te.full_adder_redundant).
+    """
+    redundant_clauses: bool = False
+
+    def full_adder(self, value_1: Symbol, value_2: Symbol, carry: Symbol, writer: CNFBuilder) -> Tuple[Symbol, Symbol]:
+        if not _are_distinct_variables(value_1, value_2, carry):
+            # The half adders simplify constants and dependent inputs
+            return super(TseitinCircuitStrategy, self).full_adder(value_1, value_2, carry, writer)
+
+        output_sum = self.xor3(value_1, value_2, carry, writer)
+        output_carry = self.majority(value_1, value_2, carry, writer)
+
+        if self.redundant_clauses:
+            writer.add_clauses(te.full_adder_redundant(value_1, value_2, carry, output_sum, output_carry))
+
+        return output_sum, output_carry
+
+    def xor3(self, value_1: Symbol, value_2: Symbol, value_3: Symbol, writer: CNFBuilder) -> Symbol:
+        if not _are_distinct_variables(value_1, value_2, value_3):
+            return super(TseitinCircuitStrategy, self).xor3(value_1, value_2, value_3, writer)
         else:
-            raise ValueError('Neither {0} nor {1} is a constant'.format(symbol_1, symbol_2))
-
-    def _constant_not(self, symbol: Symbol) -> Symbol:
-        if symbol == self.zero:
-            return self.one
-        elif symbol == self.one:
-            return self.zero
+            # Normalize the polarity of the inputs: (-x XOR y XOR z) == -(x XOR y XOR z)
+            inputs = cast(Tuple[Variable, Variable, Variable], (value_1, value_2, value_3))  # Type hint
+            negations = sum(var < 0 for var in inputs)
+
+            output = writer.from_tseitin(te.xor3_equality, *sorted(variable(abs(var)) for var in inputs))
+            return output if negations % 2 == 0 else self.wire_not(output, writer)
+
+    def majority(self, value_1: Symbol, value_2: Symbol, value_3: Symbol, writer: CNFBuilder) -> Symbol:
+        if self.is_constant(value_1):
+            return self._constant_majority(value_1, value_2, value_3, writer)
+        elif self.is_constant(value_2):
+            return self._constant_majority(value_2, value_1, value_3, writer)
+        elif self.is_constant(value_3):
+            return self._constant_majority(value_3, value_1, value_2, writer)
+        elif not _are_distinct_variables(value_1, value_2, value_3):
+            return super(TseitinCircuitStrategy, self).majority(value_1, value_2, value_3, writer)
         else:
-            raise ValueError('{0} is no constant'.format(symbol))
-
-
-class TseitinCircuitStrategy(GeneralSimpleCircuitStrategy[Symbol, CNFBuilder], ABC):
+            # Majority is self-dual: majority(-x, -y, -z) == -majority(x, y, z)
+            inputs = cast(Tuple[Variable, Variable, Variable], (value_1, value_2, value_3))  # Type hint
+            if sum(var < 0 for var in inputs) >= 2:
+                output = writer.from_tseitin(te.majority_equality, *sorted(variable(-var) for var in inputs))
+                return self.wire_not(output, writer)
+            else:
+                return writer.from_tseitin(te.majority_equality, *sorted(inputs))
+
+    def ite(self, condition: Symbol, value_1: Symbol, value_0: Symbol, writer: CNFBuilder) -> Symbol:
+        if not _are_distinct_variables(condition, value_1, value_0):
+            return super(TseitinCircuitStrategy, self).ite(condition, value_1, value_0, writer)
+        elif condition < 0:
+            # ite(-c, x, y) == ite(c, y, x)
+            return self.ite(self.wire_not(condition, writer), value_0, value_1, writer)
+        elif value_1 < 0:
+            # ite(c, -x, -y) == -ite(c, x, y)
+            output = self.ite(condition, self.wire_not(value_1, writer), self.wire_not(value_0, writer), writer)
+            return self.wire_not(output, writer)
+        else:
+            return writer.from_tseitin(te.ite_equality, condition, value_1, value_0)
 
     def xor(self, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
         if self.is_constant(value_1) or self.is_constant(value_2):
             return self._constant_xor(value_1, value_2, writer)
+        elif value_1 == value_2:
+            return self.zero
+        elif value_1 == self.wire_not(value_2, writer):
+            return self.one
         else:
-            return writer.from_tseitin(te.xor_equality, value_1, value_2)
+            # Normalize the polarity of the inputs: (-x XOR y) == -(x XOR y)
+            var_1 = cast(Variable, value_1)  # Type hint
+            var_2 = cast(Variable, value_2)  # Type hint
+
+            output = writer.from_tseitin(te.xor_equality, *_commutative(variable(abs(var_1)), variable(abs(var_2))))
+            return output if (var_1 < 0) == (var_2 < 0) else self.wire_not(output, writer)
 
     # def equality(self, x: Symbol, y: Symbol) -> Symbol:
     #     if _is_constant(x):
@@ -109,6 +163,12 @@ class TseitinCircuitStrategy(GeneralSimpleCircuitStrategy[Symbol, CNFBuilder], A
     #         self.gate_builder.cnf_builder.append_clauses(tseitin.equal_equality(x, y, z))
     #         return z
 
+    def _constant_majority(self, constant: Symbol, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
+        if constant == self.one:
+            return self.wire_or(value_1, value_2, writer)
+        else:
+            return self.wire_and(value_1, value_2, writer)
+
     def _constant_xor(self, input_1, input_2, writer: CNFBuilder):
         if input_1 == self.one:
             return self.wire_not(input_2, writer)
@@ -120,3 +180,28 @@ class TseitinCircuitStrategy(GeneralSimpleCircuitStrategy[Symbol, CNFBuilder], A
             return input_1
         else:
             raise ValueError('Neither {0} nor {1} is a constant'.format(input_1, input_2))
+
+
+def _are_distinct_variables(*values: Symbol) -> bool:
+    """
+    Check whether all values are variables that are pairwise neither equal
+    nor complementary. Otherwise, gates can be simplified.
+
+    :param values: the inputs of a gate
+    :return: true if the values are independent variables, otherwise false
+    """
+    variables = set()
+    for value in values:
+        if not isinstance(value, int) or abs(value) in variables:
+            return False
+        variables.add(abs(value))
+
+    return True
+
+
+def _commutative(value_1: Symbol, value_2: Symbol) -> Tuple[Symbol, Symbol]:
+    """
+    Order the inputs of a commutative gate such that structurally equal gates
+    share the same representation.
+    """
+    return (value_1, value_2) if value_1 <= value_2 else (value_2, value_1)
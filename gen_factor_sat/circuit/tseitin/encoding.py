@@ -1,73 +1,234 @@
-from typing import Set, List
+from typing import List
 
 from gen_factor_sat.formula.cnf import Clause
 from gen_factor_sat.formula.symbol import Variable
 
 
-def and_equality(input_1: Variable, input_2: Variable, output: Variable) -> Set[Clause]:
+def and_equality(input_1: Variable, input_2: Variable, output: Variable) -> List[Clause]:
     """
     Encode an AND-Gate into a CNF.
 
     :param input_1: variable representing the first input of the AND-Gate
     :param input_2: variable representing the second input of the AND-Gate
     :param output: variable representing the output of the AND-Gate
-    :return: A set of clauses encoding the AND-Gate
+    :return: A list of clauses encoding the AND-Gate
     """
-    return {
-        frozenset([input_1, -output]),
-        frozenset([input_2, -output]),
-        frozenset([-input_1, -input_2, output])
-    }
+    return [
+        (input_1, -output),
+        (input_2, -output),
+        (-input_1, -input_2, output)
+    ]
 
 
-def or_equality(input_1: Variable, input_2: Variable, output: Variable) -> Set[Clause]:
+def or_equality(input_1: Variable, input_2: Variable, output: Variable) -> List[Clause]:
     """
     Encode an OR-Gate into a CNF.
 
     :param input_1: variable representing the first input of the OR-Gate
     :param input_2: variable representing the second input of the OR-Gate
     :param output: variable representing the output of the OR-Gate
-    :return: A set of clauses encoding the OR-Gate
+    :return: A list of clauses encoding the OR-Gate
     """
-    return {
-        frozenset([-input_1, output]),
-        frozenset([-input_2, output]),
-        frozenset([input_1, input_2, -output])
-    }
+    return [
+        (-input_1, output),
+        (-input_2, output),
+        (input_1, input_2, -output)
+    ]
 
 
-def xor_equality(input_1: Variable, input_2: Variable, output: Variable) -> Set[Clause]:
+def xor_equality(input_1: Variable, input_2: Variable, output: Variable) -> List[Clause]:
     """
     Encode an XOR-Gate into a CNF.
 
     :param input_1: variable representing the first input of the XOR-Gate
     :param input_2: variable representing the second input of the XOR-Gate
     :param output: variable representing the output of the XOR-Gate
-    :return: A set of clauses encoding the XOR-Gate
+    :return: A list of clauses encoding the XOR-Gate
     """
-    return {
-        frozenset([-input_1, -input_2, -output]),
-        frozenset([-input_1, input_2, output]),
-        frozenset([input_1, -input_2, output]),
-        frozenset([input_1, input_2, -output])
-    }
+    return [
+        (-input_1, -input_2, -output),
+        (-input_1, input_2, output),
+        (input_1, -input_2, output),
+        (input_1, input_2, -output)
+    ]
 
 
-def equal_equality(input_1: Variable, input_2: Variable, output: Variable) -> Set[Clause]:
+def and_positive(input_1: Variable, input_2: Variable, output: Variable) -> List[Clause]:
+    """
+    Encode the implication output -> (input_1 AND input_2) into a CNF. This is
+    sufficient if the output of the AND-Gate is only used positively
+    (Plaisted-Greenbaum encoding).
+
+    :param input_1: variable representing the first input of the AND-Gate
+    :param input_2: variable representing the second input of the AND-Gate
+    :param output: variable representing the output of the AND-Gate
+    :return: A list of clauses encoding the implication
+    """
+    return [
+        (input_1, -output),
+        (input_2, -output)
+    ]
+
+
+def and_negative(input_1: Variable, input_2: Variable, output: Variable) -> List[Clause]:
+    """
+    Encode the implication (input_1 AND input_2) -> output into a CNF. This is
+    sufficient if the output of the AND-Gate is only used negatively
+    (Plaisted-Greenbaum encoding).
+
+    :param input_1: variable representing the first input of the AND-Gate
+    :param input_2: variable representing the second input of the AND-Gate
+    :param output: variable representing the output of the AND-Gate
+    :return: A list of clauses encoding the implication
+    """
+    return [
+        (-input_1, -input_2, output)
+    ]
+
+
+def xor_positive(input_1: Variable, input_2: Variable, output: Variable) -> List[Clause]:
+    """
+    Encode the implication output -> (input_1 XOR input_2) into a CNF. This is
+    sufficient if the output of the XOR-Gate is only used positively
+    (Plaisted-Greenbaum encoding).
+
+    :param input_1: variable representing the first input of the XOR-Gate
+    :param input_2: variable representing the second input of the XOR-Gate
+    :param output: variable representing the output of the XOR-Gate
+    :return: A list of clauses encoding the implication
+    """
+    return [
+        (-input_1, -input_2, -output),
+        (input_1, input_2, -output)
+    ]
+
+
+def xor_negative(input_1: Variable, input_2: Variable, output: Variable) -> List[Clause]:
+    """
+    Encode the implication (input_1 XOR input_2) -> output into a CNF. This is
+    sufficient if the output of the XOR-Gate is only used negatively
+    (Plaisted-Greenbaum encoding).
+
+    :param input_1: variable representing the first input of the XOR-Gate
+    :param input_2: variable representing the second input of the XOR-Gate
+    :param output: variable representing the output of the XOR-Gate
+    :return: A list of clauses encoding the implication
+    """
+    return [
+        (-input_1, input_2, output),
+        (input_1, -input_2, output)
+    ]
+
+
+def equal_equality(input_1: Variable, input_2: Variable, output: Variable) -> List[Clause]:
     """
     Encode an Equality-Gate into a CNF.
 
     :param input_1: variable representing the first input of the Equality-Gate
     :param input_2: variable representing the second input of the Equality-Gate
     :param output: variable representing the output of the Equality-Gate
-    :return: A set of clauses encoding the Equality-Gate
+    :return: A list of clauses encoding the Equality-Gate
+    """
+    return [
+        (input_1, input_2, output),
+        (input_1, -input_2, -output),
+        (-input_1, input_2, -output),
+        (-input_1, -input_2, output)
+    ]
+
+
+def xor3_equality(input_1: Variable, input_2: Variable, input_3: Variable, output: Variable) -> List[Clause]:
+    """
+    Encode a 3-input XOR-Gate into a CNF, e.g. the sum of a full adder.
+
+    :param input_1: variable representing the first input of the XOR-Gate
+    :param input_2: variable representing the second input of the XOR-Gate
+    :param input_3: variable representing the third input of the XOR-Gate
+    :param output: variable representing the output of the XOR-Gate
+    :return: A list of clauses encoding the XOR-Gate
+    """
+    return [
+        (-input_1, -input_2, -input_3, output),
+        (-input_1, -input_2, input_3, -output),
+        (-input_1, input_2, -input_3, -output),
+        (-input_1, input_2, input_3, output),
+        (input_1, -input_2, -input_3, -output),
+        (input_1, -input_2, input_3, output),
+        (input_1, input_2, -input_3, output),
+        (input_1, input_2, input_3, -output)
+    ]
+
+
+def majority_equality(input_1: Variable, input_2: Variable, input_3: Variable, output: Variable) -> List[Clause]:
+    """
+    Encode a Majority-Gate into a CNF, e.g. the carry of a full adder.
+
+    :param input_1: variable representing the first input of the Majority-Gate
+    :param input_2: variable representing the second input of the Majority-Gate
+    :param input_3: variable representing the third input of the Majority-Gate
+    :param output: variable representing the output of the Majority-Gate
+    :return: A list of clauses encoding the Majority-Gate
+    """
+    return [
+        (-input_1, -input_2, output),
+        (-input_1, -input_3, output),
+        (-input_2, -input_3, output),
+        (input_1, input_2, -output),
+        (input_1, input_3, -output),
+        (input_2, input_3, -output)
+    ]
+
+
+def ite_equality(condition: Variable, input_1: Variable, input_0: Variable, output: Variable) -> List[Clause]:
+    """
+    Encode an If-Then-Else-Gate (multiplexer) into a CNF. The last two
+    clauses are redundant but allow to propagate the output if both inputs
+    are equal regardless of the condition.
+
+    :param condition: variable representing the condition of the ITE-Gate
+    :param input_1: variable representing the input chosen if the condition is true
+    :param input_0: variable representing the input chosen if the condition is false
+    :param output: variable representing the output of the ITE-Gate
+    :return: A list of clauses encoding the ITE-Gate
+    """
+    return [
+        (-condition, -input_1, output),
+        (-condition, input_1, -output),
+        (condition, -input_0, output),
+        (condition, input_0, -output),
+        (-input_1, -input_0, output),
+        (input_1, input_0, -output)
+    ]
+
+
+def full_adder_redundant(
+        input_1: Variable,
+        input_2: Variable,
+        input_3: Variable,
+        output_sum: Variable,
+        output_carry: Variable
+) -> List[Clause]:
+    """
+    Create the redundant clauses connecting the sum and carry of a full
+    adder (see xor3_equality and majority_equality). If both outputs are
+    true (false), all inputs have to be true (false). Thus, unit propagation
+    can deduce the inputs from the outputs (arc consistency).
+
+    :param input_1: variable representing the first input of the full adder
+    :param input_2: variable representing the second input of the full adder
+    :param input_3: variable representing the third input of the full adder
+    :param output_sum: variable representing the sum of the full adder
+    :param output_carry: variable representing the carry of the full adder
+    :return: A list of redundant clauses
     """
-    return {
-        frozenset([input_1, input_2, output]),
-        frozenset([input_1, -input_2, -output]),
-        frozenset([-input_1, input_2, -output]),
-        frozenset([-input_1, -input_2, output])
-    }
+    return [
+        (-output_sum, -output_carry, input_1),
+        (-output_sum, -output_carry, input_2),
+        (-output_sum, -output_carry, input_3),
+        (output_sum, output_carry, -input_1),
+        (output_sum, output_carry, -input_2),
+        (output_sum, output_carry, -input_3)
+    ]
 
 
 def clause(literals: List[Variable]) -> Clause:
@@ -77,7 +238,7 @@ def clause(literals: List[Variable]) -> Clause:
     :param literals: the literals that should be used to create the clause
     :return: the clause consisting of the specified literals
     """
-    return frozenset(literals)
+    return tuple(literals)
 
 
 def unit_clause(literal: Variable) -> Clause:
@@ -87,7 +248,7 @@ def unit_clause(literal: Variable) -> Clause:
     :param literal: the literal that should be used to create the unit clause
     :return: the resulting unit clause
     """
-    return frozenset([literal])
+    return (literal,)
 
 
 def empty_clause() -> Clause:
@@ -96,4 +257,4 @@ def empty_clause() -> Clause:
 
     :return: an empty clause
     """
-    return frozenset([])
+    return ()
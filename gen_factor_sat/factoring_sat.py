@@ -1,18 +1,49 @@
 from __future__ import annotations
 
 import math
+import os
 import random
 import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, cast
-
-from gen_factor_sat import utils
-from gen_factor_sat.circuit.instances import FactoringAndGateStrategy, TseitinFactoringStrategy
+from typing import Callable, Dict, List, Optional, Tuple, TextIO, Union, cast
+
+from gen_factor_sat import utils, hints as factoring_hints
+from gen_factor_sat.circuit.instances import FactoringAndGateStrategy, TseitinFactoringStrategy, STRATEGIES, \
+    DEFAULT_STRATEGY, AUTO_STRATEGY
+from gen_factor_sat.circuit.default.factoring import GeneralFactoringStrategy
+from gen_factor_sat.circuit.interface.circuit import NBitCircuitStrategy
+from gen_factor_sat.formula import preprocessing
+from gen_factor_sat.formula.aig import Aig
 from gen_factor_sat.formula.cnf import CNF, CNFBuilder
-from gen_factor_sat.formula.symbol import Symbol, Variable
-from gen_factor_sat.number_generator import Number, GeneratorConfig
+from gen_factor_sat.formula.symbol import Symbol, Variable, constant
+from gen_factor_sat.number_generator import Number, GeneratorConfig, Semiprime
+
+SymbolWriter = Union[CNFBuilder, Aig]
+SymFacStrategy = FactoringAndGateStrategy[Symbol, SymbolWriter]
+StrategyOption = Union[SymFacStrategy, str]
+
+MULTIPLIER_CACHE_SIZE = 8
+"""The number of multiplier circuits that are kept (see FactoringSat.clear_multiplier_cache)."""
+
+MAX_CACHED_MULTIPLIER = 2 ** 20
+"""The size of the largest multiplier circuit (in nodes or variables) that is cached."""
+
+PORTFOLIO_METRICS: Dict[str, Callable[[CNF], int]] = {
+    'clauses': lambda cnf: len(cnf.clauses),
+    'variables': lambda cnf: cnf.number_of_variables,
+    'literals': lambda cnf: len(cnf.clauses.literals)
+}
+"""The metrics by which the strategy is selected if all strategies are tried (see AUTO_STRATEGY)."""
+
+EncodingTask = Tuple[int, str, bool, bool, Tuple[str, ...], Optional[str], Optional[str]]
+"""The number, the name of the strategy and the remaining options passed to FactoringSat.factorize_number."""
+
+UNKNOWN_BIT = 'x'
+"""The character marking an unknown bit in a pattern of known bits (see parse_known_bits)."""
 
-SymFacStrategy = FactoringAndGateStrategy[Symbol, CNFBuilder]
+_multiplier_cache: OrderedDict = OrderedDict()
 
 
 @dataclass
@@ -21,19 +52,42 @@ class FactoringSat:
     This data class provides all relevant information about the transformation of
     the factoring problem into SAT. Besides the resulting CNF, this includes the
     variables encoding the factors and all necessary configurations to reproduce
-    the results.
+    the results. The strategy is the name under which the used strategy is
+    registered (see circuit.instances.STRATEGIES) or None if it is unknown.
+    If the strategy was selected from all registered strategies, portfolio is
+    the metric by which it was selected (see PORTFOLIO_METRICS). If the CNF
+    was preprocessed, the factors refer to the renumbered variables. With
+    symmetry breaking, only assignments with factor_1 <= factor_2 satisfy
+    the CNF. The hints are the redundant constraints that were added to the
+    CNF (see hints.HINTS). The known bits are the patterns the factors were
+    restricted to (see parse_known_bits).
     """
-    VERSION = '0.3'
+    VERSION = '0.6'
     number: Number
     factor_1: List[Variable]
     factor_2: List[Variable]
     cnf: CNF
     generator: Optional[GeneratorConfig] = None
+    strategy: Optional[str] = None
+    preprocessed: bool = False
+    portfolio: Optional[str] = None
+    symmetry_breaking: bool = False
+    hints: Tuple[str, ...] = ()
+    known_bits_1: Optional[str] = None
+    known_bits_2: Optional[str] = None
 
     @staticmethod
     def __default_strategy() -> SymFacStrategy:
         return TseitinFactoringStrategy()
 
+    @staticmethod
+    def __strategy_name(strategy: SymFacStrategy) -> Optional[str]:
+        for name, strategy_type in STRATEGIES.items():
+            if type(strategy) is strategy_type:
+                return name
+
+        return None
+
     @staticmethod
     def factorize_random_number(
             max_value: int,
@@ -42,7 +96,14 @@ class FactoringSat:
             prime: Optional[bool] = None,
             error: float = 0.0,
             max_tries: int = 1000,
-            strategy: Optional[SymFacStrategy] = None
+            strategy: Optional[StrategyOption] = None,
+            preprocess: bool = False,
+            semiprime: bool = False,
+            balance: float = 1.0,
+            metric: str = 'clauses',
+            jobs: Optional[int] = None,
+            symmetry_breaking: bool = False,
+            hints: Tuple[str, ...] = ()
     ) -> FactoringSat:
         """
         Encode the factoring of a pseudo-randomly generated number into a CNF.
@@ -53,7 +114,23 @@ class FactoringSat:
         number should be a prime or composite number. If a small error rate
         is allowed, a probabilistic prime test is used. Stops if no number with
         the correct type can be found within the given number of tries.
-        See the number generator module for more details.
+        Alternatively, the number can be constructed as product of two primes
+        whose bit-lengths have the specified balance (see Semiprime). In this
+        case, the prime flag and the error are ignored and the factors are
+        stored in the number. See the number generator module for more details.
+
+        The strategy can also be specified by its registered name. If it is
+        AUTO_STRATEGY, the number is encoded with every registered strategy
+        using the specified number of processes and the CNF which is the
+        smallest according to the metric is kept (see PORTFOLIO_METRICS).
+
+        If symmetry breaking is enabled, the first factor has to be less than
+        or equal to the second one. No factorization is lost since the smaller
+        factor always fits into the first factor.
+
+        The hints are redundant constraints that every factorization satisfies,
+        e.g. parity or low:8 (see hints.HINTS). They do not change the set of
+        solutions but may allow the solver to prune the search space early.
 
         :param max_value: the largest possible value the generated number can have
         :param min_value: the smallest possible value the generated number can have
@@ -61,21 +138,37 @@ class FactoringSat:
         :param prime: whether the number should be a prime number
         :param error: the permitted error probability
         :param max_tries: the number of tries to generate a number
-        :param strategy: the strategy to be used
+        :param strategy: the strategy to be used (or its name)
+        :param preprocess: whether the CNF should be simplified (see formula.preprocessing)
+        :param semiprime: whether the number should be the product of two primes
+        :param balance: the ratio between the bit-lengths of the prime factors
+        :param metric: the metric to be minimized if all strategies are tried
+        :param jobs: the number of processes used if all strategies are tried (default: number of CPUs)
+        :param symmetry_breaking: whether the factors should be ordered
+        :param hints: the names of the redundant constraints to be added
         :return: the encoded factoring instance (see FactoringSat)
         """
         if seed is None:
             seed = random.randrange(sys.maxsize)
 
         generator_config = GeneratorConfig.create(min_value, max_value, seed)
-        number = Number.generate(
-            generator_config=generator_config,
-            prime=prime,
-            error=error,
-            max_tries=max_tries
-        )
+        if semiprime:
+            number = Number.generate_semiprime(
+                generator_config=generator_config,
+                balance=balance,
+                max_tries=max_tries
+            )
+        else:
+            number = Number.generate(
+                generator_config=generator_config,
+                prime=prime,
+                error=error,
+                max_tries=max_tries
+            )
 
-        factor_sat = FactoringSat.__factorize_number(number, strategy)
+        factor_sat = FactoringSat.__factorize_number(
+            number, strategy, preprocess, metric, jobs, symmetry_breaking, hints
+        )
         factor_sat.generator = generator_config
 
         return factor_sat
@@ -83,48 +176,270 @@ class FactoringSat:
     @staticmethod
     def factorize_number(
             number: int,
-            strategy: Optional[SymFacStrategy] = None
+            strategy: Optional[StrategyOption] = None,
+            preprocess: bool = False,
+            metric: str = 'clauses',
+            jobs: Optional[int] = None,
+            symmetry_breaking: bool = False,
+            hints: Tuple[str, ...] = (),
+            known_bits_1: Optional[str] = None,
+            known_bits_2: Optional[str] = None
     ) -> FactoringSat:
         """
         Encode the factoring of the specified number into a CNF.
         The encoding is deterministic. Therefore, calling this method with the
         same number produces the same result.
 
+        The strategy can also be specified by its registered name. If it is
+        AUTO_STRATEGY, the number is encoded with every registered strategy
+        using the specified number of processes and the CNF which is the
+        smallest according to the metric is kept (see PORTFOLIO_METRICS).
+
+        If symmetry breaking is enabled, the first factor has to be less than
+        or equal to the second one. No factorization is lost since the smaller
+        factor always fits into the first factor.
+
+        The hints are redundant constraints that every factorization satisfies,
+        e.g. parity or low:8 (see hints.HINTS). They do not change the set of
+        solutions but may allow the solver to prune the search space early.
+
+        Some bits of the factors may be known in advance, e.g. to model a partial
+        key exposure. These bits are substituted by constants before the
+        multiplication circuit is built such that the gates depending on them
+        are folded during the encoding (see parse_known_bits). The variables
+        of the known bits are still assigned by unit clauses. Since the known
+        bits refer to a particular factor, they cannot be combined with symmetry
+        breaking.
+
         :param number: the number to be factorized
-        :param strategy: the strategy to be used
+        :param strategy: the strategy to be used (or its name)
+        :param preprocess: whether the CNF should be simplified (see formula.preprocessing)
+        :param metric: the metric to be minimized if all strategies are tried
+        :param jobs: the number of processes used if all strategies are tried (default: number of CPUs)
+        :param symmetry_breaking: whether the factors should be ordered
+        :param hints: the names of the redundant constraints to be added
+        :param known_bits_1: the pattern of known bits of the first factor
+        :param known_bits_2: the pattern of known bits of the second factor
         :return: the encoded factoring instance (see FactoringSat)
         """
-        return FactoringSat.__factorize_number(Number.unchecked(number), strategy)
+        return FactoringSat.__factorize_number(
+            Number.unchecked(number), strategy, preprocess, metric, jobs, symmetry_breaking, hints,
+            known_bits_1, known_bits_2
+        )
 
     @staticmethod
-    def __factorize_number(number: Number, strategy: Optional[SymFacStrategy] = None) -> FactoringSat:
+    def __factorize_number(
+            number: Number,
+            strategy: Optional[StrategyOption] = None,
+            preprocess: bool = False,
+            metric: str = 'clauses',
+            jobs: Optional[int] = None,
+            symmetry_breaking: bool = False,
+            hints: Tuple[str, ...] = (),
+            known_bits_1: Optional[str] = None,
+            known_bits_2: Optional[str] = None
+    ) -> FactoringSat:
+        if symmetry_breaking and (known_bits_1 or known_bits_2):
+            # The ordering may exclude the only factorization in which the known bits belong to the given factor
+            raise ValueError('Symmetry breaking cannot be combined with known bits')
+
         if strategy is None:
             strategy = FactoringSat.__default_strategy()
+        elif strategy == AUTO_STRATEGY:
+            return FactoringSat.__portfolio(
+                number, preprocess, metric, jobs, symmetry_breaking, hints, known_bits_1, known_bits_2
+            )
+        elif isinstance(strategy, str):
+            strategy = STRATEGIES[strategy]()
+
+        if symmetry_breaking and not isinstance(strategy, NBitCircuitStrategy):
+            raise ValueError('Symmetry breaking requires a strategy supporting the comparison of numbers')
 
-        cnf_builder = CNFBuilder()
+        if hints and not isinstance(strategy, GeneralFactoringStrategy):
+            raise ValueError('Hints require a strategy supporting the truncated multiplication')
 
         bin_number = utils.to_bin_list(number.value)
         factor_length_1, factor_length_2 = FactoringSat.__factor_lengths(len(bin_number))
+        pattern_1 = FactoringSat.__align_known_bits(known_bits_1, factor_length_1)
+        pattern_2 = FactoringSat.__align_known_bits(known_bits_2, factor_length_2)
 
-        factor_1 = cnf_builder.next_variables(factor_length_1)
-        factor_2 = cnf_builder.next_variables(factor_length_2)
-
-        fact_result = strategy.is_factorization(
-            cast(List[Symbol], factor_1),
-            cast(List[Symbol], factor_2),
-            cast(List[Symbol], bin_number),
-            cnf_builder
-        )
-
-        strategy.expect_one(fact_result, cnf_builder)
+        if isinstance(strategy, GeneralFactoringStrategy) and not (known_bits_1 or known_bits_2):
+            writer, factor_1, factor_2, product = FactoringSat.__multiplier(
+                strategy, factor_length_1, factor_length_2, len(bin_number)
+            )
+            circuit_factor_1, circuit_factor_2 = cast(List[Symbol], factor_1), cast(List[Symbol], factor_2)
+        else:
+            writer = strategy.create_writer()
+
+            # The factors are allocated first such that their variables are preserved
+            factor_1 = writer.next_variables(factor_length_1)
+            factor_2 = writer.next_variables(factor_length_2)
+
+            # The circuit depends on the known bits, hence the multiplier cannot be cached
+            circuit_factor_1 = FactoringSat.__substitute_known_bits(factor_1, pattern_1)
+            circuit_factor_2 = FactoringSat.__substitute_known_bits(factor_2, pattern_2)
+
+            if isinstance(strategy, GeneralFactoringStrategy):
+                product = strategy.bounded_multiply(circuit_factor_1, circuit_factor_2, len(bin_number), writer)
+            else:
+                product = None
+                fact_result = strategy.is_factorization(
+                    circuit_factor_1,
+                    circuit_factor_2,
+                    cast(List[Symbol], bin_number),
+                    writer
+                )
+                strategy.expect_one(fact_result, writer)
+
+        if product is not None:
+            # Every bit of the product is asserted by a unit instead of comparing the whole product
+            strategy.expect_product(product, cast(List[Symbol], bin_number), writer)
+
+        # The variables of the known bits are not used by the circuit but still encode the factors
+        for factor, value in zip(factor_1 + factor_2, pattern_1 + pattern_2):
+            if value == '1':
+                strategy.expect_one(factor, writer)
+            elif value == '0':
+                strategy.expect_zero(factor, writer)
+
+        if symmetry_breaking:
+            # Every factorization p * q with p <= q still fits into the factors
+            ordered = strategy.less_equal(circuit_factor_1, circuit_factor_2, writer)
+            strategy.expect_one(ordered, writer)
+
+        if hints:
+            factoring_hints.add_hints(strategy, hints, circuit_factor_1, circuit_factor_2, number.value, writer)
+
+        cnf = writer.build()
+
+        if preprocess:
+            # The factors are frozen such that they can still be read from a model
+            cnf, renumbering = preprocessing.preprocess(cnf, frozen=factor_1 + factor_2)
+            factor_1 = [renumbering[factor] for factor in factor_1]
+            factor_2 = [renumbering[factor] for factor in factor_2]
 
         return FactoringSat(
             number=number,
             factor_1=factor_1,
             factor_2=factor_2,
-            cnf=cnf_builder.build()
+            cnf=cnf,
+            strategy=FactoringSat.__strategy_name(strategy),
+            preprocessed=preprocess,
+            symmetry_breaking=symmetry_breaking,
+            hints=tuple(hints),
+            known_bits_1=known_bits_1,
+            known_bits_2=known_bits_2
         )
 
+    @staticmethod
+    def __portfolio(
+            number: Number,
+            preprocess: bool,
+            metric: str,
+            jobs: Optional[int],
+            symmetry_breaking: bool,
+            hints: Tuple[str, ...],
+            known_bits_1: Optional[str],
+            known_bits_2: Optional[str]
+    ) -> FactoringSat:
+        if metric not in PORTFOLIO_METRICS:
+            raise ValueError('Unknown metric {0}, expected one of: {1}'.format(metric, ', '.join(PORTFOLIO_METRICS)))
+
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+
+        measure = PORTFOLIO_METRICS[metric]
+        tasks = [
+            (number.value, name, preprocess, symmetry_breaking, tuple(hints), known_bits_1, known_bits_2)
+            for name in STRATEGIES
+        ]
+
+        # Ties are resolved by the order of the registered strategies
+        if jobs == 1:
+            factor_sat = min(map(_encode_with_strategy, tasks), key=lambda result: measure(result.cnf))
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+                results = executor.map(_encode_with_strategy, tasks)
+                factor_sat = min(results, key=lambda result: measure(result.cnf))
+
+        factor_sat.number = number
+        factor_sat.portfolio = metric
+
+        return factor_sat
+
+    @staticmethod
+    def __multiplier(
+            strategy: SymFacStrategy,
+            factor_length_1: int,
+            factor_length_2: int,
+            number_length: int
+    ) -> Tuple[SymbolWriter, List[Variable], List[Variable], List[Symbol]]:
+        # The multiplier only depends on the lengths and the strategy (including
+        # its configuration). Therefore, it is built once and a copy of the
+        # writer is used for every number.
+        configuration = tuple(sorted(vars(strategy).items()))
+        key = (factor_length_1, factor_length_2, number_length, type(strategy), configuration, FactoringSat.VERSION)
+
+        if key in _multiplier_cache:
+            _multiplier_cache.move_to_end(key)
+            writer, factor_1, factor_2, product = _multiplier_cache[key]
+        else:
+            writer = strategy.create_writer()
+
+            # The factors are allocated first such that their variables are preserved
+            factor_1 = writer.next_variables(factor_length_1)
+            factor_2 = writer.next_variables(factor_length_2)
+            product = strategy.bounded_multiply(
+                cast(List[Symbol], factor_1),
+                cast(List[Symbol], factor_2),
+                number_length,
+                writer
+            )
+
+            if FactoringSat.__multiplier_size(writer) > MAX_CACHED_MULTIPLIER:
+                # Large circuits are rarely reused and would be kept twice in memory
+                return writer, factor_1, factor_2, product
+
+            _multiplier_cache[key] = (writer, factor_1, factor_2, product)
+            if len(_multiplier_cache) > MULTIPLIER_CACHE_SIZE:
+                _multiplier_cache.popitem(last=False)
+
+        return writer.copy(), list(factor_1), list(factor_2), product
+
+    @staticmethod
+    def __multiplier_size(writer: SymbolWriter) -> int:
+        if isinstance(writer, Aig):
+            return writer.number_of_nodes
+        else:
+            return writer.number_of_variables
+
+    @staticmethod
+    def clear_multiplier_cache() -> None:
+        """
+        Remove all cached multiplier circuits. The multiplier circuits of the
+        last MULTIPLIER_CACHE_SIZE factor lengths and strategies are cached
+        such that encoding numbers of the same length only requires the
+        comparison with the number.
+
+        :return: None
+        """
+        _multiplier_cache.clear()
+
+    @staticmethod
+    def __align_known_bits(known_bits: Optional[str], factor_length: int) -> str:
+        pattern = parse_known_bits(known_bits) if known_bits else ''
+        if len(pattern) > factor_length:
+            raise ValueError('The pattern {0} is longer than the factor ({1} bits)'.format(pattern, factor_length))
+
+        return UNKNOWN_BIT * (factor_length - len(pattern)) + pattern
+
+    @staticmethod
+    def __substitute_known_bits(factor: List[Variable], pattern: str) -> List[Symbol]:
+        return [
+            cast(Symbol, symbol) if value == UNKNOWN_BIT else constant(value)
+            for symbol, value in zip(factor, pattern)
+        ]
+
     @staticmethod
     def __factor_lengths(number_length: int) -> Tuple[int, int]:
         factor_length_1 = math.ceil(number_length / 2)
@@ -132,6 +447,35 @@ class FactoringSat:
 
         return factor_length_1, factor_length_2
 
+    def default_filename(self) -> str:
+        """
+        Create a filename describing this factoring instance. Generated numbers
+        are described by the configuration of the generator and the type of
+        the number, other numbers by their value.
+
+        :return: the filename (including the extension)
+        """
+        if self.generator:
+            number_type = self.number.fold_type(
+                v_det_prime='prime',
+                v_prob_prime='prob-prime',
+                v_det_comp='composite',
+                v_prob_comp='composite',
+                v_unknown='random'
+            )
+
+            if isinstance(self.number, Semiprime):
+                number_type = 'semiprime'
+
+            return 'factor_seed{0}_minn{1}_maxn{2}_{3}.cnf'.format(
+                self.generator.seed,
+                self.generator.min_value,
+                self.generator.max_value,
+                number_type
+            )
+        else:
+            return 'factor_number{0}.cnf'.format(self.number.value)
+
     def to_dimacs(self) -> str:
         """
         Encode this factoring instance into DIMACS. The comments includes
@@ -140,6 +484,26 @@ class FactoringSat:
 
         :return: the resulting DIMACS
         """
+        return self.cnf.to_dimacs(comments=self.dimacs_comments())
+
+    def write_dimacs(self, file: TextIO) -> None:
+        """
+        Write this factoring instance in the DIMACS format to the specified
+        file. The clauses are written in chunks such that the whole DIMACS
+        representation is never kept in memory (see to_dimacs).
+
+        :param file: the file the DIMACS representation is written to
+        :return: None
+        """
+        self.cnf.write_dimacs(file, comments=self.dimacs_comments())
+
+    def dimacs_comments(self) -> List[str]:
+        """
+        Describe this factoring instance. The comments include instructions to
+        reproduce these results and the variables encoding the factors.
+
+        :return: the comment lines (without line breaks)
+        """
         comments = []
         comments.append('GenFactorSat v{0}'.format(FactoringSat.VERSION))
 
@@ -158,6 +522,32 @@ class FactoringSat:
             if number_type:
                 comments.append(number_type)
 
+        if isinstance(self.number, Semiprime):
+            factors = 'The number is the product of the primes: {0} * {1}'.format(
+                self.number.factor_1,
+                self.number.factor_2
+            )
+            comments.append(factors)
+
+        if self.strategy:
+            comments.append('The CNF was encoded using the strategy: ' + self.strategy)
+
+        if self.symmetry_breaking:
+            comments.append('The factors are ordered such that factor 1 <= factor 2.')
+
+        if self.hints:
+            comments.append('The CNF contains the redundant constraints: ' + ', '.join(self.hints))
+
+        if self.known_bits_1:
+            comments.append('The known bits of factor 1 are: ' + self.known_bits_1)
+
+        if self.known_bits_2:
+            comments.append('The known bits of factor 2 are: ' + self.known_bits_2)
+
+        if self.portfolio:
+            portfolio = 'The strategy was selected from all registered strategies by the fewest {0}.'
+            comments.append(portfolio.format(self.portfolio))
+
         reproduce = self.reproduce_command()
         comments.append('To reproduce this results call: ' + reproduce)
         comments.append('')
@@ -168,7 +558,7 @@ class FactoringSat:
         encoding = 'All numbers are encoded with [msb, ..., lsb]'
         comments.extend([number, factor_1, factor_2, encoding])
 
-        return self.cnf.to_dimacs(comments=comments)
+        return comments
 
     def reproduce_command(self) -> str:
         """
@@ -176,6 +566,19 @@ class FactoringSat:
 
         :return: the command
         """
+        if (self.strategy is None) or (self.strategy == DEFAULT_STRATEGY):
+            strategy_opt = None
+        else:
+            strategy_opt = '--strategy {0}'.format(self.strategy)
+
+        preprocess_opt = '--preprocess' if self.preprocessed else None
+        symmetry_opt = '--symmetry-breaking' if self.symmetry_breaking else None
+        hints_opt = '--hints {0}'.format(','.join(self.hints)) if self.hints else None
+        known_bits_opt = ' '.join(filter(bool, [
+            '--known-bits-1 {0}'.format(self.known_bits_1) if self.known_bits_1 else None,
+            '--known-bits-2 {0}'.format(self.known_bits_2) if self.known_bits_2 else None
+        ]))
+
         if self.generator:
             command = 'gen_factor_sat random'
             seed_opt = '--seed {0}'.format(self.generator.seed)
@@ -189,6 +592,43 @@ class FactoringSat:
                 v_unknown=None
             )
 
-            return ' '.join(filter(bool, [command, number_type_opt, seed_opt, min_value_opt, max_value_arg]))
+            if isinstance(self.number, Semiprime):
+                number_type_opt = '--semiprime --balance {0}'.format(self.number.balance)
+
+            return ' '.join(filter(bool, [
+                command, number_type_opt, seed_opt, min_value_opt, strategy_opt, preprocess_opt, symmetry_opt,
+                hints_opt, max_value_arg
+            ]))
         else:
-            return 'gen_factor_sat number {0}'.format(self.number)
+            command = 'gen_factor_sat number'
+            value_arg = str(self.number.value)
+
+            return ' '.join(filter(bool, [
+                command, strategy_opt, preprocess_opt, symmetry_opt, hints_opt, known_bits_opt, value_arg
+            ]))
+
+
+def parse_known_bits(known_bits: str) -> str:
+    """
+    Validate a pattern of known bits, e.g. x1x0x1. The pattern is ordered
+    from the msb to the lsb and consists of the characters 0, 1 and
+    UNKNOWN_BIT. Shorter patterns are aligned at the lsb of the factor, i.e.
+    the missing upper bits are unknown.
+
+    :param known_bits: the pattern of known bits
+    :return: the validated pattern
+    :raises ValueError if the pattern is empty or contains other characters
+    """
+    if not known_bits or any(value not in ('0', '1', UNKNOWN_BIT) for value in known_bits):
+        raise ValueError('Expected a pattern of 0, 1 and {0} but got: {1}'.format(UNKNOWN_BIT, known_bits))
+
+    return known_bits
+
+
+def _encode_with_strategy(task: EncodingTask) -> FactoringSat:
+    # Encodes a number with a registered strategy, used by the process pool (see FactoringSat.__portfolio)
+    number, strategy, preprocess, symmetry_breaking, hints, known_bits_1, known_bits_2 = task
+    return FactoringSat.factorize_number(
+        number, STRATEGIES[strategy](), preprocess, symmetry_breaking=symmetry_breaking, hints=hints,
+        known_bits_1=known_bits_1, known_bits_2=known_bits_2
+    )
@@ -0,0 +1,250 @@
+"""
+And-Inverter Graph
+
+Representation of a circuit consisting only of AND-Gates and inverted edges.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import List, Dict
+
+import gen_factor_sat.circuit.tseitin.encoding as te
+from gen_factor_sat.formula.cnf import CNF, ClauseStore
+from gen_factor_sat.formula.symbol import Variable, variable
+
+
+class Aig:
+    """
+    Helper class to construct an And-Inverter Graph (AIG) and to lower it into
+    a CNF formula. The nodes are stored in a table of two flat arrays holding
+    the inputs (fanins) of each node, i.e. the node with id i is described by
+    fanins_1[i - 1] and fanins_2[i - 1]. Primary inputs have no fanins and are
+    marked with 0.
+
+    Edges are represented by literals: the id of the node or the negated id if
+    the edge is complemented. As node ids start at 1, literals can be used
+    interchangeably with variables. Structurally equal AND-Gates are only
+    created once.
+
+    If the graph is polarity aware, the lowering only encodes the directions
+    of each gate that are required by the polarity in which the gate is used
+    (Plaisted-Greenbaum encoding). The resulting formula is equisatisfiable
+    and every model still satisfies the circuit with respect to the inputs.
+    """
+
+    def __init__(self, polarity_aware: bool = False):
+        self.polarity_aware = polarity_aware
+        self.fanins_1 = array('i')
+        self.fanins_2 = array('i')
+        self.gates: Dict[int, Variable] = {}
+        self.assertions = array('i')
+        self.contradiction = False
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.fanins_1)
+
+    def next_variables(self, amount: int) -> List[Variable]:
+        """
+        Allocate the specified amount of primary inputs.
+
+        :param amount: the amount of inputs to be allocated
+        :return: the list of the literals representing the inputs
+        """
+        return [self.next_variable() for _ in range(amount)]
+
+    def next_variable(self) -> Variable:
+        """
+        Allocate the next primary input.
+
+        :return: the literal representing the input
+        """
+        self.fanins_1.append(0)
+        self.fanins_2.append(0)
+        return variable(self.number_of_nodes)
+
+    def and_gate(self, literal_1: Variable, literal_2: Variable) -> Variable:
+        """
+        Add an AND-Gate with the specified inputs. If a gate with the same
+        inputs already exists, the existing gate is returned instead. Constants
+        and trivial gates (e.g. x AND -x) have to be handled by the caller.
+
+        :param literal_1: the first input of the AND-Gate
+        :param literal_2: the second input of the AND-Gate
+        :return: the literal representing the output of the AND-Gate
+        """
+        if literal_1 > literal_2:
+            literal_1, literal_2 = literal_2, literal_1
+
+        key = (_unsigned(literal_1) << 32) | _unsigned(literal_2)
+        output = self.gates.get(key)
+
+        if output is None:
+            self.fanins_1.append(literal_1)
+            self.fanins_2.append(literal_2)
+            output = variable(self.number_of_nodes)
+            self.gates[key] = output
+
+        return output
+
+    def add_assertion(self, literal: Variable) -> None:
+        """
+        Require the specified literal to be true.
+
+        :param literal: the literal that has to be true
+        :return: None
+        """
+        self.assertions.append(literal)
+
+    def add_contradiction(self) -> None:
+        """
+        Make the resulting formula unsatisfiable.
+
+        :return: None
+        """
+        self.contradiction = True
+
+    def is_input(self, node: int) -> bool:
+        """
+        Check whether the node is a primary input.
+
+        :param node: the id of the node
+        :return: true if the node has no fanins, otherwise false
+        """
+        return self.fanins_1[node - 1] == 0
+
+    def copy(self) -> Aig:
+        """
+        Create an independent copy of this AIG.
+
+        :return: the copied AIG
+        """
+        result = Aig(self.polarity_aware)
+        result.fanins_1 = array('i', self.fanins_1)
+        result.fanins_2 = array('i', self.fanins_2)
+        result.gates = self.gates.copy()
+        result.assertions = array('i', self.assertions)
+        result.contradiction = self.contradiction
+        return result
+
+    def build(self) -> CNF:
+        """
+        Lower this AIG into a CNF formula using the Tseitin transformation.
+        Only the gates in the cone of influence of the assertions are encoded.
+        XOR-Gates, i.e. -(a AND b) AND -(-a AND -b) where the inner gates have
+        no other fanout, are encoded directly. The variables are numbered
+        densely in the order the nodes were created. Primary inputs are never
+        removed. Consequently, inputs allocated before the first gate keep
+        their variable.
+
+        :return: the CNF formula
+        """
+        fanins_1 = self.fanins_1
+        fanins_2 = self.fanins_2
+        number_of_nodes = self.number_of_nodes
+
+        fanouts = array('i', bytes(4 * (number_of_nodes + 1)))
+        for node in range(1, number_of_nodes + 1):
+            if fanins_1[node - 1] != 0:
+                fanouts[abs(fanins_1[node - 1])] += 1
+                fanouts[abs(fanins_2[node - 1])] += 1
+
+        # The fanins of a node always have smaller ids. Hence, a single sweep
+        # in reverse order determines the cone of influence and the polarities.
+        # A node is unused if its polarity is 0.
+        polarities = bytearray(number_of_nodes + 1)
+        xors = bytearray(number_of_nodes + 1)
+        for literal in self.assertions:
+            polarities[abs(literal)] |= self.__polarity(_POSITIVE, literal)
+
+        for node in range(number_of_nodes, 0, -1):
+            polarity = polarities[node]
+            if polarity and fanins_1[node - 1] != 0:
+                if self.__is_xor(node, fanouts):
+                    xors[node] = 1
+                    inner = -fanins_1[node - 1]
+                    polarities[abs(fanins_1[inner - 1])] |= _BOTH
+                    polarities[abs(fanins_2[inner - 1])] |= _BOTH
+                else:
+                    polarities[abs(fanins_1[node - 1])] |= self.__polarity(polarity, fanins_1[node - 1])
+                    polarities[abs(fanins_2[node - 1])] |= self.__polarity(polarity, fanins_2[node - 1])
+
+        renumbering = array('i', bytes(4 * (number_of_nodes + 1)))
+        number_of_variables = 0
+        for node in range(1, number_of_nodes + 1):
+            if polarities[node] or fanins_1[node - 1] == 0:
+                number_of_variables += 1
+                renumbering[node] = number_of_variables
+
+        def rename(literal: int) -> Variable:
+            return variable(renumbering[literal] if literal > 0 else -renumbering[-literal])
+
+        clauses = ClauseStore()
+        for node in range(1, number_of_nodes + 1):
+            polarity = polarities[node]
+            if polarity and fanins_1[node - 1] != 0:
+                if xors[node]:
+                    inner = -fanins_1[node - 1]
+                    input_1 = rename(fanins_1[inner - 1])
+                    input_2 = rename(fanins_2[inner - 1])
+                    encodings = _XOR_ENCODINGS[polarity]
+                else:
+                    input_1 = rename(fanins_1[node - 1])
+                    input_2 = rename(fanins_2[node - 1])
+                    encodings = _AND_ENCODINGS[polarity]
+
+                clauses.extend(encodings(input_1, input_2, rename(node)))
+
+        for literal in dict.fromkeys(self.assertions):
+            clauses.add(te.unit_clause(rename(literal)))
+
+        if self.contradiction:
+            clauses.add(te.empty_clause())
+
+        return CNF(number_of_variables, clauses)
+
+    def __polarity(self, polarity: int, literal: int) -> int:
+        # The polarity of an input is inverted by a complemented edge
+        if not self.polarity_aware:
+            return _BOTH
+        elif literal < 0 and polarity != _BOTH:
+            return polarity ^ _BOTH
+        else:
+            return polarity
+
+    def __is_xor(self, node: int, fanouts: array) -> bool:
+        # node == -(a AND b) AND -(-a AND -b) == a XOR b
+        literal_1 = self.fanins_1[node - 1]
+        literal_2 = self.fanins_2[node - 1]
+
+        if literal_1 >= 0 or literal_2 >= 0 or fanouts[-literal_1] != 1 or fanouts[-literal_2] != 1:
+            return False
+
+        inner_1 = -literal_1
+        inner_2 = -literal_2
+        if self.is_input(inner_1) or self.is_input(inner_2):
+            return False
+
+        return self.fanins_1[inner_2 - 1] == -self.fanins_2[inner_1 - 1] \
+            and self.fanins_2[inner_2 - 1] == -self.fanins_1[inner_1 - 1]
+
+
+_POSITIVE = 1
+_NEGATIVE = 2
+_BOTH = _POSITIVE | _NEGATIVE
+
+_AND_ENCODINGS = {
+    _POSITIVE: te.and_positive,
+    _NEGATIVE: te.and_negative,
+    _BOTH: te.and_equality
+}
+
+_XOR_ENCODINGS = {
+    _POSITIVE: te.xor_positive,
+    _NEGATIVE: te.xor_negative,
+    _BOTH: te.xor_equality
+}
+
+
+def _unsigned(literal: int) -> int:
+    return 2 * literal if literal > 0 else -2 * literal + 1
@@ -5,19 +5,181 @@ Representations of a CNF.
 """
 from __future__ import annotations
 
+import io
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Set, FrozenSet
+from typing import List, Set, Tuple, Iterable, Iterator, TextIO
 
 from gen_factor_sat.formula.symbol import Variable, variable
 
-Clause = FrozenSet[int]
+Clause = Tuple[int, ...]
+
+EXACT_DEDUPLICATION_LIMIT = 2 ** 23
+"""The number of clauses up to which all clauses are compared at once (see ClauseStore.deduplicate)."""
+
+
+class ClauseStore:
+    """
+    Compact storage for clauses. Instead of keeping a Python object per clause,
+    all literals are stored consecutively in a flat array. A second array holds
+    the offsets at which each clause starts, i.e. the literals of the i-th
+    clause are literals[offsets[i]:offsets[i + 1]].
+
+    Clauses are normalized when they are added: duplicate literals are removed,
+    the literals are ordered by their variable, and tautologies are discarded.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]] = ()):
+        self.literals = array('i')
+        self.offsets = array('q', [0])
+        self.extend(clauses)
+
+    def add(self, clause: Iterable[int]) -> None:
+        """
+        Add the clause unless it is a tautology.
+
+        :param clause: the literals of the clause to be added
+        :return: None
+        """
+        literals = sorted(clause, key=abs)
+
+        previous = 0
+        for literal in literals:
+            if literal == previous or literal == -previous:
+                # Rare case: remove duplicate literals and check for x and -x
+                literals = sorted(set(literals), key=abs)
+                if len(set(map(abs, literals))) != len(literals):
+                    return
+                break
+            previous = literal
+
+        self.literals.extend(literals)
+        self.offsets.append(len(self.literals))
+
+    def extend(self, clauses: Iterable[Iterable[int]]) -> None:
+        """
+        Add all the specified clauses (see add).
+
+        :param clauses: the clauses to be added
+        :return: None
+        """
+        add = self.add
+        for clause in clauses:
+            add(clause)
+
+    def deduplicate(self) -> ClauseStore:
+        """
+        Create a copy of this store in which every clause occurs only once.
+        The order of the remaining clauses is preserved. Stores with more than
+        EXACT_DEDUPLICATION_LIMIT clauses are first filtered by the hashes of
+        the clauses such that only the clauses with colliding hashes have to
+        be kept in memory (see find_duplicates).
+
+        :return: the store without duplicate clauses
+        """
+        if len(self) > EXACT_DEDUPLICATION_LIMIT:
+            duplicates = self.find_duplicates()
+            if not duplicates:
+                return self.copy()
+
+            result = ClauseStore()
+            for index, clause in enumerate(self):
+                if index not in duplicates:
+                    result.literals.extend(clause)
+                    result.offsets.append(len(result.literals))
+
+            return result
+
+        with memoryview(self.literals) as literals:
+            offsets = self.offsets
+            keys = [literals[start:end].tobytes() for start, end in zip(offsets, offsets[1:])]
+
+        unique_keys = dict.fromkeys(keys)
+        if len(unique_keys) == len(keys):
+            return self.copy()
+
+        result = ClauseStore()
+        result.literals.frombytes(b''.join(unique_keys))
+        for key in unique_keys:
+            result.offsets.append(result.offsets[-1] + len(key) // result.literals.itemsize)
+
+        return result
+
+    def find_duplicates(self) -> Set[int]:
+        """
+        Determine the indices of all clauses that are equal to a previous clause.
+        In a first pass, the hashes of the clauses are recorded in a bitmap.
+        In the second pass, only the clauses whose hash has been seen more than
+        once are compared.
+
+        :return: the indices of the duplicate clauses
+        """
+        size = 1 << max(16, (32 * len(self)).bit_length())
+        mask = size - 1
+        bitmap = bytearray(size >> 3)
+        collisions = set()
+
+        with memoryview(self.literals) as literals:
+            offsets = self.offsets
+            for start, end in zip(offsets, offsets[1:]):
+                position = hash(literals[start:end].tobytes()) & mask
+                if bitmap[position >> 3] & (1 << (position & 7)):
+                    collisions.add(position)
+                else:
+                    bitmap[position >> 3] |= 1 << (position & 7)
+
+            del bitmap
+
+            seen = set()
+            duplicates = set()
+            for index, (start, end) in enumerate(zip(offsets, offsets[1:])):
+                key = literals[start:end].tobytes()
+                if hash(key) & mask in collisions:
+                    if key in seen:
+                        duplicates.add(index)
+                    else:
+                        seen.add(key)
+
+        return duplicates
+
+    def copy(self) -> ClauseStore:
+        """
+        Create an independent copy of this store.
+
+        :return: the copied store
+        """
+        result = ClauseStore()
+        result.literals = array('i', self.literals)
+        result.offsets = array('q', self.offsets)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Clause:
+        return tuple(self.literals[self.offsets[index]:self.offsets[index + 1]])
+
+    def __iter__(self) -> Iterator[Clause]:
+        literals = self.literals
+        for start, end in zip(self.offsets, self.offsets[1:]):
+            yield tuple(literals[start:end])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ClauseStore):
+            return NotImplemented
+
+        return self.offsets == other.offsets and self.literals == other.literals
+
+    def __repr__(self) -> str:
+        return 'ClauseStore({0})'.format(list(self))
 
 
 @dataclass()
 class CNF:
     """Represents a CNF formula"""
     number_of_variables: int
-    clauses: Set[Clause]
+    clauses: ClauseStore
 
     def to_dimacs(self: CNF, comments: List[str] = None) -> str:
         """
@@ -28,17 +190,37 @@ class CNF:
         :param comments: additional information that should be included
         :return: the DIMACS representation of this cnf
         """
-        if (comments is None) or (not comments):
-            comment_lines = ''
-        else:
-            prefixed_comments = list(map('c {0}'.format, comments))
-            comment_lines = '\n'.join(prefixed_comments) + '\n'
+        output = io.StringIO()
+        self.write_dimacs(output, comments=comments)
+        return output.getvalue()
 
-        problem = 'p cnf {0} {1}'.format(self.number_of_variables, len(self.clauses))
-        dimacs_clauses = list(map(CNF.clause_to_dimacs, self.clauses))
-        cnf_lines = '\n'.join([problem] + dimacs_clauses)
+    def write_dimacs(self: CNF, file: TextIO, comments: List[str] = None, chunk_size: int = 4096) -> None:
+        """
+        Write this CNF in the DIMACS format to the specified file. In contrast
+        to to_dimacs, the clauses are converted and written in chunks of the
+        specified size. Hence, the whole DIMACS representation is never kept
+        in memory. The comments must not contain line breaks.
 
-        return comment_lines + cnf_lines
+        :param file: the file the DIMACS representation is written to
+        :param comments: additional information that should be included
+        :param chunk_size: the number of clauses converted per write
+        :return: None
+        """
+        if comments:
+            file.write(''.join(map('c {0}\n'.format, comments)))
+
+        file.write('p cnf {0} {1}\n'.format(self.number_of_variables, len(self.clauses)))
+
+        lines = []
+        for clause in self.clauses:
+            lines.append(CNF.clause_to_dimacs(clause))
+
+            if len(lines) >= chunk_size:
+                file.write('\n'.join(lines) + '\n')
+                lines.clear()
+
+        if lines:
+            file.write('\n'.join(lines) + '\n')
 
     @staticmethod
     def clause_to_dimacs(clause: Clause) -> str:
@@ -57,9 +239,24 @@ class CNF:
 class CNFBuilder:
     """Helper class to construct a CNF formula"""
 
-    def __init__(self, number_of_variables=0):
+    def __init__(self, number_of_variables=0, max_gates=0):
         self.number_of_variables = number_of_variables
-        self.clauses = set()
+        self.clauses = ClauseStore()
+        self.gates = OrderedDict()
+        self.max_gates = max_gates
+
+    def copy(self) -> CNFBuilder:
+        """
+        Create an independent copy of this builder including the remembered
+        gates. Continuing with the copy yields the same result as continuing
+        with this builder.
+
+        :return: the copied builder
+        """
+        result = CNFBuilder(self.number_of_variables, self.max_gates)
+        result.clauses = self.clauses.copy()
+        result.gates = self.gates.copy()
+        return result
 
     def build(self) -> CNF:
         """
@@ -70,18 +267,50 @@ class CNFBuilder:
         """
         return CNF(self.number_of_variables, self.build_clauses())
 
-    def build_clauses(self) -> Set[Clause]:
+    def build_clauses(self) -> ClauseStore:
         """
         Remove duplicate clauses and tautologies.
 
         :return: the filtered clauses
         """
-        return set(filter(is_no_tautology, self.clauses))
+        return self.clauses.deduplicate()
 
     def from_tseitin(self, tseitin_transformation, *args) -> Variable:
+        """
+        Allocate a new variable as output of the Tseitin transformation and add
+        the resulting clauses. If the same transformation has already been applied
+        to the same inputs, the existing output is returned instead (structural
+        hashing). Therefore, the transformation has to be deterministic and callers
+        should normalize the inputs of commutative gates.
+
+        The number of remembered gates is bounded by max_gates. If the bound
+        is reached, the oldest gate is forgotten. Since most gates of the
+        multipliers are never rebuilt, structural hashing is disabled by
+        default (max_gates = 0) and no gates are looked up at all.
+
+        :param tseitin_transformation: the transformation encoding the gate
+        :param args: the inputs of the gate
+        :return: the variable representing the output of the gate
+        """
+        if self.max_gates <= 0:
+            output = self.next_variable()
+            self.add_clauses(tseitin_transformation(*args, output))
+            return output
+
+        key = (tseitin_transformation, *args)
+
+        output = self.gates.get(key)
+        if output is not None:
+            return output
+
         output = self.next_variable()
         clauses = tseitin_transformation(*args, output)
         self.add_clauses(clauses)
+
+        self.gates[key] = output
+        if len(self.gates) > self.max_gates:
+            self.gates.popitem(last=False)
+
         return output
 
     def next_variables(self, amount: int) -> List[Variable]:
@@ -106,22 +335,23 @@ class CNFBuilder:
         self.number_of_variables += 1
         return variable(self.number_of_variables)
 
-    def add_clauses(self, clauses: Set[Clause]) -> None:
+    def add_clauses(self, clauses: Iterable[Clause]) -> None:
         """
-        Add the specified clauses to the set of clauses that will be considered when
-        building a CNF.
+        Add the specified clauses to the clauses that will be considered when
+        building a CNF. Tautologies are discarded right away.
 
         :param clauses: the clauses to be added
         :return: None
         """
-        self.clauses.update(clauses)
+        self.clauses.extend(clauses)
 
 
-def is_no_tautology(clause: Clause) -> bool:
+def is_no_tautology(clause: Iterable[int]) -> bool:
     """
     Check whether the clause is a tautology.
 
     :param clause: the clause to be checked
     :return: true if the clause is a tautology, otherwise false
     """
-    return all(-x not in clause for x in clause)
+    literals = set(clause)
+    return all(-x not in literals for x in literals)
@@ -0,0 +1,255 @@
+"""
+Preprocessing
+
+Simplifications of CNF formulas that preserve the satisfiability.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from gen_factor_sat.formula.cnf import CNF, ClauseStore
+from gen_factor_sat.formula.symbol import Variable, variable
+
+
+def preprocess(
+        cnf: CNF,
+        frozen: Iterable[Variable] = (),
+        max_growth: int = 0,
+        max_occurrences: int = 16
+) -> Tuple[CNF, Dict[int, Variable]]:
+    """
+    Simplify the CNF by unit propagation, backward subsumption and bounded
+    variable elimination (see Preprocessor). Afterwards, the variables are
+    renumbered densely while preserving their order.
+
+    :param cnf: the formula to be simplified
+    :param frozen: the variables that must not be eliminated
+    :param max_growth: the number of clauses the elimination of a variable may add
+    :param max_occurrences: only variables occurring at most as often in each polarity are eliminated
+    :return: the simplified formula and the new variable of each remaining variable
+    """
+    preprocessor = Preprocessor(cnf, frozen)
+    preprocessor.propagate()
+    preprocessor.subsume()
+    preprocessor.eliminate(max_growth, max_occurrences)
+
+    return preprocessor.build()
+
+
+class Preprocessor:
+    """
+    Helper class to simplify a CNF formula. The clauses are stored as sets
+    of literals together with the occurrences of each literal. Removed clauses
+    are replaced by None such that the ids of the clauses remain stable.
+
+    Frozen variables are never eliminated and are kept even if they no longer
+    occur in any clause. If a frozen variable is assigned by unit propagation,
+    the corresponding unit clause is kept. Hence, the values of the frozen
+    variables can still be read from any model of the simplified formula.
+    """
+
+    def __init__(self, cnf: CNF, frozen: Iterable[Variable] = ()):
+        self.number_of_variables = cnf.number_of_variables
+        self.frozen: Set[int] = set(map(abs, frozen))
+        self.clauses: List[Optional[FrozenSet[int]]] = []
+        self.occurrences: Dict[int, Set[int]] = defaultdict(set)
+        self.assignment: Dict[int, int] = {}
+        self.units: List[int] = []
+        self.contradiction = False
+
+        for clause in cnf.clauses:
+            self.add_clause(clause)
+
+    def add_clause(self, clause: Iterable[int]) -> None:
+        """
+        Add the clause with respect to the current assignment. Satisfied
+        clauses and tautologies are discarded, false literals are removed.
+        Unit clauses are scheduled for propagation.
+
+        :param clause: the literals of the clause to be added
+        :return: None
+        """
+        assignment = self.assignment
+        literals = set()
+        for literal in clause:
+            value = assignment.get(abs(literal))
+            if value is None:
+                literals.add(literal)
+            elif value == literal:
+                return
+
+        if any(-literal in literals for literal in literals):
+            return
+        elif not literals:
+            self.contradiction = True
+        elif len(literals) == 1:
+            self.units.extend(literals)
+        else:
+            clause_id = len(self.clauses)
+            self.clauses.append(frozenset(literals))
+            for literal in literals:
+                self.occurrences[literal].add(clause_id)
+
+    def remove_clause(self, clause_id: int) -> FrozenSet[int]:
+        """
+        Remove the clause with the specified id.
+
+        :param clause_id: the id of the clause
+        :return: the literals of the removed clause
+        """
+        clause = self.clauses[clause_id]
+        self.clauses[clause_id] = None
+        for literal in clause:
+            self.occurrences[literal].discard(clause_id)
+
+        return clause
+
+    def propagate(self) -> None:
+        """
+        Assign all scheduled unit literals and simplify the clauses until
+        no more units are derived or a contradiction is found.
+
+        :return: None
+        """
+        while self.units and not self.contradiction:
+            literal = self.units.pop()
+            value = self.assignment.get(abs(literal))
+
+            if value is not None:
+                self.contradiction = value != literal
+                continue
+
+            self.assignment[abs(literal)] = literal
+
+            for clause_id in list(self.occurrences[literal]):
+                self.remove_clause(clause_id)
+
+            for clause_id in list(self.occurrences[-literal]):
+                self.add_clause(self.remove_clause(clause_id))
+
+    def subsume(self, clause_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Remove all clauses that are subsumed by one of the specified clauses
+        (backward subsumption). By default, all clauses are checked.
+
+        :param clause_ids: the ids of the clauses that may subsume others
+        :return: None
+        """
+        if clause_ids is None:
+            clause_ids = range(len(self.clauses))
+
+        clauses = self.clauses
+        occurrences = self.occurrences
+        candidates = sorted(
+            (clause_id for clause_id in clause_ids if clauses[clause_id] is not None),
+            key=lambda clause_id: len(clauses[clause_id])
+        )
+
+        for clause_id in candidates:
+            clause = clauses[clause_id]
+            if clause is None:
+                continue
+
+            # Every subsumed clause contains the least frequent literal
+            literal = min(clause, key=lambda lit: len(occurrences[lit]))
+            for other_id in list(occurrences[literal]):
+                other = clauses[other_id]
+                if other_id != clause_id and len(other) >= len(clause) and clause <= other:
+                    self.remove_clause(other_id)
+
+    def eliminate(self, max_growth: int = 0, max_occurrences: int = 16) -> None:
+        """
+        Eliminate variables by replacing all clauses containing them with
+        their non-tautological resolvents (bounded variable elimination).
+        A variable is only eliminated if this adds at most max_growth clauses.
+        Variables whose clauses changed are reconsidered until a fixed point
+        is reached.
+
+        :param max_growth: the number of clauses the elimination of a variable may add
+        :param max_occurrences: only variables occurring at most as often in each polarity are eliminated
+        :return: None
+        """
+        candidates = set(range(1, self.number_of_variables + 1))
+
+        while candidates and not self.contradiction:
+            touched = set()
+
+            for var in sorted(candidates, key=self.__elimination_cost):
+                if var in self.frozen or var in self.assignment:
+                    continue
+
+                positive = self.occurrences[var]
+                negative = self.occurrences[-var]
+                if len(positive) > max_occurrences or len(negative) > max_occurrences:
+                    continue
+
+                resolvents = self.__resolvents(var, len(positive) + len(negative) + max_growth)
+                if resolvents is None:
+                    continue
+
+                for clause_id in list(positive) + list(negative):
+                    touched.update(map(abs, self.remove_clause(clause_id)))
+
+                first_id = len(self.clauses)
+                for resolvent in resolvents:
+                    self.add_clause(resolvent)
+
+                self.propagate()
+                if self.contradiction:
+                    return
+
+                self.subsume(range(first_id, len(self.clauses)))
+
+            touched.discard(0)
+            candidates = touched
+
+    def build(self) -> Tuple[CNF, Dict[int, Variable]]:
+        """
+        Create the simplified CNF. The remaining variables are numbered
+        densely in their original order.
+
+        :return: the simplified formula and the new variable of each remaining variable
+        """
+        used = set(self.frozen)
+        for clause in self.clauses:
+            if clause is not None:
+                used.update(map(abs, clause))
+
+        renumbering = {var: variable(index) for index, var in enumerate(sorted(used), start=1)}
+
+        def rename(literal: int) -> int:
+            return renumbering[literal] if literal > 0 else -renumbering[-literal]
+
+        clauses = ClauseStore()
+        if self.contradiction:
+            clauses.add(())
+        else:
+            for var in sorted(self.frozen & self.assignment.keys()):
+                clauses.add((rename(self.assignment[var]),))
+
+            for clause in self.clauses:
+                if clause is not None:
+                    clauses.add(map(rename, clause))
+
+        return CNF(len(renumbering), clauses), renumbering
+
+    def __elimination_cost(self, var: int) -> int:
+        return len(self.occurrences[var]) * len(self.occurrences[-var])
+
+    def __resolvents(self, var: int, max_resolvents: int) -> Optional[List[FrozenSet[int]]]:
+        # None if the elimination would add too many clauses
+        resolvents = []
+        negative = [self.clauses[clause_id] - {-var} for clause_id in self.occurrences[-var]]
+
+        for clause_id in self.occurrences[var]:
+            positive = self.clauses[clause_id] - {var}
+
+            for other in negative:
+                if all(-literal not in other for literal in positive):
+                    resolvents.append(positive | other)
+
+                    if len(resolvents) > max_resolvents:
+                        return None
+
+        return resolvents
@@ -0,0 +1,163 @@
+"""
+Hints
+
+Redundant constraints derived from the number to be factorized. Every
+factorization satisfies them, but they allow the solver to prune the
+search space early.
+"""
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from gen_factor_sat import utils
+from gen_factor_sat.circuit.default.factoring import GeneralFactoringStrategy
+
+T = TypeVar('T')
+W = TypeVar('W')
+
+Hint = Callable[[GeneralFactoringStrategy, List[T], List[T], int, Optional[int], W], T]
+
+
+def parity_hint(strategy: GeneralFactoringStrategy, factor_1: List[T], factor_2: List[T], number: int,
+                parameter: Optional[int], writer: W) -> T:
+    """
+    The least significant bits of both factors are one if the number is
+    odd. Otherwise, at least one of them is zero.
+    """
+    if number % 2 == 1:
+        strategy.expect_one(factor_1[-1], writer)
+        strategy.expect_one(factor_2[-1], writer)
+        return strategy.one
+    else:
+        return strategy.wire_not(strategy.wire_and(factor_1[-1], factor_2[-1], writer), writer)
+
+
+def low_bits_hint(strategy: GeneralFactoringStrategy, factor_1: List[T], factor_2: List[T], number: int,
+                  parameter: Optional[int], writer: W) -> T:
+    """
+    The lowest k bits of the product are equal to the number modulo 2^k.
+    The bits are computed by a separate truncated multiplier.
+    """
+    low_bits = strategy.multiply_modulo(factor_1, factor_2, parameter, writer)
+    residue = utils.to_bin_list(number % 2 ** parameter)
+
+    return strategy.n_bit_equality(low_bits, residue, writer)
+
+
+def mersenne_hint(strategy: GeneralFactoringStrategy, factor_1: List[T], factor_2: List[T], number: int,
+                  parameter: Optional[int], writer: W) -> T:
+    """
+    The product of the residues of the factors modulo 2^k - 1 is congruent
+    to the number. The residues are sums of the k-bit chunks of the factors
+    (see residue).
+    """
+    product = strategy.multiply(residue(strategy, factor_1, parameter, writer),
+                                residue(strategy, factor_2, parameter, writer), writer)
+    result = residue(strategy, product, parameter, writer)
+
+    expected = number % (2 ** parameter - 1)
+    is_expected = strategy.n_bit_equality(result, utils.to_bin_list(expected), writer)
+
+    if expected == 0:
+        # The residue 2^k - 1 is another representation of zero
+        is_all_ones = strategy.n_bit_equality(result, [strategy.one] * parameter, writer)
+        return strategy.wire_or(is_expected, is_all_ones, writer)
+    else:
+        return is_expected
+
+
+def mod3_hint(strategy: GeneralFactoringStrategy, factor_1: List[T], factor_2: List[T], number: int,
+              parameter: Optional[int], writer: W) -> T:
+    """The product of the factors is congruent to the number modulo 3 = 2^2 - 1."""
+    return mersenne_hint(strategy, factor_1, factor_2, number, 2, writer)
+
+
+def residue(strategy: GeneralFactoringStrategy, number: List[T], length: int, writer: W) -> List[T]:
+    """
+    Calculate a residue of the number modulo 2^length - 1. Since 2^length
+    is congruent to one, the chunks of length bits are added and the carry
+    of each addition is added back at the lsb (end-around carry). The result
+    has length bits, hence zero may also be represented by 2^length - 1.
+
+    :param strategy: the strategy providing the adder
+    :param number: the number to be reduced
+    :param length: the length of the chunks
+    :param writer: a writer for stateful operations
+    :return: the residue with exactly length bits
+    """
+    chunks = [number[max(0, end - length):end] for end in range(len(number), 0, -length)]
+
+    result = [strategy.zero] * (length - len(chunks[0])) + chunks[0]
+    for chunk in chunks[1:]:
+        carry, *output_sum = strategy.n_bit_adder(result, chunk, strategy.zero, writer)
+
+        # The sum of two residues is at most 2^(length + 1) - 2, hence adding the carry does not overflow
+        result = strategy.n_bit_adder(output_sum, [], carry, writer)[1:]
+
+    return result
+
+
+HINTS: Dict[str, Tuple[Hint, bool]] = {
+    'parity': (parity_hint, False),
+    'low': (low_bits_hint, True),
+    'mod3': (mod3_hint, False),
+    'mersenne': (mersenne_hint, True)
+}
+"""The available hints and whether they require a parameter k, e.g. low:8."""
+
+
+def parse_hint(hint: str) -> Tuple[str, Optional[int]]:
+    """
+    Parse a hint of the form name or name:k (see HINTS).
+
+    :param hint: the string representation of the hint
+    :return: the name and the parameter of the hint
+    :raises ValueError if the hint is unknown or the parameter is missing or invalid
+    """
+    name, _, parameter = hint.partition(':')
+    if name not in HINTS:
+        raise ValueError('Unknown hint {0}, expected one of: {1}'.format(name, ', '.join(HINTS)))
+
+    _, has_parameter = HINTS[name]
+    if not has_parameter:
+        if parameter:
+            raise ValueError('The hint {0} does not take a parameter'.format(name))
+
+        return name, None
+    elif not parameter.isdigit() or int(parameter) < (2 if name == 'mersenne' else 1):
+        raise ValueError('The hint {0} requires a positive parameter, e.g. {0}:8'.format(name))
+    else:
+        return name, int(parameter)
+
+
+def parse_hints(hints: str) -> Tuple[str, ...]:
+    """
+    Parse a comma separated list of hints, e.g. parity,low:8,mod3.
+
+    :param hints: the string representation of the hints
+    :return: the validated hints
+    :raises ValueError if any hint is invalid (see parse_hint)
+    """
+    result = tuple(hint.strip() for hint in hints.split(',') if hint.strip())
+    for hint in result:
+        parse_hint(hint)
+
+    return result
+
+
+def add_hints(strategy: GeneralFactoringStrategy, hints: Tuple[str, ...], factor_1: List[T], factor_2: List[T],
+              number: int, writer: W) -> None:
+    """
+    Add the constraints of the specified hints (see HINTS) to the writer.
+
+    :param strategy: the strategy used to encode the constraints
+    :param hints: the hints to be added
+    :param factor_1: the first factor
+    :param factor_2: the second factor
+    :param number: the number to be factorized
+    :param writer: a writer for stateful operations
+    :return: None
+    """
+    for hint in hints:
+        name, parameter = parse_hint(hint)
+        hint_function, _ = HINTS[name]
+
+        strategy.expect_one(hint_function(strategy, factor_1, factor_2, number, parameter, writer), writer)
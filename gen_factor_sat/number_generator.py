@@ -6,7 +6,9 @@ import math
 from abc import ABC
 from dataclasses import dataclass
 from random import Random
-from typing import Optional, Generator
+from typing import Optional, Generator, Iterator, List, Tuple
+
+from gen_factor_sat import utils
 
 
 @dataclass()
@@ -80,7 +82,10 @@ class Number(ABC):
         """
         Create a number of the corresponding type. If a small error rate is
         allowed, a probabilistic (seeded) prime test is used. In this case,
-        the resulting number is marked as probabilistic.
+        the resulting number is marked as probabilistic. Otherwise, numbers
+        below DETERMINISTIC_LIMIT are tested deterministically. Larger primes
+        are only identified with an error probability of at most BPSW_ERROR
+        (see is_prime) and are marked as probabilistic as well.
 
         :param value: the value of the number
         :param seed: the seed for the probabilistic prime test
@@ -96,8 +101,13 @@ class Number(ABC):
             else:
                 return ProbComposite(value=value, error=error)
         else:
-            if is_prime(value):
+            if not is_prime(value):
+                return DetComposite(value)
+            elif value < DETERMINISTIC_LIMIT:
                 return DetPrime(value)
+            elif is_prob_prime(value, BPSW_ERROR, seed):
+                # BPSW is not proven to be correct, hence the additional rounds
+                return ProbPrime(value, BPSW_ERROR)
             else:
                 return DetComposite(value)
 
@@ -121,14 +131,22 @@ class Number(ABC):
         :return: the generated number
         """
         generator = GeneratorConfig.generator(generator_config)
+        return Number.__generate(generator, generator_config.seed, prime, error, max_tries)
 
+    @staticmethod
+    def __generate(
+            candidates: Iterator[int],
+            seed: int,
+            prime: Optional[bool],
+            error: float,
+            max_tries: int) -> Number:
         try:
             if prime is None:
-                return next(map(Number.unchecked, generator))
+                return next(map(Number.unchecked, candidates))
             else:
-                get_type = functools.partial(Number.create, error=error, seed=generator_config.seed)
+                get_type = functools.partial(Number.create, error=error, seed=seed)
                 has_not_correct_type = functools.partial(Number.check_type, prime=not prime)
-                numbers = map(get_type, itertools.islice(generator, max_tries))
+                numbers = map(get_type, itertools.islice(candidates, max_tries))
                 return next(itertools.dropwhile(has_not_correct_type, numbers))
 
         except StopIteration:
@@ -141,6 +159,105 @@ class Number(ABC):
 
             raise StopIteration('Failed to generate a {0} number within {1} tries'.format(number_type, max_tries))
 
+    @staticmethod
+    def generate_many(
+            generator_config: GeneratorConfig,
+            amount: int,
+            prime: Optional[bool] = None,
+            error: float = 0.0,
+            max_tries: int = 1000) -> List[Number]:
+        """
+        Generate several distinct numbers of the same type based on the
+        specified generator configuration (see generate). If the interval is
+        small enough (see is_sievable) and contains at most
+        SIEVE_VALUES_PER_NUMBER values per requested number, the prime numbers
+        of the interval are determined by a segmented sieve and the numbers
+        are chosen among the numbers of the correct type. Sieved segments are
+        cached and reused by later calls. Otherwise, each candidate is tested
+        separately and at most max_tries candidates are drawn per number.
+
+        :param generator_config: the configuration to generate number candidates
+        :param amount: the amount of numbers to be generated
+        :param prime: whether the numbers should be prime numbers
+        :param error: the permitted error probability
+        :param max_tries: the number of tries to generate a number
+        :return: the generated numbers
+        """
+        min_value = generator_config.min_value
+        max_value = generator_config.max_value
+
+        sieve_pays_off = max_value - min_value < amount * SIEVE_VALUES_PER_NUMBER
+        if prime is not None and error == 0.0 and sieve_pays_off and is_sievable(min_value, max_value):
+            flags = sieve_interval(min_value, max_value)
+            wanted = 1 if prime else 0
+            if flags.count(wanted) < amount:
+                raise StopIteration('The interval contains less than {0} {1} numbers'.format(
+                    amount, 'prime' if prime else 'composite'))
+
+            rand = Random(generator_config.seed)
+            if flags.count(wanted) <= 4 * amount:
+                positions = [position for position, flag in enumerate(flags) if flag == wanted]
+                values = [min_value + position for position in rand.sample(positions, amount)]
+            else:
+                # Rejection sampling is cheap as the type is looked up in the sieve
+                values = {}
+                while len(values) < amount:
+                    position = rand.randrange(len(flags))
+                    if flags[position] == wanted:
+                        values[min_value + position] = None
+
+            number_type = DetPrime if prime else DetComposite
+            return [number_type(value) for value in values]
+
+        numbers = {}
+        generator = GeneratorConfig.generator(generator_config)
+        for _ in range(amount):
+            candidates = itertools.filterfalse(numbers.__contains__, itertools.islice(generator, max_tries))
+            number = Number.__generate(candidates, generator_config.seed, prime, error, max_tries)
+            numbers[number.value] = number
+
+        return list(numbers.values())
+
+    @staticmethod
+    def generate_semiprime(
+            generator_config: GeneratorConfig,
+            balance: float = 1.0,
+            max_tries: int = 1000) -> Semiprime:
+        """
+        Generate a product of two prime numbers based on the specified generator
+        configuration. Instead of testing random candidates, a target value t is
+        drawn and the first factor is chosen as random prime with approximately
+        balance / (1 + balance) of the bits of t. The second factor is the next
+        prime after t divided by the first factor. Hence, the bit-length of the
+        smaller factor is approximately balance times the bit-length of the larger
+        factor. Stops if no product within the interval is found within the given
+        number of tries.
+
+        :param generator_config: the configuration to generate the target values
+        :param balance: the ratio between the bit-lengths of the factors (0 < balance <= 1)
+        :param max_tries: the number of tries to generate a number
+        :return: the generated semiprime
+        """
+        if not 0.0 < balance <= 1.0:
+            raise ValueError('The balance must be in the interval (0, 1]')
+
+        rand = Random(generator_config.seed)
+        min_value = generator_config.min_value
+        max_value = generator_config.max_value
+
+        for _ in range(max_tries):
+            target = rand.randint(min_value, max_value)
+            bits = max(2, round(target.bit_length() * balance / (1 + balance)))
+
+            factor_1 = next_prime(rand.randint(2 ** (bits - 1), 2 ** bits - 1))
+            factor_2 = next_prime(max(2, target // factor_1))
+            factor_1, factor_2 = sorted([factor_1, factor_2])
+
+            if min_value <= factor_1 * factor_2 <= max_value:
+                return Semiprime(factor_1 * factor_2, factor_1, factor_2, balance)
+
+        raise StopIteration('Failed to generate a semiprime number within {0} tries'.format(max_tries))
+
     @staticmethod
     def check_type(number: Number, prime: bool) -> bool:
         """
@@ -218,22 +335,152 @@ class DetComposite(Composite):
     pass
 
 
+@dataclass()
+class Semiprime(DetComposite):
+    """
+    A composite number that was constructed as product of two prime numbers.
+    The balance is the requested ratio between the bit-lengths of the factors
+    (see Number.generate_semiprime).
+    """
+    factor_1: int
+    factor_2: int
+    balance: float
+
+
 @dataclass()
 class Unknown(Number):
     pass
 
 
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+"""Miller-Rabin with the first 13 primes as bases is deterministic below this limit."""
+
+BPSW_ERROR = 4.0 ** -32
+"""The error probability of primes above DETERMINISTIC_LIMIT (32 random Miller-Rabin rounds)."""
+
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def _small_primes(limit: int):
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for x in range(2, utils.isqrt(limit - 1) + 1):
+        if sieve[x]:
+            sieve[x * x::x] = bytes(len(range(x * x, limit, x)))
+
+    return tuple(itertools.compress(range(limit), sieve))
+
+
+_SMALL_PRIMES = _small_primes(1000)
+
+
+SIEVE_SEGMENT_SIZE = 2 ** 16
+"""The amount of numbers per sieved segment."""
+
+MAX_SIEVE_WIDTH = 2 ** 24
+"""The largest interval that is sieved (see is_sievable)."""
+
+MAX_SIEVE_VALUE = 2 ** 32
+"""The largest number that is sieved (see is_sievable)."""
+
+SIEVE_VALUES_PER_NUMBER = 2 ** 11
+"""The width of the interval per requested number up to which sieving is faster than testing candidates."""
+
+
+def is_sievable(min_value: int, max_value: int) -> bool:
+    """
+    Check whether the prime numbers of the interval can be determined by
+    the segmented sieve in reasonable time.
+
+    :param min_value: the smallest number of the interval
+    :param max_value: the largest number of the interval
+    :return: true if the interval should be sieved, otherwise false
+    """
+    return max_value - min_value < MAX_SIEVE_WIDTH and max_value <= MAX_SIEVE_VALUE
+
+
+def sieve_interval(min_value: int, max_value: int) -> bytes:
+    """
+    Determine the prime numbers of the interval [min_value, max_value] using
+    a segmented sieve. The segments are cached such that overlapping intervals
+    are only sieved once.
+
+    :param min_value: the smallest number of the interval
+    :param max_value: the largest number of the interval
+    :return: flags that are 1 for prime numbers and 0 otherwise (starting at min_value)
+    """
+    if max_value > MAX_SIEVE_VALUE:
+        raise ValueError('Numbers above {0} cannot be sieved'.format(MAX_SIEVE_VALUE))
+
+    first_segment = min_value // SIEVE_SEGMENT_SIZE
+    last_segment = max_value // SIEVE_SEGMENT_SIZE
+
+    flags = b''.join(map(_sieve_segment, range(first_segment, last_segment + 1)))
+    offset = first_segment * SIEVE_SEGMENT_SIZE
+    return flags[min_value - offset:max_value - offset + 1]
+
+
+@functools.lru_cache(maxsize=1)
+def _base_primes() -> Tuple[int, ...]:
+    return _small_primes(utils.isqrt(MAX_SIEVE_VALUE) + 1)
+
+
+@functools.lru_cache(maxsize=MAX_SIEVE_WIDTH // SIEVE_SEGMENT_SIZE)
+def _sieve_segment(index: int) -> bytes:
+    start = index * SIEVE_SEGMENT_SIZE
+    end = start + SIEVE_SEGMENT_SIZE
+
+    flags = bytearray([1]) * SIEVE_SEGMENT_SIZE
+    for prime in _base_primes():
+        if prime * prime >= end:
+            break
+
+        first = max(prime * prime, -(-start // prime) * prime) - start
+        if first < SIEVE_SEGMENT_SIZE:
+            flags[first::prime] = bytes((SIEVE_SEGMENT_SIZE - 1 - first) // prime + 1)
+
+    if index == 0:
+        flags[0:2] = b'\x00\x00'
+
+    return bytes(flags)
+
+
 def is_prime(value: int) -> bool:
     """
-    Check whether the specified number is a prime number.
+    Check whether the specified number is a prime number. After a trial
+    division by small primes, a Miller-Rabin test with fixed bases is used,
+    which is deterministic below DETERMINISTIC_LIMIT. Larger numbers are
+    checked with the Baillie-PSW test (Miller-Rabin to base 2 and a strong
+    Lucas test). There is no known composite number passing this test.
 
     :param value: the value to be checked
     :return: true if the number is a prime, false otherwise
     """
-    if value == 2:
-        return True
+    small_prime = _check_small_primes(value)
+    if small_prime is not None:
+        return small_prime
+    elif value < DETERMINISTIC_LIMIT:
+        return all(_miller_rabin(value, a) for a in _MILLER_RABIN_BASES)
     else:
-        return all(value % x != 0 for x in range(2, math.ceil(math.sqrt(value)) + 1))
+        return _miller_rabin(value, 2) and _strong_lucas(value)
+
+
+def next_prime(value: int) -> int:
+    """
+    Determine the smallest prime number greater or equal to the specified value
+    (see is_prime).
+
+    :param value: the lower bound
+    :return: the next prime number
+    """
+    if value <= 2:
+        return 2
+
+    candidate = value if value % 2 else value + 1
+    while not is_prime(candidate):
+        candidate += 2
+
+    return candidate
 
 
 def is_prob_prime(value: int, error: float, seed: int):
@@ -248,9 +495,13 @@ def is_prob_prime(value: int, error: float, seed: int):
     :param seed: a seed to reproduce the results
     :return: true if the number is a prime, false otherwise
     """
+    small_prime = _check_small_primes(value)
+    if small_prime is not None:
+        return small_prime
+
     rand = Random(seed)
 
-    iterations = math.ceil(-math.log(error) / math.log(4))
+    iterations = max(1, math.ceil(-math.log(error) / math.log(4)))
     for iteration in range(0, iterations):
         a = rand.randrange(1, value)
         if not _miller_rabin(value, a):
@@ -259,18 +510,101 @@ def is_prob_prime(value: int, error: float, seed: int):
     return True
 
 
-def _miller_rabin(number: int, a: int):
-    d = 1
-    dd = 1
+def _check_small_primes(value: int) -> Optional[bool]:
+    # None if the value has no small prime factor and needs further tests
+    for prime in _SMALL_PRIMES:
+        if value % prime == 0:
+            return value == prime
+
+    if value < _SMALL_PRIMES[-1] ** 2:
+        return value >= 2
+    else:
+        return None
+
+
+def _miller_rabin(number: int, a: int) -> bool:
+    # Strong probable prime test of an odd number to the base a
+    d = number - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    x = pow(a, d, number)
+    if x == 1 or x == number - 1 or x == 0:
+        return True
+
+    for _ in range(s - 1):
+        x = pow(x, 2, number)
+        if x == number - 1:
+            return True
+
+    return False
+
+
+def _strong_lucas(number: int) -> bool:
+    # Strong Lucas probable prime test of an odd number with the parameters
+    # chosen by Selfridge's method A: P = 1, Q = (1 - D) / 4
+    if utils.isqrt(number) ** 2 == number:
+        return False
 
-    for b in bin(number - 1)[2:]:
-        d = d * d % number
-        if d == 1 and dd != 1 and dd != number - 1:
+    d = 5
+    while True:
+        jacobi = _jacobi(d, number)
+        if jacobi == -1:
+            break
+        elif jacobi == 0 and abs(d) != number:
             return False
 
-        if b == '1':
-            d = d * a % number
+        d = -d - 2 if d > 0 else -d + 2
+
+    p = 1
+    q = (1 - d) // 4
+
+    k = number + 1
+    s = 0
+    while k % 2 == 0:
+        k //= 2
+        s += 1
+
+    def half(x: int) -> int:
+        x %= number
+        return (x + number if x % 2 else x) // 2
+
+    u, v, q_k = 1, p, q % number
+    for bit in bin(k)[3:]:
+        u, v = u * v % number, (v * v - 2 * q_k) % number
+        q_k = q_k * q_k % number
+
+        if bit == '1':
+            u, v = half(p * u + v), half(d * u + p * v)
+            q_k = q_k * q % number
+
+    if u == 0 or v == 0:
+        return True
+
+    for _ in range(s - 1):
+        v = (v * v - 2 * q_k) % number
+        q_k = q_k * q_k % number
+        if v == 0:
+            return True
+
+    return False
+
+
+def _jacobi(a: int, n: int) -> int:
+    a %= n
+    result = 1
+    while a != 0:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
 
-        dd = d
+        a %= n
 
-    return d == 1
+    return result if n == 1 else 0
@@ -0,0 +1,67 @@
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, booleans
+from pysat.solvers import Solver
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat import utils
+from gen_factor_sat.circuit.instances import TseitinFactoringStrategy, TseitinKoggeStoneFactoringStrategy, \
+    TseitinBrentKungFactoringStrategy, TseitinSklanskyFactoringStrategy, TseitinCarrySelectFactoringStrategy
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.cnf import CNFBuilder
+
+ADDERS = [
+    TseitinKoggeStoneFactoringStrategy,
+    TseitinBrentKungFactoringStrategy,
+    TseitinSklanskyFactoringStrategy,
+    TseitinCarrySelectFactoringStrategy
+]
+
+
+@pytest.fixture(scope='module', params=ADDERS)
+def adder_strategy(request):
+    return request.param()
+
+
+@given(number_1=integers(min_value=0), number_2=integers(min_value=0), carry=booleans())
+def test_n_bit_adder(adder_strategy, number_1, number_2, carry):
+    bin_number_1 = utils.to_bin_list(number_1)
+    bin_number_2 = utils.to_bin_list(number_2)
+    bin_carry = utils.to_bin_list(carry)[0]
+
+    bin_result = adder_strategy.n_bit_adder(bin_number_1, bin_number_2, bin_carry, None)
+
+    assert len(bin_result) == max(len(bin_number_1), len(bin_number_2)) + 1
+    assert utils.to_int(bin_result) == number_1 + number_2 + int(carry)
+
+
+@pytest.mark.parametrize('length_1, length_2', [(1, 1), (7, 7), (16, 9), (33, 33)])
+def test_equivalent_to_ripple_carry(adder_strategy, length_1, length_2):
+    ripple_carry = TseitinFactoringStrategy()
+
+    writer = CNFBuilder()
+    number_1 = writer.next_variables(length_1)
+    number_2 = writer.next_variables(length_2)
+    carry = writer.next_variable()
+
+    expected = ripple_carry.n_bit_adder(number_1, number_2, carry, writer)
+    result = adder_strategy.n_bit_adder(number_1, number_2, carry, writer)
+
+    assert len(result) == len(expected)
+    adder_strategy.expect_zero(adder_strategy.n_bit_equality(result, expected, writer), writer)
+
+    with Solver(name='cadical', bootstrap_with=writer.build().clauses) as solver:
+        assert not solver.solve(), 'The adder should compute the same sum as the ripple-carry adder'
+
+
+@pytest.mark.parametrize('factor_1, factor_2', [(2 ** 10 + 659, 2 ** 15 + 1414), (2 ** 15 + 5217, 2 ** 10 + 561)])
+def test_composite_number(adder_strategy, factor_1, factor_2):
+    factor_sat = FactoringSat.factorize_number(factor_1 * factor_2, strategy=adder_strategy)
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert solver.solve(), 'The formula generated for a composite number should be in SAT'
+
+        model = solver.get_model()
+        result_1 = test_utils.assignment_to_int(factor_sat.factor_1, model)
+        result_2 = test_utils.assignment_to_int(factor_sat.factor_2, model)
+        assert result_1 * result_2 == factor_1 * factor_2
@@ -0,0 +1,93 @@
+import pytest
+from pysat.solvers import Solver
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat import utils
+from gen_factor_sat.circuit.instances import AigFactoringStrategy, PlaistedGreenbaumFactoringStrategy
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.aig import Aig
+from gen_factor_sat.formula.symbol import variable
+
+
+@pytest.fixture(scope='module', params=[AigFactoringStrategy, PlaistedGreenbaumFactoringStrategy])
+def aig_strategy(request):
+    return request.param()
+
+
+def test_structural_hashing(aig_strategy):
+    aig = Aig()
+    variable_1, variable_2 = aig.next_variables(2)
+
+    output = aig_strategy.wire_and(variable_1, variable_2, aig)
+    assert aig_strategy.wire_and(variable_2, variable_1, aig) == output
+    assert aig_strategy.wire_or(variable(-variable_1), variable(-variable_2), aig) == -output
+    assert aig.number_of_nodes == 3, 'Structurally equal gates should be created once'
+
+
+def test_dead_nodes_are_removed(aig_strategy):
+    aig = Aig()
+    variable_1, variable_2, variable_3 = aig.next_variables(3)
+
+    aig_strategy.wire_and(variable_1, variable_2, aig)
+    output = aig_strategy.wire_or(variable_2, variable_3, aig)
+    aig_strategy.expect_one(output, aig)
+
+    cnf = aig.build()
+    assert cnf.number_of_variables == 4, 'Inputs should be kept, unused gates removed'
+    assert len(cnf.clauses) == 4
+
+
+@pytest.mark.parametrize('factor_1', [1, 17, 2 ** 10 + 865, 2 ** 21 + 46196])
+@pytest.mark.parametrize('factor_2', [0, 2, 2 ** 21 + 510579])
+def test_aig_mult(aig_strategy, factor_1, factor_2):
+    assert run_aig_mult(aig_strategy, factor_1, factor_2, factor_1 * factor_2)
+    assert not run_aig_mult(aig_strategy, factor_1, factor_2, factor_1 * factor_2 + 1)
+
+
+@pytest.mark.parametrize('factor_1, factor_2', [(3, 5), (1031, 32771)])
+def test_composite_number(aig_strategy, factor_1, factor_2):
+    factor_sat = FactoringSat.factorize_number(factor_1 * factor_2, aig_strategy)
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert solver.solve(), "The formula generated for a composite number should be in SAT"
+
+        model = solver.get_model()
+        result_a = test_utils.assignment_to_int(factor_sat.factor_1, model)
+        result_b = test_utils.assignment_to_int(factor_sat.factor_2, model)
+        assert result_a * result_b == factor_1 * factor_2
+
+
+@pytest.mark.parametrize('prime', [2, 1031, 32771])
+def test_prime_number(aig_strategy, prime):
+    factor_sat = FactoringSat.factorize_number(prime, aig_strategy)
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert not solver.solve(), "The formula generated for a prime number should be in UNSAT"
+
+
+@pytest.mark.parametrize('number', [35, 1031 * 32771, 2 ** 40 + 15])
+def test_polarity_aware_encoding_is_smaller(number):
+    cnf = FactoringSat.factorize_number(number, AigFactoringStrategy()).cnf
+    polarity_cnf = FactoringSat.factorize_number(number, PlaistedGreenbaumFactoringStrategy()).cnf
+
+    assert polarity_cnf.number_of_variables == cnf.number_of_variables
+    assert len(polarity_cnf.clauses) <= len(cnf.clauses), \
+        'Encoding only the required directions should not add clauses'
+
+
+def run_aig_mult(aig_strategy, factor_1, factor_2, product):
+    aig = Aig()
+
+    bin_factor_1 = utils.to_bin_list(factor_1)
+    bin_factor_2 = utils.to_bin_list(factor_2)
+
+    factor_1 = aig.next_variables(len(bin_factor_1))
+    factor_2 = aig.next_variables(len(bin_factor_2))
+
+    result = aig_strategy.multiply(factor_1, factor_2, aig)
+    aig_strategy.expect_one(aig_strategy.n_bit_equality(result, utils.to_bin_list(product), aig), aig)
+
+    assignment_1 = list(test_utils.assign(factor_1, bin_factor_1))
+    assignment_2 = list(test_utils.assign(factor_2, bin_factor_2))
+
+    return test_utils.run_cnf(assignment_1 + assignment_2, [], aig.build().clauses) is not None
@@ -0,0 +1,77 @@
+import csv
+import os
+
+import pytest
+
+from gen_factor_sat import batch
+from gen_factor_sat.circuit.instances import STRATEGIES, AUTO_STRATEGY
+from gen_factor_sat.factoring_sat import FactoringSat
+
+
+def test_parse_interval():
+    assert batch.parse_interval('100:10000:10') == (100, 10000, 10)
+
+    with pytest.raises(ValueError):
+        batch.parse_interval('100:10000')
+
+    with pytest.raises(ValueError):
+        batch.parse_interval('100:10000:1')
+
+
+def test_create_tasks(tmp_path):
+    tasks = batch.create_tasks(str(tmp_path), (10, 1000, 10), (1, 2, 3), seed=42)
+
+    assert len(tasks) == 2 * 6
+    assert [task.prime for task in tasks[:6]] == [None, True, True, False, False, False]
+    assert {(task.min_value, task.max_value) for task in tasks} == {(10, 100), (100, 1000)}
+    assert {os.path.basename(task.directory) for task in tasks} == {'factor_10-100', 'factor_100-1000'}
+
+    assert tasks == batch.create_tasks(str(tmp_path), (10, 1000, 10), (1, 2, 3), seed=42), \
+        'The same seed should yield the same tasks'
+
+    assert len({task.seed for task in tasks}) == len(tasks), 'Every instance should get its own seed'
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_run_batch(tmp_path, jobs):
+    tasks = batch.create_tasks(str(tmp_path), (100, 10000, 10), (1, 1, 1), seed=7)
+    results = batch.run_batch(tasks, jobs=jobs)
+
+    manifest = os.path.join(str(tmp_path), batch.MANIFEST)
+    batch.write_manifest(results, manifest)
+
+    with open(manifest) as file:
+        rows = list(csv.DictReader(file))
+
+    assert [row['file'] for row in rows] == [result.file for result in results]
+    assert [row['number_type'] for row in rows] == ['random', 'prime', 'composite'] * 2
+
+    for task, result in zip(tasks, results):
+        assert os.path.dirname(result.file) == task.directory
+        assert task.min_value <= result.number <= task.max_value
+
+        assert os.path.basename(result.file).startswith('factor_seed{0}_minn{1}_maxn{2}_'.format(
+            task.seed, task.min_value, task.max_value
+        )), 'The filename should describe the generator of the instance'
+
+        with open(result.file) as file:
+            content = file.read()
+            assert 'p cnf {0} {1}\n'.format(result.number_of_variables, result.number_of_clauses) in content
+            assert '--seed {0} --min-value {1}'.format(task.seed, task.min_value) in content, \
+                'The instance should be reproducible by the random command'
+
+
+def test_run_task_reproducible(tmp_path):
+    task = batch.create_tasks(str(tmp_path), (100, 1000, 10), (0, 1, 0), seed=11)[0]
+    result = batch.run_task(task)
+
+    factor_sat = FactoringSat.factorize_random_number(task.max_value, task.min_value, task.seed, prime=True)
+    assert factor_sat.number.value == result.number, 'The seed of the task should reproduce its number'
+    assert os.path.basename(result.file) == factor_sat.default_filename()
+
+
+def test_run_batch_with_portfolio(tmp_path):
+    tasks = batch.create_tasks(str(tmp_path), (100, 1000, 10), (1, 0, 1), seed=3, strategy=AUTO_STRATEGY)
+    results = batch.run_batch(tasks, jobs=1)
+
+    assert all(result.strategy in STRATEGIES for result in results), 'The selected strategy should be recorded'
@@ -0,0 +1,27 @@
+import pytest
+
+from gen_factor_sat.benchmark import tune
+from gen_factor_sat.circuit.default.multiplication import load_thresholds
+
+
+def test_tune(tmp_path):
+    rows = []
+    thresholds = tune.tune('karatsuba', lengths=[24, 8], candidates=[4, 20], rows=rows)
+
+    assert [(row['Length'], row['Threshold']) for row in rows] == [(8, 4), (8, 20), (24, 4), (24, 20)]
+    assert thresholds[0] == (8, 20), 'Ties should be resolved in favor of min_len'
+    assert all(threshold in [4, 20] for _, threshold in thresholds)
+
+    filename = str(tmp_path / 'thresholds.json')
+    tune.save_thresholds('karatsuba', 'clauses', thresholds, filename)
+    tune.save_thresholds('booth', 'variables', ((16, 12),), filename)
+
+    assert load_thresholds(filename) == {
+        'TseitinFactoringStrategy': thresholds,
+        'TseitinBoothFactoringStrategy': ((16, 12),)
+    }
+
+
+def test_tune_requires_karatsuba():
+    with pytest.raises(ValueError):
+        tune.tune('wallace', lengths=[8])
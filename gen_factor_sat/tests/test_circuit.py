@@ -23,6 +23,18 @@ def test_n_bit_adder(tseitin_circuit, number_1, number_2, carry):
     assert utils.to_int(bin_result) == number_1 + number_2 + int(carry)
 
 
+@pytest.mark.parametrize('bits', [5000, 20000])
+def test_wide_n_bit_adder(tseitin_circuit, bits):
+    number_1 = 2 ** bits - 1
+    number_2 = 2 ** (bits // 2) + 1
+
+    bin_result = tseitin_circuit.n_bit_adder(utils.to_bin_list(number_1), utils.to_bin_list(number_2), '0', None)
+    assert utils.to_int(bin_result) == number_1 + number_2, 'Wide numbers should not exceed the recursion limit'
+
+    bin_result = tseitin_circuit.subtract(utils.to_bin_list(number_1), utils.to_bin_list(number_2), None)
+    assert utils.to_int(bin_result) == number_1 - number_2
+
+
 @given(number_1=integers(min_value=0), number_2=integers(min_value=0))
 def test_subtract(tseitin_circuit, number_1, number_2):
     assume(number_1 >= number_2)
@@ -45,6 +57,16 @@ def test_n_bit_equality(tseitin_circuit, number_1, number_2):
     assert (bin_result == '1') == (number_1 == number_2)
 
 
+@given(number_1=integers(min_value=0), number_2=integers(min_value=0))
+def test_less_equal(tseitin_circuit, number_1, number_2):
+    bin_number_1 = utils.to_bin_list(number_1)
+    bin_number_2 = utils.to_bin_list(number_2)
+
+    bin_result = tseitin_circuit.less_equal(bin_number_1, bin_number_2, None)
+
+    assert (bin_result == '1') == (number_1 <= number_2)
+
+
 @given(number_1=integers(min_value=0), number_2=integers(min_value=0))
 def test_align(tseitin_circuit, number_1, number_2):
     bin_number_1 = utils.to_bin_list(number_1)
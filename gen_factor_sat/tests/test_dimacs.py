@@ -1,3 +1,4 @@
+import io
 import re
 from collections import Counter
 
@@ -5,7 +6,7 @@ import pytest
 
 import gen_factor_sat.circuit.tseitin.encoding as te
 from gen_factor_sat.factoring_sat import FactoringSat
-from gen_factor_sat.formula.cnf import CNF
+from gen_factor_sat.formula.cnf import CNF, ClauseStore
 from gen_factor_sat.formula.symbol import variable
 
 comment_line = re.compile('c (?P<comment>.*)')
@@ -35,7 +36,7 @@ def test_clauses_to_dimacs_conversion(clause):
     (17, {te.clause(list(map(variable, [-1, -12, -4]))), te.empty_clause()})
 ])
 def test_cnf_to_dimacs_conversion(num_vars, clauses):
-    cnf = CNF(num_vars, clauses)
+    cnf = CNF(num_vars, ClauseStore(clauses))
     dimacs = cnf.to_dimacs()
 
     lines = dimacs.splitlines(keepends=False)
@@ -57,7 +58,7 @@ def test_comments_should_be_prepended(comments):
     clauses = {te.clause(list(map(variable, [-1, 3]))),
                te.clause(list(map(variable, [-10, -5, 14])))}
 
-    cnf = CNF(num_vars, clauses)
+    cnf = CNF(num_vars, ClauseStore(clauses))
     dimacs = cnf.to_dimacs(comments=comments)
 
     lines = dimacs.splitlines(keepends=False)
@@ -117,7 +118,21 @@ def test_encoded_cnf(factoring_instance):
             assert all(occurrences[-literal] == 0 for literal in clause)
             assert all(occurrences[literal] == 1 for literal in clause)
 
-            clauses.append(frozenset(clause))
+            clauses.append(tuple(clause))
 
     assert len(clauses) == len(factoring_instance.cnf.clauses)
-    assert set(clauses) == factoring_instance.cnf.clauses
+    assert clauses == list(factoring_instance.cnf.clauses)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 4096])
+def test_streamed_dimacs(factoring_instance, chunk_size):
+    output = io.StringIO()
+    factoring_instance.cnf.write_dimacs(output, comments=['Comment'], chunk_size=chunk_size)
+
+    assert output.getvalue() == factoring_instance.cnf.to_dimacs(comments=['Comment']), \
+        'Writing in chunks should not change the DIMACS representation'
+
+    output = io.StringIO()
+    factoring_instance.write_dimacs(output)
+
+    assert output.getvalue() == factoring_instance.to_dimacs()
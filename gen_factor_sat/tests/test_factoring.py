@@ -6,7 +6,11 @@ from hypothesis.strategies import integers, booleans, floats
 from pysat.solvers import Solver
 
 import gen_factor_sat.tests.utils as test_utils
-from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat import utils
+from gen_factor_sat.circuit.instances import STRATEGIES, TseitinFactoringStrategy, ConstantFactoringStrategy, \
+    AUTO_STRATEGY
+from gen_factor_sat.factoring_sat import FactoringSat, PORTFOLIO_METRICS
+from gen_factor_sat.formula.cnf import CNFBuilder
 
 
 @given(integers(min_value=2, max_value=2 ** 40))
@@ -102,3 +106,235 @@ def test_every_variable_should_occur_at_least_once(number):
 
     assert all(variable <= factor_sat.cnf.number_of_variables for variable in variables), \
         'Variables should be numbered from 1 to the specified number'
+
+
+@pytest.mark.parametrize('strategy', [None, 'wallace', 'plaisted-greenbaum'])
+def test_reproduce_command(strategy):
+    strategy_instance = STRATEGIES[strategy]() if strategy else None
+    factor_sat = FactoringSat.factorize_number(35, strategy_instance)
+    command = factor_sat.reproduce_command()
+
+    assert command.startswith('gen_factor_sat number')
+    assert command.endswith(' 35')
+    assert (strategy is not None) == ('--strategy {0}'.format(strategy) in command)
+
+
+@pytest.mark.parametrize('strategy', list(STRATEGIES))
+def test_cached_multiplier(strategy):
+    numbers = [2 ** 20 + 7, 2 ** 20 + 13, 2 ** 21 - 1]
+
+    FactoringSat.clear_multiplier_cache()
+    cached = [FactoringSat.factorize_number(number, STRATEGIES[strategy]()) for number in numbers]
+
+    for number, factor_sat in zip(numbers, cached):
+        FactoringSat.clear_multiplier_cache()
+        assert factor_sat == FactoringSat.factorize_number(number, STRATEGIES[strategy]()), \
+            'Reusing the multiplier should yield the same result'
+
+
+@pytest.mark.parametrize('attribute, value', [('redundant_clauses', True), ('truncate_product', False),
+                                              ('toom_min_len', 16)])
+def test_cached_multiplier_configuration(attribute, value):
+    number = 2 ** 64 + 13
+    configured_strategy = TseitinFactoringStrategy()
+    setattr(configured_strategy, attribute, value)
+
+    FactoringSat.clear_multiplier_cache()
+    default = FactoringSat.factorize_number(number, TseitinFactoringStrategy())
+    configured = FactoringSat.factorize_number(number, configured_strategy)
+
+    FactoringSat.clear_multiplier_cache()
+    assert configured == FactoringSat.factorize_number(number, configured_strategy), \
+        'The multiplier of another configuration should not be reused'
+    assert configured.cnf != default.cnf
+
+
+@pytest.mark.parametrize('number', [2 ** 17 - 1, (2 ** 10 + 659) * (2 ** 15 + 5217), 2 ** 64 + 13])
+def test_truncated_product(number):
+    strategy = TseitinFactoringStrategy()
+    strategy.truncate_product = False
+    full_product = FactoringSat.factorize_number(number, strategy)
+    truncated_product = FactoringSat.factorize_number(number)
+
+    assert truncated_product.cnf.number_of_variables < full_product.cnf.number_of_variables
+    assert len(truncated_product.cnf.clauses) < len(full_product.cnf.clauses), \
+        'Truncating the product should drop the gates of the high bits'
+
+    if number < 2 ** 32:
+        with Solver(name='cadical', bootstrap_with=truncated_product.cnf.clauses) as solver:
+            assert solver.solve() == (number != 2 ** 17 - 1)
+
+
+@pytest.mark.parametrize('number', [1, 2 ** 10 + 659, 2 ** 40 + 15])
+def test_expect_product(number):
+    strategy = TseitinFactoringStrategy()
+    writer = CNFBuilder()
+    product = writer.next_variables(number.bit_length() + 1)
+
+    strategy.expect_product(product, utils.to_bin_list(number), writer)
+    cnf = writer.build()
+
+    assert all(len(clause) == 1 for clause in cnf.clauses), 'Every bit of the product should be a unit'
+    assert len(cnf.clauses) == len(product)
+
+    with Solver(name='cadical', bootstrap_with=cnf.clauses) as solver:
+        assert solver.solve()
+        assert test_utils.assignment_to_int(product, solver.get_model()) == number
+
+
+@given(product=integers(min_value=0, max_value=2 ** 40), number=integers(min_value=0, max_value=2 ** 40))
+def test_expect_constant_product(product, number):
+    strategy = ConstantFactoringStrategy()
+
+    if product == number:
+        assert strategy.expect_product(utils.to_bin_list(product), utils.to_bin_list(number), None) == strategy.one
+    else:
+        with pytest.raises(ValueError):
+            strategy.expect_product(utils.to_bin_list(product), utils.to_bin_list(number), None)
+
+
+@pytest.mark.parametrize('strategy', list(STRATEGIES))
+@pytest.mark.parametrize('number', [2 * 3 * 5 * 7 * 11 * 13, 1009 * 1013, 2 ** 20 + 7])
+def test_symmetry_breaking(strategy, number):
+    factor_sat = FactoringSat.factorize_number(number, strategy, symmetry_breaking=True)
+    factorizations = set()
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        for model in solver.enum_models():
+            factor_1 = test_utils.assignment_to_int(factor_sat.factor_1, model)
+            factor_2 = test_utils.assignment_to_int(factor_sat.factor_2, model)
+            assert factor_1 <= factor_2, 'The factors should be ordered'
+            factorizations.add((factor_1, factor_2))
+
+            solver.add_clause([-literal for literal in model if abs(literal) in factor_sat.factor_1 + factor_sat.factor_2])
+
+    expected = {(factor, number // factor) for factor in range(2, utils.isqrt(number) + 1) if number % factor == 0}
+    assert factorizations == expected, 'No factorization should be lost'
+    assert '--symmetry-breaking' in factor_sat.reproduce_command()
+
+
+@pytest.mark.parametrize('strategy', list(STRATEGIES))
+@pytest.mark.parametrize('number, known_bits_1, known_bits_2', [
+    (2 * 3 * 5 * 7 * 11 * 13, 'x1', None),
+    (2 * 3 * 5 * 7 * 11 * 13, '1x1', '1x1x'),
+    (1009 * 1013, 'xx1110001', None),
+    (1009 * 1013, '1111110001', None)
+])
+def test_known_bits(strategy, number, known_bits_1, known_bits_2):
+    factor_sat = FactoringSat.factorize_number(
+        number, strategy, known_bits_1=known_bits_1, known_bits_2=known_bits_2
+    )
+    factorizations = set()
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        for model in solver.enum_models():
+            factor_1 = test_utils.assignment_to_int(factor_sat.factor_1, model)
+            factor_2 = test_utils.assignment_to_int(factor_sat.factor_2, model)
+            factorizations.add((factor_1, factor_2))
+
+            solver.add_clause([-literal for literal in model if abs(literal) in factor_sat.factor_1 + factor_sat.factor_2])
+
+    def matches(factor, known_bits):
+        bits = utils.to_bin_string(factor)
+        return not known_bits or all(
+            known in ('x', bit) for known, bit in zip(reversed(known_bits), reversed(bits.zfill(len(known_bits))))
+        )
+
+    expected = {
+        (factor, number // factor) for factor in range(2, 2 ** len(factor_sat.factor_1))
+        if number % factor == 0 and number // factor > 1
+        and matches(factor, known_bits_1) and matches(number // factor, known_bits_2)
+    }
+    assert factorizations == expected, 'Exactly the factorizations matching the known bits should remain'
+
+
+def test_known_bits_are_folded():
+    number = 1009 * 1013
+    factor_sat = FactoringSat.factorize_number(number, known_bits_1='xx1110001', known_bits_2='1111110101')
+    unknown = FactoringSat.factorize_number(number)
+
+    assert len(factor_sat.cnf.clauses) < len(unknown.cnf.clauses) / 2, 'The gates of known bits should be folded'
+    assert factor_sat.factor_1 == unknown.factor_1
+    assert '--known-bits-1 xx1110001 --known-bits-2 1111110101' in factor_sat.reproduce_command()
+    assert factor_sat == FactoringSat.factorize_number(
+        number, known_bits_1='xx1110001', known_bits_2='1111110101'
+    ), 'Multiple calls should yield the same result'
+
+
+@pytest.mark.parametrize('known_bits', ['1?0', '10x2', '1' * 11])
+def test_invalid_known_bits(known_bits):
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_number(1009 * 1013, known_bits_1=known_bits)
+
+
+def test_known_bits_symmetry_breaking():
+    number = 1009 * 1013
+    factor_sat = FactoringSat.factorize_number(number, known_bits_1='0101')
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert solver.solve(), 'The factorization 1013 * 1009 should match the pattern'
+
+    with pytest.raises(ValueError):
+        # The ordering would only allow 1009 * 1013, which does not match the pattern
+        FactoringSat.factorize_number(number, known_bits_1='0101', symmetry_breaking=True)
+
+
+@pytest.mark.parametrize('metric', list(PORTFOLIO_METRICS))
+def test_portfolio(metric):
+    number = 2 ** 40 + 15
+    factor_sat = FactoringSat.factorize_number(number, AUTO_STRATEGY, metric=metric, jobs=1)
+
+    measure = PORTFOLIO_METRICS[metric]
+    sizes = {name: measure(FactoringSat.factorize_number(number, name).cnf) for name in STRATEGIES}
+
+    assert sizes[factor_sat.strategy] == min(sizes.values()), 'The smallest CNF should be kept'
+    assert factor_sat.cnf == FactoringSat.factorize_number(number, factor_sat.strategy).cnf
+    assert factor_sat.portfolio == metric
+    assert any(metric in comment for comment in factor_sat.dimacs_comments())
+    assert AUTO_STRATEGY not in factor_sat.reproduce_command(), 'The selected strategy should be reproduced'
+
+
+def test_parallel_portfolio():
+    configuration = {'max_value': 2 ** 30, 'min_value': 2 ** 29, 'seed': 5, 'strategy': AUTO_STRATEGY}
+
+    assert FactoringSat.factorize_random_number(**configuration, jobs=2) == \
+        FactoringSat.factorize_random_number(**configuration, jobs=1), \
+        'The selected strategy should not depend on the number of processes'
+
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_number(35, AUTO_STRATEGY, metric='time')
+
+
+@pytest.mark.parametrize('balance', [1.0, 0.5])
+def test_semiprime(balance):
+    factor_sat = FactoringSat.factorize_random_number(2 ** 30, 2 ** 29, seed=5, semiprime=True, balance=balance)
+    number = factor_sat.number
+
+    assert 'The number is the product of the primes: {0} * {1}'.format(number.factor_1, number.factor_2) \
+           in factor_sat.dimacs_comments()
+    assert '--semiprime --balance {0}'.format(balance) in factor_sat.reproduce_command()
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert solver.solve(), "The formula generated for a semiprime should be in SAT"
+
+        model = solver.get_model()
+        result_a = test_utils.assignment_to_int(factor_sat.factor_1, model)
+        result_b = test_utils.assignment_to_int(factor_sat.factor_2, model)
+        assert {result_a, result_b} == {number.factor_1, number.factor_2}
+
+
+def test_large_number():
+    # The Karatsuba halves exceed toom_min_len (512 bits), hence every multiplier of the default strategy is used
+    factor_1, factor_2 = 2 ** 514 + 2 ** 200 + 3, 2 ** 515 + 2 ** 300 + 5
+    factor_sat = FactoringSat.factorize_number(factor_1 * factor_2)
+
+    assert len(factor_sat.factor_1) == 515
+    assert len(factor_sat.factor_2) == 1029
+    assert len(factor_sat.cnf.clauses) > 0
+
+    # The gates fold constant inputs, hence the multiplier of a 4096-bit number is evaluated without clauses
+    factor_1, factor_2 = 2 ** 2047 + 12345, 2 ** 4094 + 2 ** 3000 + 7
+    strategy = TseitinFactoringStrategy()
+    result = strategy.multiply(utils.to_bin_list(factor_1), utils.to_bin_list(factor_2), strategy.create_writer())
+
+    assert utils.to_int(result) == factor_1 * factor_2
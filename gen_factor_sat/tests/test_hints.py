@@ -0,0 +1,79 @@
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers
+from pysat.solvers import Solver
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat import utils, hints
+from gen_factor_sat.circuit.instances import ConstantFactoringStrategy, STRATEGIES
+from gen_factor_sat.factoring_sat import FactoringSat
+
+HINTS = ['parity', 'low:1', 'low:4', 'mod3', 'mersenne:3', 'mersenne:5']
+
+
+@pytest.fixture(scope='module')
+def constant_strategy():
+    return ConstantFactoringStrategy()
+
+
+@given(number=integers(0, 2 ** 100), length=integers(2, 20))
+def test_residue(constant_strategy, number, length):
+    result = hints.residue(constant_strategy, utils.to_bin_list(number), length, None)
+
+    assert len(result) == length
+    assert utils.to_int(result) % (2 ** length - 1) == number % (2 ** length - 1)
+
+
+@pytest.mark.parametrize('hint', ['low:1', 'low:6', 'mod3', 'mersenne:4', 'mersenne:7'])
+@given(factor_1=integers(0, 2 ** 20), factor_2=integers(0, 2 ** 20), number=integers(0, 2 ** 40))
+def test_hint_circuit(constant_strategy, hint, factor_1, factor_2, number):
+    name, parameter = hints.parse_hint(hint)
+    hint_function, _ = hints.HINTS[name]
+
+    result = hint_function(
+        constant_strategy, utils.to_bin_list(factor_1), utils.to_bin_list(factor_2), number, parameter, None
+    )
+
+    modulus = 2 ** parameter if name == 'low' else 2 ** (parameter or 2) - 1
+    assert constant_strategy.is_one(result) == ((factor_1 * factor_2 - number) % modulus == 0)
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+@pytest.mark.parametrize('number', [35, 210, 391, 97])
+def test_hints_keep_factorizations(strategy, number):
+    factor_sat = FactoringSat.factorize_number(number, strategy, hints=tuple(HINTS))
+    factorizations = set()
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        for model in solver.enum_models():
+            factor_1 = test_utils.assignment_to_int(factor_sat.factor_1, model)
+            factor_2 = test_utils.assignment_to_int(factor_sat.factor_2, model)
+            factorizations.add((factor_1, factor_2))
+
+            solver.add_clause([-literal for literal in model if abs(literal) in factor_sat.factor_1 + factor_sat.factor_2])
+
+    expected = {
+        (factor, number // factor) for factor in range(2, 2 ** len(factor_sat.factor_1))
+        if number % factor == 0 and number // factor > 1
+    }
+    assert factorizations == expected, 'The hints should not exclude any factorization'
+
+
+def test_hints_reproducibility():
+    factor_sat = FactoringSat.factorize_number(2 ** 20 + 7, hints=('parity', 'low:8'))
+
+    assert factor_sat.hints == ('parity', 'low:8')
+    assert '--hints parity,low:8' in factor_sat.reproduce_command()
+    assert any('parity, low:8' in comment for comment in factor_sat.dimacs_comments())
+    assert factor_sat == FactoringSat.factorize_number(2 ** 20 + 7, hints=('parity', 'low:8'))
+
+
+@pytest.mark.parametrize('hint', ['unknown', 'parity:2', 'low', 'low:0', 'low:x', 'mersenne:1', 'mod3:3'])
+def test_invalid_hint(hint):
+    with pytest.raises(ValueError):
+        hints.parse_hint(hint)
+
+
+def test_parse_hints():
+    assert hints.parse_hints('parity, low:8,mod3') == ('parity', 'low:8', 'mod3')
+    assert hints.parse_hints('') == ()
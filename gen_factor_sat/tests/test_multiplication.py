@@ -1,11 +1,14 @@
 import pytest
-from hypothesis import given, assume
+from hypothesis import given, assume, settings
 from hypothesis.strategies import integers
 
 import gen_factor_sat.tests.utils as test_utils
 from gen_factor_sat import utils
+from gen_factor_sat.circuit.default.multiplication import DaddaTreeStrategy
 from gen_factor_sat.circuit.instances import ConstantFactoringStrategy, ConstantWallaceFactoringStrategy, \
-    TseitinFactoringStrategy, TseitinWallaceFactoringStrategy
+    ConstantDaddaFactoringStrategy, ConstantBoothFactoringStrategy, ConstantCarrySaveFactoringStrategy, \
+    TseitinFactoringStrategy, TseitinWallaceFactoringStrategy, TseitinDaddaFactoringStrategy, \
+    TseitinBoothFactoringStrategy, TseitinCarrySaveFactoringStrategy
 from gen_factor_sat.circuit.tseitin.circuit import CNFBuilder
 
 
@@ -19,6 +22,61 @@ def constant_wallace_strategy():
     return ConstantWallaceFactoringStrategy()
 
 
+@pytest.fixture(scope='module')
+def constant_toom_cook_strategy():
+    strategy = ConstantFactoringStrategy()
+    strategy.toom_min_len = 8
+    return strategy
+
+
+@pytest.fixture(scope='module')
+def tseitin_toom_cook_strategy():
+    strategy = TseitinFactoringStrategy()
+    strategy.toom_min_len = 8
+    return strategy
+
+
+@pytest.fixture(scope='module')
+def constant_tuned_strategy():
+    strategy = ConstantFactoringStrategy()
+    strategy.thresholds = ((1, 4), (24, 12), (48, 30))
+    return strategy
+
+
+@pytest.fixture(scope='module')
+def constant_carry_save_strategy():
+    strategy = ConstantCarrySaveFactoringStrategy()
+    strategy.min_len = 4
+    return strategy
+
+
+@pytest.fixture(scope='module')
+def tseitin_carry_save_strategy():
+    strategy = TseitinCarrySaveFactoringStrategy()
+    strategy.min_len = 4
+    return strategy
+
+
+@pytest.fixture(scope='module')
+def constant_dadda_strategy():
+    return ConstantDaddaFactoringStrategy()
+
+
+@pytest.fixture(scope='module')
+def tseitin_dadda_strategy():
+    return TseitinDaddaFactoringStrategy()
+
+
+@pytest.fixture(scope='module')
+def constant_booth_strategy():
+    return ConstantBoothFactoringStrategy()
+
+
+@pytest.fixture(scope='module')
+def tseitin_booth_strategy():
+    return TseitinBoothFactoringStrategy()
+
+
 @pytest.fixture(scope='module')
 def tseitin_strategy():
     return TseitinFactoringStrategy()
@@ -34,11 +92,97 @@ def test_wallace(constant_wallace_strategy, factor_1, factor_2):
     assert run_eval_mult(constant_wallace_strategy, factor_1, factor_2) == factor_1 * factor_2
 
 
+@given(factor_1=integers(0, 2 ** 40), factor_2=integers(0, 2 ** 40))
+def test_dadda(constant_dadda_strategy, factor_1, factor_2):
+    assert run_eval_mult(constant_dadda_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+@given(factor_1=integers(0, 2 ** 40), factor_2=integers(0, 2 ** 40))
+def test_booth(constant_booth_strategy, factor_1, factor_2):
+    assert run_eval_mult(constant_booth_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+def test_dadda_heights():
+    assert DaddaTreeStrategy.dadda_heights(2) == []
+    assert DaddaTreeStrategy.dadda_heights(3) == [2]
+    assert DaddaTreeStrategy.dadda_heights(64) == [2, 3, 4, 6, 9, 13, 19, 28, 42, 63]
+
+
 @given(factor_1=integers(0, 2 ** 60), factor_2=integers(0, 2 ** 60))
 def test_karatsuba(constant_strategy, factor_1, factor_2):
     assert run_eval_mult(constant_strategy, factor_1, factor_2) == factor_1 * factor_2
 
 
+@settings(deadline=None)
+@given(factor_1=integers(0, 2 ** 100), factor_2=integers(0, 2 ** 100))
+def test_toom_cook(constant_toom_cook_strategy, factor_1, factor_2):
+    assert run_eval_mult(constant_toom_cook_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+@settings(deadline=None)
+@given(factor_1=integers(0, 2 ** 64), factor_2=integers(0, 2 ** 64))
+def test_carry_save_karatsuba(constant_carry_save_strategy, factor_1, factor_2):
+    assert run_eval_mult(constant_carry_save_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+@settings(deadline=None)
+@given(factor_1=integers(0, 2 ** 100), factor_2=integers(0, 2 ** 100))
+def test_tuned_karatsuba(constant_tuned_strategy, factor_1, factor_2):
+    assert run_eval_mult(constant_tuned_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+def test_karatsuba_threshold(constant_tuned_strategy):
+    assert [constant_tuned_strategy.threshold(length) for length in [1, 23, 24, 47, 48, 1000]] == [4, 4, 12, 12, 30, 30]
+
+    strategy = ConstantFactoringStrategy()
+    strategy.thresholds = ((16, 12),)
+    assert strategy.threshold(15) == strategy.min_len, 'Lengths without an entry should use min_len'
+
+
+def test_karatsuba_threshold_min_len():
+    strategy = TseitinCarrySaveFactoringStrategy()
+    assert strategy.threshold(20) != strategy.min_len, 'The tuned table should be used by default'
+
+    strategy.min_len = 4
+    assert [strategy.threshold(length) for length in [12, 20, 100]] == [4, 4, 4], 'min_len should replace the table'
+
+    strategy.thresholds = ((16, 12),)
+    assert [strategy.threshold(length) for length in [12, 16]] == [4, 12], 'thresholds should still be used'
+
+
+@given(quotient=integers(0, 2 ** 64), width=integers(1, 70))
+def test_divide_by_three(constant_toom_cook_strategy, quotient, width):
+    quotient = quotient % (2 ** width)
+    number = constant_toom_cook_strategy._truncate(utils.to_bin_list((3 * quotient) % (2 ** width)), width)
+
+    result = constant_toom_cook_strategy.divide_by_three(number, None)
+
+    assert len(result) == width
+    assert utils.to_int(result) == quotient
+
+
+@given(factor_1=integers(0, 2 ** 80), factor_2=integers(0, 2 ** 80), length=integers(1, 100))
+def test_multiply_modulo(constant_strategy, factor_1, factor_2, length):
+    bin_factor_1 = utils.to_bin_list(factor_1)
+    bin_factor_2 = utils.to_bin_list(factor_2)
+    result = constant_strategy.multiply_modulo(bin_factor_1, bin_factor_2, length, None)
+
+    assert len(result) == length
+    assert utils.to_int(result) == (factor_1 * factor_2) % 2 ** length
+
+
+@given(factor_1=integers(0, 2 ** 80), factor_2=integers(0, 2 ** 80), length=integers(1, 100))
+def test_bounded_multiply(constant_strategy, factor_1, factor_2, length):
+    bin_factor_1 = utils.to_bin_list(factor_1)
+    bin_factor_2 = utils.to_bin_list(factor_2)
+    result = utils.to_int(constant_strategy.bounded_multiply(bin_factor_1, bin_factor_2, length, None))
+
+    if factor_1 * factor_2 < 2 ** length:
+        assert result == factor_1 * factor_2
+    else:
+        assert result >= 2 ** length, 'The result should exceed the length iff the product does'
+
+
 @given(factor_1=integers(2 ** 21, 2 ** 60), factor_2=integers(0, 2 ** 30))
 def test_split_simplification(constant_strategy, factor_1, factor_2):
     assume(len(utils.to_bin_list(factor_1)) > 2 * len(utils.to_bin_list(factor_2)))
@@ -51,6 +195,61 @@ def test_tseitin_wallace_mult(tseitin_wallace_strategy, factor_1, factor_2):
     assert run_tseitin_mult(tseitin_wallace_strategy, factor_1, factor_2) == factor_1 * factor_2
 
 
+@pytest.mark.parametrize('factor_1', [1, 17, 2 ** 10 + 865, 2 ** 21 + 46196])
+@pytest.mark.parametrize('factor_2', [0, 2, 2 ** 21 + 510579])
+def test_tseitin_dadda_mult(tseitin_dadda_strategy, factor_1, factor_2):
+    assert run_tseitin_mult(tseitin_dadda_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+@pytest.mark.parametrize('factor_1', [1, 17, 2 ** 10 + 865, 2 ** 21 + 46196])
+@pytest.mark.parametrize('factor_2', [0, 2, 3, 2 ** 21 + 510579])
+def test_tseitin_booth_mult(tseitin_booth_strategy, factor_1, factor_2):
+    assert run_tseitin_mult(tseitin_booth_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+@pytest.mark.parametrize('factor_1, factor_2', [
+    (2 ** 30 + 7, 2 ** 29 + 3), (2 ** 40 - 1, 2 ** 40 - 1), (2 ** 35 + 12345, 2 ** 33 + 54321)
+])
+def test_tseitin_toom_cook_mult(tseitin_toom_cook_strategy, factor_1, factor_2):
+    assert run_tseitin_mult(tseitin_toom_cook_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+@pytest.mark.parametrize('factor_1', [1, 17, 2 ** 10 + 865, 2 ** 21 + 46196])
+@pytest.mark.parametrize('factor_2', [0, 2, 2 ** 21 + 510579])
+def test_tseitin_carry_save_mult(tseitin_carry_save_strategy, factor_1, factor_2):
+    assert run_tseitin_mult(tseitin_carry_save_strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+def test_tseitin_carry_save_unbalanced_factors():
+    # Without high parts, the negated low product at weight shift determines the width of the recombination
+    strategy = TseitinCarrySaveFactoringStrategy()
+    strategy.thresholds = ((1, 4), (12, 20), (20, 18), (22, 20))
+    assert run_tseitin_mult(strategy, 1, 2 ** 21 - 1) == 2 ** 21 - 1
+
+
+def test_booth_is_smaller(tseitin_booth_strategy, tseitin_dadda_strategy):
+    booth_writer = CNFBuilder()
+    tseitin_booth_strategy.multiply(booth_writer.next_variables(32), booth_writer.next_variables(32), booth_writer)
+
+    dadda_writer = CNFBuilder()
+    tseitin_dadda_strategy.multiply(dadda_writer.next_variables(32), dadda_writer.next_variables(32), dadda_writer)
+
+    assert len(booth_writer.build_clauses()) < len(dadda_writer.build_clauses())
+
+
+@pytest.mark.parametrize('length_1, length_2', [(8, 8), (24, 24), (31, 7)])
+def test_dadda_is_smaller(tseitin_dadda_strategy, tseitin_wallace_strategy, length_1, length_2):
+    dadda_writer = CNFBuilder()
+    tseitin_dadda_strategy.multiply(dadda_writer.next_variables(length_1), dadda_writer.next_variables(length_2),
+                                    dadda_writer)
+
+    wallace_writer = CNFBuilder()
+    tseitin_wallace_strategy.multiply(wallace_writer.next_variables(length_1), wallace_writer.next_variables(length_2),
+                                      wallace_writer)
+
+    assert len(dadda_writer.build_clauses()) < len(wallace_writer.build_clauses())
+
+
 @pytest.mark.parametrize('factor_1', [1, 17, 2 ** 10 + 865, 2 ** 21 + 46196])
 @pytest.mark.parametrize('factor_2', [0, 2, 2 ** 21 + 510579])
 def test_tseitin_mult(tseitin_strategy, factor_1, factor_2):
@@ -0,0 +1,126 @@
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers
+
+from gen_factor_sat import utils
+from gen_factor_sat.number_generator import Number, DetPrime, DetComposite, ProbPrime, ProbComposite, \
+    GeneratorConfig, Semiprime, is_prime, next_prime, is_prob_prime, sieve_interval, DETERMINISTIC_LIMIT, BPSW_ERROR, MAX_SIEVE_VALUE, \
+    _miller_rabin, _strong_lucas
+
+
+def trial_division(value: int) -> bool:
+    return value >= 2 and all(value % x != 0 for x in range(2, utils.isqrt(value) + 1))
+
+
+@given(integers(min_value=0, max_value=2 ** 300))
+def test_isqrt(value):
+    root = utils.isqrt(value)
+    assert root ** 2 <= value < (root + 1) ** 2
+
+
+@given(integers(min_value=0, max_value=10 ** 7))
+def test_is_prime(value):
+    assert is_prime(value) == trial_division(value)
+
+
+@given(integers(min_value=2, max_value=10 ** 7), integers())
+def test_is_prob_prime(value, seed):
+    assert is_prob_prime(value, 1.0, seed) or not trial_division(value), \
+        'A prime number should never be declared to be composite'
+
+
+@pytest.mark.parametrize('pseudoprime', [
+    2047, 1373653, 25326001, 3215031751, 2152302898747, 3474749660383, 341550071728321,
+    3825123056546413051, 318665857834031151167461, DETERMINISTIC_LIMIT
+])
+def test_strong_pseudoprimes(pseudoprime):
+    assert not is_prime(pseudoprime), 'Strong pseudoprimes to several bases should be detected'
+
+
+@pytest.mark.parametrize('pseudoprime', [5459, 5777, 10877, 16109, 18971, 22499, 24569, 25199])
+def test_strong_lucas_pseudoprimes(pseudoprime):
+    assert _strong_lucas(pseudoprime), 'The strong Lucas test should match the known pseudoprimes'
+    assert not (_miller_rabin(pseudoprime, 2) and _strong_lucas(pseudoprime))
+
+
+@pytest.mark.parametrize('prime', [2 ** 61 - 1, 2 ** 89 - 1, 2 ** 107 - 1, 2 ** 127 - 1, 10 ** 30 + 57])
+def test_large_primes(prime):
+    assert is_prime(prime)
+    assert not is_prime(prime * 3)
+    assert not is_prime(prime * (2 ** 61 - 1))
+
+
+def test_number_types():
+    assert Number.create(2 ** 61 - 1, seed=0, error=0.0) == DetPrime(2 ** 61 - 1)
+    assert Number.create(2 ** 61 + 1, seed=0, error=0.0) == DetComposite(2 ** 61 + 1)
+    assert Number.create(2 ** 127 - 1, seed=0, error=0.0) == ProbPrime(2 ** 127 - 1, BPSW_ERROR), \
+        'Primes above the deterministic limit should be marked as probabilistic'
+    assert Number.create(2 ** 127 + 1, seed=0, error=0.0) == DetComposite(2 ** 127 + 1)
+    assert Number.create(2 ** 61 - 1, seed=0, error=0.1) == ProbPrime(2 ** 61 - 1, 0.1)
+    assert Number.create(2 ** 61 + 1, seed=0, error=0.1) == ProbComposite(2 ** 61 + 1, 0.1)
+
+
+@pytest.mark.parametrize('min_value, max_value', [
+    (2, 10 ** 5), (65000, 140000), (MAX_SIEVE_VALUE - 10 ** 4, MAX_SIEVE_VALUE)
+])
+def test_sieve_interval(min_value, max_value):
+    flags = sieve_interval(min_value, max_value)
+
+    assert len(flags) == max_value - min_value + 1
+    assert all(bool(flag) == is_prime(value) for value, flag in enumerate(flags, start=min_value))
+
+
+@pytest.mark.parametrize('min_value, max_value', [(100, 10 ** 4), (2 ** 20, 2 ** 21), (2 ** 50, 2 ** 51)])
+@pytest.mark.parametrize('prime', [None, True, False])
+def test_generate_many(min_value, max_value, prime):
+    generator_config = GeneratorConfig.create(min_value, max_value, seed=11)
+    numbers = Number.generate_many(generator_config, 50, prime)
+
+    assert numbers == Number.generate_many(generator_config, 50, prime), 'The same seed should yield the same numbers'
+    assert len({number.value for number in numbers}) == 50, 'The numbers should be distinct'
+    assert all(min_value <= number.value <= max_value for number in numbers)
+
+    if prime is not None:
+        assert all(Number.check_type(number, prime) for number in numbers)
+        assert all(is_prime(number.value) == prime for number in numbers)
+
+
+def test_generate_many_fails_for_small_intervals():
+    with pytest.raises(StopIteration):
+        Number.generate_many(GeneratorConfig.create(24, 28, seed=0), 1, prime=True)
+
+    with pytest.raises(StopIteration):
+        Number.generate_many(GeneratorConfig.create(2, 5, seed=0), 4, prime=True)
+
+
+@given(integers(min_value=0, max_value=10 ** 6))
+def test_next_prime(value):
+    prime = next_prime(value)
+
+    assert prime >= value and is_prime(prime)
+    assert not any(map(is_prime, range(value, prime)))
+
+
+@pytest.mark.parametrize('min_value, max_value', [(10, 100), (2 ** 40, 2 ** 41), (2 ** 127, 2 ** 128)])
+@pytest.mark.parametrize('balance', [1.0, 0.75, 0.5])
+def test_generate_semiprime(min_value, max_value, balance):
+    generator_config = GeneratorConfig.create(min_value, max_value, seed=3)
+    semiprime = Number.generate_semiprime(generator_config, balance)
+
+    assert semiprime == Number.generate_semiprime(generator_config, balance), \
+        'The same seed should yield the same number'
+
+    assert isinstance(semiprime, Semiprime) and Number.check_type(semiprime, prime=False)
+    assert min_value <= semiprime.value <= max_value
+    assert semiprime.value == semiprime.factor_1 * semiprime.factor_2
+    assert is_prime(semiprime.factor_1) and is_prime(semiprime.factor_2)
+
+    if min_value > 2 ** 20:
+        ratio = semiprime.factor_1.bit_length() / semiprime.factor_2.bit_length()
+        assert abs(ratio - balance) < 0.1, 'The factors should have the requested balance'
+
+
+@pytest.mark.parametrize('balance', [0.0, 1.5])
+def test_generate_semiprime_invalid_balance(balance):
+    with pytest.raises(ValueError):
+        Number.generate_semiprime(GeneratorConfig.create(10, 100, seed=3), balance)
@@ -0,0 +1,86 @@
+import itertools
+
+import pytest
+from pysat.solvers import Solver
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.cnf import CNF, ClauseStore
+from gen_factor_sat.formula.preprocessing import preprocess, Preprocessor
+
+
+def test_unit_propagation():
+    cnf = CNF(4, ClauseStore([(1,), (-1, 2), (-2, 3, 4), (-3, 1)]))
+    preprocessor = Preprocessor(cnf, frozen=[2])
+    preprocessor.propagate()
+
+    assert preprocessor.assignment == {1: 1, 2: 2}
+    assert [clause for clause in preprocessor.clauses if clause is not None] == [{3, 4}]
+
+    result, renumbering = preprocessor.build()
+    assert renumbering == {2: 1, 3: 2, 4: 3}
+    assert list(result.clauses) == [(1,), (2, 3)], 'Assigned frozen variables should be kept as units'
+
+
+def test_conflicting_units():
+    cnf = CNF(2, ClauseStore([(1,), (-1, 2), (-2,)]))
+    result, _ = preprocess(cnf, frozen=[1])
+
+    assert list(result.clauses) == [()], 'A contradiction should result in the empty clause'
+
+
+def test_backward_subsumption():
+    cnf = CNF(3, ClauseStore([(1, 2, 3), (1, 2), (-1, 3), (1, 2)]))
+    preprocessor = Preprocessor(cnf, frozen=[1, 2, 3])
+    preprocessor.subsume()
+
+    assert [clause for clause in preprocessor.clauses if clause is not None] == [{1, 2}, {-1, 3}]
+
+
+def test_bounded_variable_elimination():
+    cnf = CNF(3, ClauseStore([(1, 2), (-2, 3)]))
+    result, renumbering = preprocess(cnf, frozen=[1, 3])
+
+    assert renumbering == {1: 1, 3: 2}
+    assert list(result.clauses) == [(1, 2)]
+
+
+@pytest.mark.parametrize('clauses', [
+    [(1, 2, 3), (-1, -2), (-2, -3), (2, 4), (-4, 5), (-5, -1)],
+    [(1, -2), (2, -3), (3, -4), (4, -1), (1, 3), (-2, -4)],
+    [(1, 2), (-1, 3), (-3, 4), (-4, -2), (5, -3), (-5, 2)]
+])
+def test_frozen_assignments_are_preserved(clauses):
+    frozen = [1, 2]
+    cnf, renumbering = preprocess(CNF(5, ClauseStore(clauses)), frozen=frozen)
+
+    for values in itertools.product([False, True], repeat=len(frozen)):
+        original = test_utils.run_cnf(list(test_utils.assign(frozen, values)), [], clauses)
+        renamed = [renumbering[var] for var in frozen]
+        simplified = test_utils.run_cnf(list(test_utils.assign(renamed, values)), [], cnf.clauses)
+
+        assert (original is None) == (simplified is None), \
+            'The simplified formula should allow the same assignments of the frozen variables'
+
+
+@pytest.mark.parametrize('factor_1, factor_2', [(3, 5), (1031, 32771), (2 ** 15 + 5217, 2 ** 10 + 561)])
+def test_composite_number(factor_1, factor_2):
+    factor_sat = FactoringSat.factorize_number(factor_1 * factor_2, preprocess=True)
+    original = FactoringSat.factorize_number(factor_1 * factor_2)
+    assert factor_sat.cnf.number_of_variables < original.cnf.number_of_variables
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert solver.solve(), "The formula generated for a composite number should be in SAT"
+
+        model = solver.get_model()
+        result_a = test_utils.assignment_to_int(factor_sat.factor_1, model)
+        result_b = test_utils.assignment_to_int(factor_sat.factor_2, model)
+        assert result_a * result_b == factor_1 * factor_2
+
+
+@pytest.mark.parametrize('prime', [2, 3, 1031, 32771])
+def test_prime_number(prime):
+    factor_sat = FactoringSat.factorize_number(prime, preprocess=True)
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert not solver.solve(), "The formula generated for a prime number should be in UNSAT"
@@ -1,9 +1,13 @@
 import itertools
 
 import pytest
+from pysat.solvers import Solver
 
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat.circuit.instances import TseitinFactoringStrategy
 from gen_factor_sat.circuit.tseitin.circuit import CNFBuilder, TseitinGateStrategy
 from gen_factor_sat.circuit.tseitin.encoding import and_equality, or_equality, xor_equality, equal_equality
+from gen_factor_sat.formula.cnf import ClauseStore
 from gen_factor_sat.formula.symbol import constant, variable
 
 
@@ -64,9 +68,9 @@ def test_add_clauses(create_cnf_builder, initial_variables):
     assert cnf_builder.number_of_variables == initial_variables + 2
     assert result_or == initial_variables + 2
 
-    expected_clauses = set()
-    expected_clauses.update(and_equality(variable_1, variable_2, result_and))
-    expected_clauses.update(or_equality(variable_1, variable_2, result_or))
+    expected_clauses = ClauseStore()
+    expected_clauses.extend(and_equality(variable_1, variable_2, result_and))
+    expected_clauses.extend(or_equality(variable_1, variable_2, result_or))
 
     assert any(result_and in clause for clause in cnf_builder.clauses), \
         'The value of output should be restricted by the clauses'
@@ -74,7 +78,7 @@ def test_add_clauses(create_cnf_builder, initial_variables):
     assert any(result_or in clause for clause in cnf_builder.clauses), \
         'The value of output should be restricted by the clauses'
 
-    assert cnf_builder.clauses == expected_clauses, \
+    assert set(cnf_builder.clauses) == set(expected_clauses), \
         'All clauses should be added to the CNFBuilder'
 
 
@@ -92,9 +96,32 @@ def test_build_clauses(create_cnf_builder):
         'Build clauses should remove duplicates'
 
 
+def test_build_clauses_removes_duplicate_clauses(create_cnf_builder):
+    cnf_builder = create_cnf_builder()
+
+    cnf_builder.add_clauses([(1, -2), (3,), (-2, 1), (1, -2, 1), ()])
+    cnf_builder.add_clauses([(3,), ()])
+
+    cnf = cnf_builder.build()
+    assert list(cnf.clauses) == [(1, -2), (3,), ()], \
+        'Build clauses should keep the first occurrence of every clause'
+
+
+@pytest.mark.parametrize('clauses', [[], [()], [(1,), (-2, 3), (4, -5, 6, -7)]])
+def test_clause_store_layout(clauses):
+    clause_store = ClauseStore(clauses)
+
+    assert len(clause_store) == len(clauses)
+    assert list(clause_store) == clauses
+    assert [clause_store[index] for index in range(len(clauses))] == clauses
+
+    assert len(clause_store.offsets) == len(clauses) + 1, 'Every clause should have an offset'
+    assert len(clause_store.literals) == sum(map(len, clauses)), 'All literals should be stored consecutively'
+    assert clause_store.copy() == clause_store
+
+
 def has_duplicates(clause) -> bool:
-    return not isinstance(clause, frozenset) \
-           or any(-x in clause for x in clause)
+    return len(set(map(abs, clause))) != len(clause)
 
 
 @pytest.mark.parametrize('constant_value', ['0', '1'])
@@ -116,8 +143,119 @@ def check_constant_prop(method, args, expected):
         assert cnf_builder.number_of_variables == 0, \
             'Constant propagation should not create an output variable'
 
-        assert not cnf_builder.clauses, \
+        assert not len(cnf_builder.clauses), \
             'Constant propagation should not add clauses'
 
         assert result == expected, \
             'Constant propagation should return the expected result'
+
+
+def test_structural_hashing():
+    tseitin_strategy = TseitinFactoringStrategy()
+    tseitin_strategy.max_gates = 2 ** 16
+    cnf_builder = tseitin_strategy.create_writer()
+    variable_1, variable_2 = cnf_builder.next_variables(2)
+
+    for gate in [tseitin_strategy.wire_and, tseitin_strategy.wire_or, tseitin_strategy.xor]:
+        output = gate(variable_1, variable_2, cnf_builder)
+        number_of_variables = cnf_builder.number_of_variables
+        number_of_clauses = len(cnf_builder.clauses)
+
+        assert gate(variable_2, variable_1, cnf_builder) == output, \
+            'Commutative gates should be reused independent of the order of the inputs'
+
+        assert cnf_builder.number_of_variables == number_of_variables, \
+            'Reusing a gate should not create an output variable'
+
+        assert len(cnf_builder.clauses) == number_of_clauses, \
+            'Reusing a gate should not add clauses'
+
+    negated_xor = tseitin_strategy.xor(variable(-variable_1), variable_2, cnf_builder)
+    assert negated_xor == -tseitin_strategy.xor(variable_1, variable_2, cnf_builder), \
+        'XOR gates should be reused for negated inputs'
+
+
+def test_structural_hashing_is_opt_in():
+    cnf_builder = TseitinFactoringStrategy().create_writer()
+    tseitin_strategy = TseitinGateStrategy()
+    variable_1, variable_2 = cnf_builder.next_variables(2)
+
+    output = tseitin_strategy.wire_and(variable_1, variable_2, cnf_builder)
+
+    assert tseitin_strategy.wire_and(variable_1, variable_2, cnf_builder) != output, \
+        'Gates should not be remembered by default'
+    assert not cnf_builder.gates
+
+
+@pytest.mark.parametrize('max_gates', [0, 1])
+def test_structural_hashing_is_bounded(max_gates):
+    cnf_builder = CNFBuilder(max_gates=max_gates)
+    tseitin_strategy = TseitinGateStrategy()
+    variables = cnf_builder.next_variables(3)
+
+    for variable_1, variable_2 in itertools.combinations(variables, 2):
+        tseitin_strategy.wire_and(variable_1, variable_2, cnf_builder)
+
+    assert len(cnf_builder.gates) == max_gates, 'The number of remembered gates should be bounded'
+
+
+def test_trivial_gates():
+    cnf_builder = CNFBuilder()
+    tseitin_strategy = TseitinFactoringStrategy()
+    var = cnf_builder.next_variable()
+    negated_var = variable(-var)
+
+    assert tseitin_strategy.wire_and(var, var, cnf_builder) == var
+    assert tseitin_strategy.wire_and(var, negated_var, cnf_builder) == '0'
+    assert tseitin_strategy.wire_or(var, var, cnf_builder) == var
+    assert tseitin_strategy.wire_or(var, negated_var, cnf_builder) == '1'
+    assert tseitin_strategy.xor(var, var, cnf_builder) == '0'
+    assert tseitin_strategy.xor(var, negated_var, cnf_builder) == '1'
+
+    assert cnf_builder.number_of_variables == 1, 'Trivial gates should not create an output variable'
+    assert not len(cnf_builder.clauses), 'Trivial gates should not add clauses'
+
+
+@pytest.mark.parametrize('redundant_clauses', [False, True])
+def test_ternary_gates(redundant_clauses):
+    tseitin_strategy = TseitinFactoringStrategy()
+    tseitin_strategy.redundant_clauses = redundant_clauses
+    inputs = [constant('0'), constant('1'), variable(1), variable(-1), variable(2), variable(-3)]
+
+    for value_1, value_2, value_3 in itertools.product(inputs, repeat=3):
+        cnf_builder = CNFBuilder(3)
+        outputs = [
+            *tseitin_strategy.full_adder(value_1, value_2, value_3, cnf_builder),
+            tseitin_strategy.xor3(value_1, value_2, value_3, cnf_builder),
+            tseitin_strategy.majority(value_1, value_2, value_3, cnf_builder),
+            tseitin_strategy.ite(value_1, value_2, value_3, cnf_builder)
+        ]
+
+        for assignment in itertools.product([False, True], repeat=3):
+            units = [[literal] for literal in test_utils.assign([1, 2, 3], assignment)]
+            with Solver(name='cadical', bootstrap_with=list(cnf_builder.clauses) + units) as solver:
+                assert solver.solve(), 'The gates should be satisfiable for every input'
+                result = [value == '1' for value in test_utils.assignment_to_bin(outputs, solver.get_model())]
+
+            bit_1, bit_2, bit_3 = [value == '1' for value in test_utils.assignment_to_bin(
+                [value_1, value_2, value_3], [1 if value else -1 for value in assignment])]
+
+            assert result == [
+                bit_1 ^ bit_2 ^ bit_3,
+                bit_1 + bit_2 + bit_3 >= 2,
+                bit_1 ^ bit_2 ^ bit_3,
+                bit_1 + bit_2 + bit_3 >= 2,
+                bit_2 if bit_1 else bit_3
+            ]
+
+
+@pytest.mark.parametrize('redundant_clauses, expected_clauses', [(False, 14), (True, 20)])
+def test_full_adder_encoding(redundant_clauses, expected_clauses):
+    cnf_builder = CNFBuilder()
+    tseitin_strategy = TseitinFactoringStrategy()
+    tseitin_strategy.redundant_clauses = redundant_clauses
+    inputs = cnf_builder.next_variables(3)
+
+    tseitin_strategy.full_adder(*inputs, cnf_builder)
+    assert cnf_builder.number_of_variables == 5, 'The full adder should only create the sum and carry variable'
+    assert len(cnf_builder.clauses) == expected_clauses, 'The full adder should use the XOR3 and majority encoding'
@@ -17,6 +17,38 @@ def test_clause_assignments(variables, tseitin, bool_expr):
     check_assignments(variables, tseitin(*variables), bool_expr)
 
 
+@pytest.mark.parametrize('variables', [[1, 2, 3]])
+@pytest.mark.parametrize('tseitin, bool_expr', [
+    (te.and_positive, lambda x, y, z: (not z) or (x and y)),
+    (te.and_negative, lambda x, y, z: z or not (x and y)),
+    (te.xor_positive, lambda x, y, z: (not z) or (x ^ y)),
+    (te.xor_negative, lambda x, y, z: z or not (x ^ y))
+])
+def test_polarity_clause_assignments(variables, tseitin, bool_expr):
+    check_assignments(variables, tseitin(*variables), bool_expr)
+
+
+@pytest.mark.parametrize('variables', [[1, 2, 3, 4]])
+@pytest.mark.parametrize('tseitin, bool_expr', [
+    (te.xor3_equality, lambda x, y, z, o: (x ^ y ^ z) == o),
+    (te.majority_equality, lambda x, y, z, o: (x + y + z >= 2) == o),
+    (te.ite_equality, lambda c, x, y, o: (x if c else y) == o)
+])
+def test_ternary_clause_assignments(variables, tseitin, bool_expr):
+    check_assignments(variables, tseitin(*variables), bool_expr)
+
+
+def test_full_adder_redundant():
+    variables = [1, 2, 3, 4, 5]
+    clauses = te.xor3_equality(1, 2, 3, 4) + te.majority_equality(1, 2, 3, 5)
+
+    check_assignments(variables, clauses + te.full_adder_redundant(*variables),
+                      lambda x, y, z, s, c: (x ^ y ^ z) == s and (x + y + z >= 2) == c)
+
+    assert all(test_utils.run_cnf([-clause[0], -clause[1], -clause[2]], [], clauses) is None
+               for clause in te.full_adder_redundant(*variables)), 'The clauses should be implied'
+
+
 def check_assignments(variables, clauses, bool_expr):
     for values in itertools.product([False, True], repeat=len(variables)):
         assignment = list(test_utils.assign(variables, values))
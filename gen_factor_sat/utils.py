@@ -35,3 +35,27 @@ def group(iterable: Iterable[Tuple[K, V]]) -> DefaultDict[K, List[V]]:
 
 def split_at(list: List[V], index: int) -> Tuple[List[V], List[V]]:
     return list[:index], list[index:]
+
+
+def isqrt(value: int) -> int:
+    """
+    Calculate the integer square root, i.e. the largest integer whose square
+    is at most the value (math.isqrt is only available from Python 3.8).
+
+    :param value: a non-negative integer
+    :return: the integer square root of the value
+    :raises ValueError if the value is negative
+    """
+    if value < 0:
+        raise ValueError('The square root of a negative number is not defined: {0}'.format(value))
+    elif value == 0:
+        return 0
+
+    # Newton's method starting above the root decreases until it reaches the root
+    result = 1 << ((value.bit_length() + 1) // 2)
+    while True:
+        next_result = (result + value // result) // 2
+        if next_result >= result:
+            return result
+
+        result = next_result